@@ -6,15 +6,28 @@ from flask_cors import CORS
 from dotenv import load_dotenv
 from config import *
 from src.db import Database
+from src.services.deadline_scheduler import DeadlineScheduler
+from src.services.change_publisher import ChangePublisher
+from src.services.repository_ingestor import RepositoryIngestor
+from src.services.job_queue import JobQueue
+from src.services.jobs import register_jobs
+from src.services.profile_cache import ProfileCache
 from src.controllers import *
 from src.utils.custom_json_provider import CustomJSONProvider
+from src.utils.admission import AdmissionControl
+from src.utils.event_hub import EventHub
+from src.utils.response_cache import create_response_cache
 from src.utils.jwt_config import init_jwt
 from src.utils.error_handlers import register_error_handlers
+from src.utils.commands import register_commands
 from src.controllers.auth_controller import auth_routes_bp
 from src.controllers.activity_controller import activity_routes_bp
 from src.controllers.student_controller import student_routes_bp
-from src.controllers.professor_controller import professor_routes_bp
+from src.controllers.professor_controller import professor_routes_bp, professor_me_routes_bp
 from src.controllers.project_controller import project_routes_bp
+from src.controllers.change_controller import change_routes_bp
+from src.controllers.event_controller import event_routes_bp
+from src.controllers.job_controller import job_routes_bp
 
 load_dotenv()
 
@@ -63,10 +76,53 @@ def create_app():
     # Registrar manejadores de errores
     register_error_handlers(app)
 
+    # Control de admisión: con la base saturada responde 503 antes de pedir una conexión
+    if class_config.ADMISSION_CONTROL_ENABLED:
+        AdmissionControl(class_config.ADMISSION_LIMITS, class_config.ADMISSION_MAX_WAIT).init_app(app)
+
     # Initialize the database pool
 
     app.db = Database(class_config)
 
+    # Cache de respuestas de los listados, compartido entre workers
+    app.response_cache = create_response_cache(class_config)
+
+    # Perfiles de usuario en memoria, para /api/auth/validate que se llama en cada página
+    app.profile_cache = ProfileCache(class_config.PROFILE_CACHE_TTL, class_config.PROFILE_CACHE_SIZE)
+
+    # Scheduler de cierre de proyectos al vencer las actividades
+    app.deadline_scheduler = None
+    if class_config.DEADLINE_SCHEDULER_ENABLED:
+        app.deadline_scheduler = DeadlineScheduler(app.db, app.logger,
+                                                   class_config.DEADLINE_SCHEDULER_BATCH_SIZE,
+                                                   class_config.DEADLINE_SCHEDULER_RELOAD_SECONDS,
+                                                   response_cache=app.response_cache)
+        app.deadline_scheduler.start()
+
+    # Publicador de cambios en el proceso, se inicia con el primer suscriptor
+    app.change_publisher = ChangePublisher(app.db, app.logger)
+    app.event_hub = EventHub(app.change_publisher)
+
+    # Cola de trabajos lentos, se puede encolar aunque este proceso no tenga workers
+    app.job_queue = JobQueue(app.db, app.logger,
+                             class_config.JOB_WORKERS,
+                             class_config.JOB_POLL_SECONDS,
+                             class_config.JOB_LEASE_SECONDS)
+    register_jobs(app.job_queue, app.db, class_config, app.response_cache)
+    if class_config.JOB_WORKERS_ENABLED:
+        app.job_queue.start()
+
+    # Métricas de los repositorios de los proyectos
+    app.repository_ingestor = None
+    if class_config.REPOSITORY_INGESTION_ENABLED:
+        app.repository_ingestor = RepositoryIngestor(app.db, app.logger,
+                                                     class_config.REPOSITORY_CACHE_DIR,
+                                                     class_config.REPOSITORY_INGESTION_WORKERS,
+                                                     class_config.REPOSITORY_REFRESH_SECONDS,
+                                                     git_timeout=class_config.REPOSITORY_GIT_TIMEOUT)
+        app.repository_ingestor.start()
+        app.change_publisher.subscribe(app.repository_ingestor.on_changes)
+
     # Register routes
 
     # app.register_blueprint(auth_routes)
@@ -74,7 +130,14 @@ def create_app():
     app.register_blueprint(activity_routes_bp)
     app.register_blueprint(student_routes_bp)
     app.register_blueprint(professor_routes_bp)
+    app.register_blueprint(professor_me_routes_bp)
     app.register_blueprint(project_routes_bp)
+    app.register_blueprint(change_routes_bp)
+    app.register_blueprint(event_routes_bp)
+    app.register_blueprint(job_routes_bp)
+
+    # Comandos de la CLI de flask
+    register_commands(app)
 
     @app.route("/")
     def home():
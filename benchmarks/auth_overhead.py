@@ -0,0 +1,73 @@
+"""Costo de autenticación por request, con y sin el cache de tokens verificados.
+
+Uso: python -m benchmarks.auth_overhead [requests]
+
+Mide una vista vacía protegida con @jwt_required() usando el cliente de
+pruebas de Flask, y por separado solo la verificación del token.
+"""
+import json
+import sys
+import time
+
+from flask import Flask, jsonify
+from flask_jwt_extended import JWTManager, create_access_token, decode_token, jwt_required
+
+from src.utils.jwt_config import CachingJWTManager
+
+
+def build_app(manager_class) -> Flask:
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "benchmark-secret-key-de-32-bytes!!"
+    manager_class(app)
+
+    @app.route("/empty")
+    @jwt_required()
+    def empty():
+        return jsonify({})
+
+    @app.route("/public")
+    def public():
+        return jsonify({})
+
+    return app
+
+
+def token_for(app: Flask) -> str:
+    identity = json.dumps({"role": "professor", "user_id": 1, "professor_id": 1})
+    with app.app_context():
+        return create_access_token(identity=identity,
+                                   additional_claims={"role": "professor", "user_id": 1,
+                                                      "student_id": None, "professor_id": 1})
+
+
+def per_request(app: Flask, path: str, headers: dict, requests: int) -> float:
+    client = app.test_client()
+    client.get(path, headers=headers)  # calentar
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path, headers=headers)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def per_decode(app: Flask, token: str, requests: int) -> float:
+    with app.app_context():
+        decode_token(token)
+        start = time.perf_counter()
+        for _ in range(requests):
+            decode_token(token)
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+def main(requests: int = 5000) -> None:
+    print(f"{'manager':<20}{'decode µs':>12}{'request µs':>14}{'auth µs':>12}")
+    for manager_class in (JWTManager, CachingJWTManager):
+        app = build_app(manager_class)
+        headers = {"Authorization": f"Bearer {token_for(app)}"}
+        decode = per_decode(app, headers["Authorization"].split()[1], requests)
+        protected = per_request(app, "/empty", headers, requests)
+        public = per_request(app, "/public", headers, requests)
+        print(f"{manager_class.__name__:<20}{decode:>12.1f}{protected:>14.1f}{protected - public:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
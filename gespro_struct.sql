@@ -32,12 +32,61 @@ CREATE TABLE `activities` (
   `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
   `updated_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (`id`),
-  KEY `fk_activity_professor_idx` (`professor_id`),
   KEY `idx_activity_date` (`due_date`),
+  KEY `idx_activity_name` (`name`),
+  KEY `idx_activity_professor_created` (`professor_id`,`created_at`),
+  FULLTEXT KEY `ft_activity_name` (`name`) /*!50100 WITH PARSER `ngram` */ ,
   CONSTRAINT `fk_activity_professor` FOREIGN KEY (`professor_id`) REFERENCES `professors` (`id`)
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `activities_archive`
+--
+
+DROP TABLE IF EXISTS `activities_archive`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `activities_archive` (
+  `id` int unsigned NOT NULL,
+  `name` varchar(45) NOT NULL,
+  `description` varchar(1000) DEFAULT NULL,
+  `due_date` datetime NOT NULL,
+  `min_grade` decimal(3,1) unsigned NOT NULL,
+  `professor_id` int unsigned NOT NULL,
+  `created_at` datetime NOT NULL,
+  `updated_at` datetime NOT NULL,
+  `project_count` int NOT NULL DEFAULT '0',
+  `student_count` int NOT NULL DEFAULT '0',
+  `graded_count` int NOT NULL DEFAULT '0',
+  `passed_count` int NOT NULL DEFAULT '0',
+  `grade_sum` decimal(10,1) NOT NULL DEFAULT '0.0',
+  `archived_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  KEY `idx_activity_archive_professor_created` (`professor_id`,`created_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `activity_stats`
+--
+
+DROP TABLE IF EXISTS `activity_stats`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `activity_stats` (
+  `activity_id` int unsigned NOT NULL,
+  `project_count` int NOT NULL DEFAULT '0',
+  `student_count` int NOT NULL DEFAULT '0',
+  `graded_count` int NOT NULL DEFAULT '0',
+  `passed_count` int NOT NULL DEFAULT '0',
+  `grade_sum` decimal(10,1) NOT NULL DEFAULT '0.0',
+  `updated_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`activity_id`),
+  CONSTRAINT `fk_activity_stats_activity` FOREIGN KEY (`activity_id`) REFERENCES `activities` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Temporary view structure for view `all_professors`
 --
@@ -77,6 +126,79 @@ SET @saved_cs_client     = @@character_set_client;
  1 AS `created_at`*/;
 SET character_set_client = @saved_cs_client;
 
+--
+-- Table structure for table `change_sequence`
+--
+
+DROP TABLE IF EXISTS `change_sequence`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `change_sequence` (
+  `id` bigint unsigned NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `change_sequence`
+--
+
+LOCK TABLES `change_sequence` WRITE;
+INSERT INTO `change_sequence` VALUES (0);
+UNLOCK TABLES;
+
+--
+-- Table structure for table `changes`
+--
+
+DROP TABLE IF EXISTS `changes`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `changes` (
+  `id` bigint unsigned NOT NULL AUTO_INCREMENT,
+  `entity` enum('activity','project','member') NOT NULL,
+  `action` varchar(20) NOT NULL,
+  `activity_id` int unsigned DEFAULT NULL,
+  `project_id` int unsigned DEFAULT NULL,
+  `student_id` int unsigned DEFAULT NULL,
+  `professor_id` int unsigned DEFAULT NULL,
+  `payload` json DEFAULT NULL,
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  KEY `idx_change_professor` (`professor_id`,`id`),
+  KEY `idx_change_project` (`project_id`,`id`),
+  KEY `idx_change_student` (`student_id`,`id`)
+) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `jobs`
+--
+
+DROP TABLE IF EXISTS `jobs`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `jobs` (
+  `id` bigint unsigned NOT NULL AUTO_INCREMENT,
+  `type` varchar(50) NOT NULL,
+  `payload` json DEFAULT NULL,
+  `status` enum('QUEUED','RUNNING','DONE','FAILED') NOT NULL DEFAULT 'QUEUED',
+  `priority` smallint NOT NULL DEFAULT '0',
+  `attempts` tinyint unsigned NOT NULL DEFAULT '0',
+  `max_attempts` tinyint unsigned NOT NULL DEFAULT '3',
+  `run_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `locked_until` datetime DEFAULT NULL,
+  `result` json DEFAULT NULL,
+  `error` varchar(500) DEFAULT NULL,
+  `user_id` int unsigned DEFAULT NULL,
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `started_at` datetime DEFAULT NULL,
+  `finished_at` datetime DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  KEY `idx_job_claim` (`status`,`priority` DESC,`run_at`),
+  KEY `idx_job_locked` (`status`,`locked_until`)
+) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `members`
 --
@@ -87,18 +209,43 @@ DROP TABLE IF EXISTS `members`;
 CREATE TABLE `members` (
   `id` int unsigned NOT NULL AUTO_INCREMENT,
   `project_id` int unsigned NOT NULL,
+  `activity_id` int unsigned NOT NULL,
   `student_id` int unsigned NOT NULL,
   `is_owner` tinyint unsigned NOT NULL DEFAULT '0',
   `joined_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (`id`),
   UNIQUE KEY `uq_student_project` (`project_id`,`student_id`),
+  UNIQUE KEY `uq_member_activity_student` (`activity_id`,`student_id`),
   KEY `fk_member_project_idx` (`project_id`),
   KEY `fk_member_student_idx` (`student_id`),
+  KEY `fk_member_project_activity_idx` (`project_id`,`activity_id`),
   CONSTRAINT `fk_member_project` FOREIGN KEY (`project_id`) REFERENCES `projects` (`id`) ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT `fk_member_project_activity` FOREIGN KEY (`project_id`, `activity_id`) REFERENCES `projects` (`id`, `activity_id`) ON DELETE CASCADE ON UPDATE CASCADE,
   CONSTRAINT `fk_member_student` FOREIGN KEY (`student_id`) REFERENCES `students` (`id`) ON UPDATE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `members_archive`
+--
+
+DROP TABLE IF EXISTS `members_archive`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `members_archive` (
+  `id` int unsigned NOT NULL,
+  `project_id` int unsigned NOT NULL,
+  `activity_id` int unsigned NOT NULL,
+  `student_id` int unsigned NOT NULL,
+  `is_owner` tinyint unsigned NOT NULL DEFAULT '0',
+  `joined_at` datetime NOT NULL,
+  PRIMARY KEY (`id`),
+  KEY `idx_member_archive_project` (`project_id`),
+  KEY `idx_member_archive_student` (`student_id`),
+  CONSTRAINT `fk_member_archive_project` FOREIGN KEY (`project_id`) REFERENCES `projects_archive` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `professors`
 --
@@ -118,6 +265,30 @@ CREATE TABLE `professors` (
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `project_repository_stats`
+--
+
+DROP TABLE IF EXISTS `project_repository_stats`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `project_repository_stats` (
+  `project_id` int unsigned NOT NULL,
+  `repository_url` varchar(250) NOT NULL,
+  `status` enum('PENDING','OK','ERROR') NOT NULL DEFAULT 'PENDING',
+  `head_sha` char(40) DEFAULT NULL,
+  `commit_count` int unsigned DEFAULT NULL,
+  `last_commit_at` datetime DEFAULT NULL,
+  `size_bytes` bigint unsigned DEFAULT NULL,
+  `error` varchar(255) DEFAULT NULL,
+  `fetched_at` datetime DEFAULT NULL,
+  `claimed_until` datetime DEFAULT NULL,
+  PRIMARY KEY (`project_id`),
+  KEY `idx_repository_stats_fetched` (`fetched_at`),
+  CONSTRAINT `fk_repository_stats_project` FOREIGN KEY (`project_id`) REFERENCES `projects` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `projects`
 --
@@ -131,17 +302,43 @@ CREATE TABLE `projects` (
   `repository_url` varchar(250) NOT NULL,
   `activity_id` int unsigned NOT NULL,
   `is_group` tinyint unsigned NOT NULL DEFAULT '0',
+  `member_count` smallint unsigned NOT NULL DEFAULT '0',
   `grade` decimal(3,1) unsigned DEFAULT NULL,
   `status` enum('OPEN','READY','GRADED') NOT NULL DEFAULT 'OPEN',
   `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
   `updated_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (`id`),
-  KEY `fk_project_activity_idx` (`activity_id`),
+  UNIQUE KEY `uq_project_activity` (`id`,`activity_id`),
   KEY `idx_project_status` (`status`),
+  KEY `idx_project_activity_created` (`activity_id`,`created_at`),
   CONSTRAINT `fk_project_activity` FOREIGN KEY (`activity_id`) REFERENCES `activities` (`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `projects_archive`
+--
+
+DROP TABLE IF EXISTS `projects_archive`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `projects_archive` (
+  `id` int unsigned NOT NULL,
+  `title` varchar(45) NOT NULL,
+  `repository_url` varchar(250) NOT NULL,
+  `activity_id` int unsigned NOT NULL,
+  `is_group` tinyint unsigned NOT NULL DEFAULT '0',
+  `member_count` smallint unsigned NOT NULL DEFAULT '0',
+  `grade` decimal(3,1) unsigned DEFAULT NULL,
+  `status` enum('OPEN','READY','GRADED') NOT NULL DEFAULT 'GRADED',
+  `created_at` datetime NOT NULL,
+  `updated_at` datetime NOT NULL,
+  PRIMARY KEY (`id`),
+  KEY `idx_project_archive_activity_created` (`activity_id`,`created_at`),
+  CONSTRAINT `fk_project_archive_activity` FOREIGN KEY (`activity_id`) REFERENCES `activities_archive` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `students`
 --
@@ -159,6 +356,7 @@ CREATE TABLE `students` (
   UNIQUE KEY `enrollment_number_UNIQUE` (`enrollment_number`),
   KEY `fk_student_user_idx` (`user_id`),
   KEY `idx_student_enrollment` (`enrollment_number`),
+  KEY `idx_student_major` (`major`),
   CONSTRAINT `fk_student_user` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`)
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -178,37 +376,11 @@ CREATE TABLE `users` (
   `last_name` varchar(100) NOT NULL,
   `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`id`),
-  UNIQUE KEY `email_UNIQUE` (`email`)
+  UNIQUE KEY `email_UNIQUE` (`email`),
+  KEY `idx_user_name` (`last_name`,`first_name`)
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
---
--- Dumping events for database 'gespro'
---
-/*!50106 SET @save_time_zone= @@TIME_ZONE */ ;
-/*!50106 DROP EVENT IF EXISTS `close_activity_projects` */;
-DELIMITER ;;
-/*!50003 SET @saved_cs_client      = @@character_set_client */ ;;
-/*!50003 SET @saved_cs_results     = @@character_set_results */ ;;
-/*!50003 SET @saved_col_connection = @@collation_connection */ ;;
-/*!50003 SET character_set_client  = utf8mb4 */ ;;
-/*!50003 SET character_set_results = utf8mb4 */ ;;
-/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;;
-/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;;
-/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;;
-/*!50003 SET @saved_time_zone      = @@time_zone */ ;;
-/*!50003 SET time_zone             = 'SYSTEM' */ ;;
-/*!50106 CREATE*/ /*!50117 DEFINER=`root`@`localhost`*/ /*!50106 EVENT `close_activity_projects` ON SCHEDULE EVERY 1 DAY STARTS '2025-01-23 00:00:00' ON COMPLETION NOT PRESERVE ENABLE DO UPDATE projects INNER JOIN activities ON projects.activity_id = activities.id
-    SET projects.status = 'READY'
-    WHERE projects.status = 'OPEN' AND date(activities.due_date) < date(now()) */ ;;
-/*!50003 SET time_zone             = @saved_time_zone */ ;;
-/*!50003 SET sql_mode              = @saved_sql_mode */ ;;
-/*!50003 SET character_set_client  = @saved_cs_client */ ;;
-/*!50003 SET character_set_results = @saved_cs_results */ ;;
-/*!50003 SET collation_connection  = @saved_col_connection */ ;;
-DELIMITER ;
-/*!50106 SET TIME_ZONE= @save_time_zone */ ;
-
 --
 -- Dumping routines for database 'gespro'
 --
@@ -228,30 +400,15 @@ in project_id int unsigned,
 out member_id int unsigned
 )
 BEGIN
-	DECLARE activity_id_var INT;
-    DECLARE existing_project_count INT;
-    
-    -- Get the activity_id for the project
-    SELECT activity_id INTO activity_id_var
-    FROM projects 
-    WHERE id = project_id;
-    
-    -- Check if student is already in any project for this activity
-    SELECT COUNT(*) INTO existing_project_count
-    FROM members pm
-    JOIN projects p ON p.id = pm.project_id
-    WHERE pm.student_id = student_id
-    AND p.activity_id = activity_id_var;
-    
-    -- If student is already in a project for this activity, raise an error
-    IF existing_project_count > 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Student already participates in a project for this activity';
-    ELSE
-        -- If not, proceed with adding the member
-        insert into members (project_id, student_id) values (project_id, student_id);
+    -- Si el estudiante ya participa en un proyecto de la actividad,
+    -- uq_member_activity_student rechaza el insert
+    insert into members (project_id, activity_id, student_id)
+    select p.id, p.activity_id, student_id from projects p where p.id = project_id;
+    IF ROW_COUNT() > 0 THEN
         set member_id = last_insert_id();
-        update projects set is_group = 1 where projects.id = project_id;
+        -- las asignaciones se evalúan en orden, is_group usa el nuevo member_count
+        update projects set member_count = member_count + 1, is_group = member_count > 1
+        where projects.id = project_id;
     END IF;
 END ;;
 DELIMITER ;
@@ -275,11 +432,14 @@ CREATE DEFINER=`root`@`localhost` PROCEDURE `CreateActivity`(
     IN p_due_date datetime,
     IN p_min_grade decimal(3,1) unsigned,
     IN p_professor_id INT,
-    OUT activity_id INT UNSIGNED
+    OUT activity_id INT UNSIGNED,
+    OUT p_created_at DATETIME
 )
 BEGIN
-    INSERT INTO activities (name, description, due_date, min_grade, professor_id)
-    VALUES (p_name, p_description, p_due_date, p_min_grade, p_professor_id);
+    SET p_created_at = NOW();
+
+    INSERT INTO activities (name, description, due_date, min_grade, professor_id, created_at, updated_at)
+    VALUES (p_name, p_description, p_due_date, p_min_grade, p_professor_id, p_created_at, p_created_at);
     
     SET activity_id = LAST_INSERT_ID();
 END ;;
@@ -303,31 +463,18 @@ IN title varchar(45),
 IN repository_url varchar(250),
 IN activity_id int unsigned,
 IN student_id int unsigned,
-OUT project_id int unsigned
+OUT project_id int unsigned,
+OUT p_created_at DATETIME
 )
 BEGIN
-    DECLARE existing_project_count INT;
-    
-    -- Check if student is already in any project for this activity
-    SELECT COUNT(*) INTO existing_project_count
-    FROM members pm
-    JOIN projects p ON p.id = pm.project_id
-    WHERE pm.student_id = student_id
-    AND p.activity_id = activity_id;
-    
-    -- If student is already in a project for this activity, raise an error
-    IF existing_project_count > 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Student already participates in a project for this activity';
-    ELSE
-        -- If not, proceed with adding the member
-        insert into projects (title, repository_url, activity_id)
-		values (title, repository_url, activity_id);
-		SET project_id = LAST_INSERT_ID();
-		insert into members (project_id, student_id, is_owner)
-		values (project_id, student_id, 1);
-    END IF;
-	
+    -- Si el estudiante ya participa en un proyecto de la actividad,
+    -- uq_member_activity_student rechaza el insert en members
+    SET p_created_at = NOW();
+    insert into projects (title, repository_url, activity_id, member_count, created_at, updated_at)
+    values (title, repository_url, activity_id, 1, p_created_at, p_created_at);
+    SET project_id = LAST_INSERT_ID();
+    insert into members (project_id, activity_id, student_id, is_owner)
+    values (project_id, activity_id, student_id, 1);
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
@@ -2,5 +2,6 @@ INSERT INTO `users` VALUES (1,'nicolas_blanco1989@yahoo.com',_binary '$2b$12$WWd
 INSERT INTO `students` VALUES (1,886736,'Licenciatura en Meteorología',1,'2018-07-04 02:27:09'),(2,341947,'Licenciatura en Análisis de Sistemas',2,'2019-06-17 20:35:09'),(3,693574,'Ciencias de la Computación',3,'2020-07-27 06:47:09'),(4,131435,'Licenciatura en Meteorología',4,'2021-01-24 02:31:09'),(5,144307,'Licenciatura en Meteorología',5,'2021-03-05 19:13:09'),(6,903498,'Licenciatura en Análisis de Sistemas',6,'2018-02-19 19:50:09'),(7,987492,'Ciencias de la Computación',7,'2020-11-08 13:11:09'),(8,246638,'Ciencias de la Atmósfera',8,'2019-07-31 14:17:09'),(9,109540,'Licenciatura en Meteorología',9,'2020-02-22 05:35:09'),(10,284007,'Ingeniería en Sistemas',10,'2018-08-28 00:11:09'),(11,989720,'Ingeniería en Sistemas',11,'2018-12-21 19:28:09'),(12,391259,'Ingeniería en Sistemas',12,'2020-08-03 19:39:09'),(13,619863,'Licenciatura en Meteorología',13,'2021-03-04 11:29:09'),(14,299751,'Licenciatura en Meteorología',14,'2017-06-25 10:43:09'),(15,505521,'Ingeniería en Sistemas',15,'2019-10-17 01:30:09'),(16,153066,'Licenciatura en Meteorología',16,'2020-12-21 01:41:09'),(17,642824,'Ingeniería en Sistemas',17,'2020-03-03 02:36:09'),(18,684776,'Ciencias de la Atmósfera',18,'2017-04-18 21:42:09'),(19,652802,'Ciencias de la Atmósfera',19,'2017-03-21 03:13:09'),(20,631338,'Licenciatura en Análisis de Sistemas',20,'2017-10-05 00:50:09'),(21,203363,'Ingeniería en Sistemas',21,'2017-07-17 01:11:09'),(22,629301,'Ciencias de la Atmósfera',22,'2021-09-09 19:40:09'),(23,752648,'Ingeniería en Sistemas',23,'2020-04-23 09:25:09'),(24,437870,'Licenciatura en Análisis de Sistemas',24,'2017-11-30 17:16:09'),(25,783900,'Ciencias de la Atmósfera',25,'2017-01-03 11:37:09'),(26,350062,'Ciencias de la Computación',26,'2018-04-05 03:33:09'),(27,412836,'Licenciatura en Análisis de Sistemas',27,'2021-09-28 17:44:09'),(28,566773,'Ciencias de la Atmósfera',28,'2020-04-17 00:44:09'),(29,599910,'Ciencias de la Atmósfera',29,'2016-11-29 22:40:09'),(30,246560,'Licenciatura en Meteorología',30,'2019-09-27 16:26:09'),(31,338426,'Ingeniería en Sistemas',31,'2020-05-05 10:36:09'),(32,586838,'Ciencias de la Atmósfera',32,'2016-12-14 02:28:09'),(33,197362,'Ciencias de la Computación',33,'2019-03-08 21:17:09'),(34,683221,'Ciencias de la Computación',34,'2017-06-14 18:36:09'),(35,355864,'Ciencias de la Computación',35,'2019-07-28 19:48:09'),(36,442285,'Ciencias de la Computación',36,'2021-06-05 12:16:09'),(37,807532,'Ciencias de la Atmósfera',37,'2019-03-28 01:27:09'),(38,799436,'Ingeniería en Sistemas',38,'2020-11-27 23:27:09'),(39,761301,'Ingeniería en Sistemas',39,'2017-01-16 14:22:09'),(40,581231,'Licenciatura en Meteorología',40,'2021-10-16 06:26:09');
 INSERT INTO `professors` VALUES (1,'Informática','Desarrollo Web',41),(2,'Informática','Bases de datos',42),(3,'Informática','Mobile',43);
 INSERT INTO `activities` VALUES (1,'Simulacro Scrum','Simulacro de gestion de un proyecto de software utilizando Scrum','2029-01-10 05:01:09',6,1,'2025-01-22 05:01:08','2025-01-22 05:01:08'),(2,'TP 2 - SQL','Sentencias creacionales.','2028-08-07 05:01:09',6,2,'2025-01-22 05:01:08','2025-01-22 05:01:08'),(3,'TP 1 - Android Jetpack Compose','Estructura de aplicaciones con Compose','2025-02-10 05:01:09',6,3,'2025-01-22 05:01:08','2025-01-22 05:01:08');
-INSERT INTO `projects` VALUES (1,'Futbol5','https://github.com/user2754/futbol5.git',1,1,NULL,'OPEN','2025-01-22 05:01:08','2025-01-22 05:01:08'),(2,'Gimnasio','https://github.com/user3456/gimnasio.git',1,0,NULL,'OPEN','2025-01-22 05:01:08','2025-01-22 05:01:08'),(3,'TP 2 - SQL','https://github.com/user9236/sql-create.git',2,0,NULL,'OPEN','2025-01-22 05:01:08','2025-01-22 05:01:08'),(4,'TP 1 - Compose - Todo App','https://github.com/user6416/todo-app.git',3,0,NULL,'OPEN','2025-01-22 05:01:08','2025-01-22 05:01:08');
-INSERT INTO `members` VALUES (1,1,1,1,'2025-01-22 05:01:08'),(2,1,6,0,'2025-01-22 05:01:08'),(3,1,8,0,'2025-01-22 05:01:08'),(4,1,10,0,'2025-01-22 05:01:08'),(5,2,30,1,'2025-01-22 05:01:08'),(6,3,6,1,'2025-01-22 05:01:08'),(7,4,14,1,'2025-01-22 05:01:08');
\ No newline at end of file
+INSERT INTO `projects` VALUES (1,'Futbol5','https://github.com/user2754/futbol5.git',1,1,4,NULL,'OPEN','2025-01-22 05:01:08','2025-01-22 05:01:08'),(2,'Gimnasio','https://github.com/user3456/gimnasio.git',1,0,1,NULL,'OPEN','2025-01-22 05:01:08','2025-01-22 05:01:08'),(3,'TP 2 - SQL','https://github.com/user9236/sql-create.git',2,0,1,NULL,'OPEN','2025-01-22 05:01:08','2025-01-22 05:01:08'),(4,'TP 1 - Compose - Todo App','https://github.com/user6416/todo-app.git',3,0,1,NULL,'OPEN','2025-01-22 05:01:08','2025-01-22 05:01:08');
+INSERT INTO `members` VALUES (1,1,1,1,1,'2025-01-22 05:01:08'),(2,1,1,6,0,'2025-01-22 05:01:08'),(3,1,1,8,0,'2025-01-22 05:01:08'),(4,1,1,10,0,'2025-01-22 05:01:08'),(5,2,1,30,1,'2025-01-22 05:01:08'),(6,3,2,6,1,'2025-01-22 05:01:08'),(7,4,3,14,1,'2025-01-22 05:01:08');
+INSERT INTO `activity_stats` VALUES (1,2,5,0,0,0.0,'2025-01-22 05:01:08'),(2,1,1,0,0,0.0,'2025-01-22 05:01:08'),(3,1,1,0,0,0.0,'2025-01-22 05:01:08');
\ No newline at end of file
@@ -0,0 +1,26 @@
+-- Estadísticas por actividad mantenidas de forma incremental
+-- por las escrituras de proyectos, miembros y calificaciones.
+
+CREATE TABLE IF NOT EXISTS `activity_stats` (
+  `activity_id` int unsigned NOT NULL,
+  `project_count` int NOT NULL DEFAULT '0',
+  `student_count` int NOT NULL DEFAULT '0',
+  `graded_count` int NOT NULL DEFAULT '0',
+  `passed_count` int NOT NULL DEFAULT '0',
+  `grade_sum` decimal(10,1) NOT NULL DEFAULT '0.0',
+  `updated_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`activity_id`),
+  CONSTRAINT `fk_activity_stats_activity` FOREIGN KEY (`activity_id`) REFERENCES `activities` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- Backfill a partir de los proyectos existentes
+REPLACE INTO activity_stats (activity_id, project_count, student_count, graded_count, passed_count, grade_sum)
+SELECT a.id,
+       COUNT(p.id),
+       COALESCE(SUM((SELECT COUNT(*) FROM members m WHERE m.project_id = p.id)), 0),
+       COUNT(p.grade),
+       COALESCE(SUM(p.grade >= a.min_grade), 0),
+       COALESCE(SUM(p.grade), 0)
+FROM activities a
+JOIN projects p ON p.activity_id = a.id
+GROUP BY a.id;
@@ -0,0 +1,11 @@
+-- Índices para filtrar los proyectos de una actividad por datos
+-- de los alumnos (nombre, carrera) y por fecha de creación.
+
+ALTER TABLE `students` ADD KEY `idx_student_major` (`major`);
+
+ALTER TABLE `users` ADD KEY `idx_user_name` (`last_name`, `first_name`);
+
+-- El índice compuesto también sirve a la FK, reemplaza a fk_project_activity_idx
+ALTER TABLE `projects`
+  ADD KEY `idx_project_activity_created` (`activity_id`, `created_at`),
+  DROP KEY `fk_project_activity_idx`;
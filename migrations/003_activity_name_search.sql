@@ -0,0 +1,11 @@
+-- Búsqueda de actividades por nombre: índice B-tree para prefijos
+-- y FULLTEXT con parser ngram para coincidencias en medio del nombre.
+-- El índice (professor_id, created_at) resuelve el listado de un profesor
+-- sin filesort y reemplaza al índice de la FK.
+
+ALTER TABLE `activities`
+  ADD KEY `idx_activity_name` (`name`),
+  ADD KEY `idx_activity_professor_created` (`professor_id`, `created_at`),
+  DROP KEY `fk_activity_professor_idx`;
+
+ALTER TABLE `activities` ADD FULLTEXT KEY `ft_activity_name` (`name`) WITH PARSER ngram;
@@ -0,0 +1,4 @@
+-- El cierre de proyectos vencidos ahora lo hace la aplicación
+-- (src/services/deadline_scheduler.py) al vencer cada actividad.
+
+DROP EVENT IF EXISTS `close_activity_projects`;
@@ -0,0 +1,19 @@
+-- Registro de cambios (outbox) de proyectos, miembros, calificaciones
+-- y actividades. Se escribe en la misma transacción que el cambio y se
+-- consume por cursor (id) desde GET /api/changes?since=.
+
+CREATE TABLE IF NOT EXISTS `changes` (
+  `id` bigint unsigned NOT NULL AUTO_INCREMENT,
+  `entity` enum('activity','project','member') NOT NULL,
+  `action` varchar(20) NOT NULL,
+  `activity_id` int unsigned DEFAULT NULL,
+  `project_id` int unsigned DEFAULT NULL,
+  `student_id` int unsigned DEFAULT NULL,
+  `professor_id` int unsigned DEFAULT NULL,
+  `payload` json DEFAULT NULL,
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  KEY `idx_change_professor` (`professor_id`,`id`),
+  KEY `idx_change_project` (`project_id`,`id`),
+  KEY `idx_change_student` (`student_id`,`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
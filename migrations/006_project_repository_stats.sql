@@ -0,0 +1,20 @@
+-- Métricas de los repositorios de los proyectos (commits, último commit y
+-- tamaño), calculadas en segundo plano por RepositoryIngestor.
+-- claimed_until reparte el trabajo entre instancias: un proyecto solo se
+-- procesa en la instancia que lo reclamó hasta esa fecha.
+
+CREATE TABLE IF NOT EXISTS `project_repository_stats` (
+  `project_id` int unsigned NOT NULL,
+  `repository_url` varchar(250) NOT NULL,
+  `status` enum('PENDING','OK','ERROR') NOT NULL DEFAULT 'PENDING',
+  `head_sha` char(40) DEFAULT NULL,
+  `commit_count` int unsigned DEFAULT NULL,
+  `last_commit_at` datetime DEFAULT NULL,
+  `size_bytes` bigint unsigned DEFAULT NULL,
+  `error` varchar(255) DEFAULT NULL,
+  `fetched_at` datetime DEFAULT NULL,
+  `claimed_until` datetime DEFAULT NULL,
+  PRIMARY KEY (`project_id`),
+  KEY `idx_repository_stats_fetched` (`fetched_at`),
+  CONSTRAINT `fk_repository_stats_project` FOREIGN KEY (`project_id`) REFERENCES `projects` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
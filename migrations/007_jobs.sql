@@ -0,0 +1,24 @@
+-- Cola de trabajos lentos (importaciones, recálculo de estadísticas).
+-- Los workers de la aplicación toman el siguiente trabajo con
+-- SELECT ... FOR UPDATE SKIP LOCKED, por prioridad y fecha de ejecución.
+
+CREATE TABLE IF NOT EXISTS `jobs` (
+  `id` bigint unsigned NOT NULL AUTO_INCREMENT,
+  `type` varchar(50) NOT NULL,
+  `payload` json DEFAULT NULL,
+  `status` enum('QUEUED','RUNNING','DONE','FAILED') NOT NULL DEFAULT 'QUEUED',
+  `priority` smallint NOT NULL DEFAULT '0',
+  `attempts` tinyint unsigned NOT NULL DEFAULT '0',
+  `max_attempts` tinyint unsigned NOT NULL DEFAULT '3',
+  `run_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `locked_until` datetime DEFAULT NULL,
+  `result` json DEFAULT NULL,
+  `error` varchar(500) DEFAULT NULL,
+  `user_id` int unsigned DEFAULT NULL,
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `started_at` datetime DEFAULT NULL,
+  `finished_at` datetime DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  KEY `idx_job_claim` (`status`,`priority` DESC,`run_at`),
+  KEY `idx_job_locked` (`status`,`locked_until`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
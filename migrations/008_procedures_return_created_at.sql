@@ -0,0 +1,60 @@
+-- CreateActivity y CreateProject devuelven también la fecha de creación,
+-- así la aplicación arma la actividad o el proyecto creado sin volver a
+-- leerlo. created_at y updated_at se guardan con el mismo valor.
+
+DROP PROCEDURE IF EXISTS `CreateActivity`;
+DROP PROCEDURE IF EXISTS `CreateProject`;
+
+DELIMITER ;;
+CREATE PROCEDURE `CreateActivity`(
+    IN p_name VARCHAR(45),
+    IN p_description VARCHAR(1000),
+    IN p_due_date datetime,
+    IN p_min_grade decimal(3,1) unsigned,
+    IN p_professor_id INT,
+    OUT activity_id INT UNSIGNED,
+    OUT p_created_at DATETIME
+)
+BEGIN
+    SET p_created_at = NOW();
+
+    INSERT INTO activities (name, description, due_date, min_grade, professor_id, created_at, updated_at)
+    VALUES (p_name, p_description, p_due_date, p_min_grade, p_professor_id, p_created_at, p_created_at);
+    
+    SET activity_id = LAST_INSERT_ID();
+END ;;
+
+CREATE PROCEDURE `CreateProject`(
+IN title varchar(45),
+IN repository_url varchar(250),
+IN activity_id int unsigned,
+IN student_id int unsigned,
+OUT project_id int unsigned,
+OUT p_created_at DATETIME
+)
+BEGIN
+    DECLARE existing_project_count INT;
+    
+    -- Check if student is already in any project for this activity
+    SELECT COUNT(*) INTO existing_project_count
+    FROM members pm
+    JOIN projects p ON p.id = pm.project_id
+    WHERE pm.student_id = student_id
+    AND p.activity_id = activity_id;
+    
+    -- If student is already in a project for this activity, raise an error
+    IF existing_project_count > 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Student already participates in a project for this activity';
+    ELSE
+        -- If not, proceed with adding the member
+        SET p_created_at = NOW();
+        insert into projects (title, repository_url, activity_id, created_at, updated_at)
+		values (title, repository_url, activity_id, p_created_at, p_created_at);
+		SET project_id = LAST_INSERT_ID();
+		insert into members (project_id, student_id, is_owner)
+		values (project_id, student_id, 1);
+    END IF;
+	
+END ;;
+DELIMITER ;
@@ -0,0 +1,66 @@
+-- Un estudiante participa en un solo proyecto por actividad. En lugar de
+-- contarlo en CreateProject y AddMember, members guarda la actividad del
+-- proyecto y el índice único uq_member_activity_student lo garantiza,
+-- también con altas simultáneas.
+
+ALTER TABLE `members` ADD COLUMN `activity_id` int unsigned DEFAULT NULL AFTER `project_id`;
+
+UPDATE `members` m
+JOIN `projects` p ON p.id = m.project_id
+SET m.activity_id = p.activity_id;
+
+-- Si hay estudiantes con más de un proyecto en una actividad, el índice
+-- único no se puede crear. Se listan con:
+-- SELECT activity_id, student_id, COUNT(*) FROM members
+-- GROUP BY activity_id, student_id HAVING COUNT(*) > 1;
+
+-- (id, activity_id) permite que members referencie al proyecto junto con
+-- su actividad, así activity_id no puede diferir de la del proyecto
+ALTER TABLE `projects` ADD UNIQUE KEY `uq_project_activity` (`id`,`activity_id`);
+
+ALTER TABLE `members`
+  MODIFY `activity_id` int unsigned NOT NULL,
+  ADD UNIQUE KEY `uq_member_activity_student` (`activity_id`,`student_id`),
+  ADD KEY `fk_member_project_activity_idx` (`project_id`,`activity_id`),
+  ADD CONSTRAINT `fk_member_project_activity` FOREIGN KEY (`project_id`, `activity_id`)
+      REFERENCES `projects` (`id`, `activity_id`) ON DELETE CASCADE ON UPDATE CASCADE;
+
+DROP PROCEDURE IF EXISTS `CreateProject`;
+DROP PROCEDURE IF EXISTS `AddMember`;
+
+DELIMITER ;;
+CREATE PROCEDURE `CreateProject`(
+IN title varchar(45),
+IN repository_url varchar(250),
+IN activity_id int unsigned,
+IN student_id int unsigned,
+OUT project_id int unsigned,
+OUT p_created_at DATETIME
+)
+BEGIN
+    -- Si el estudiante ya participa en un proyecto de la actividad,
+    -- uq_member_activity_student rechaza el insert en members
+    SET p_created_at = NOW();
+    insert into projects (title, repository_url, activity_id, created_at, updated_at)
+    values (title, repository_url, activity_id, p_created_at, p_created_at);
+    SET project_id = LAST_INSERT_ID();
+    insert into members (project_id, activity_id, student_id, is_owner)
+    values (project_id, activity_id, student_id, 1);
+END ;;
+
+CREATE PROCEDURE `AddMember`(
+in student_id int unsigned,
+in project_id int unsigned,
+out member_id int unsigned
+)
+BEGIN
+    -- Si el estudiante ya participa en un proyecto de la actividad,
+    -- uq_member_activity_student rechaza el insert
+    insert into members (project_id, activity_id, student_id)
+    select p.id, p.activity_id, student_id from projects p where p.id = project_id;
+    IF ROW_COUNT() > 0 THEN
+        set member_id = last_insert_id();
+        update projects set is_group = 1 where projects.id = project_id;
+    END IF;
+END ;;
+DELIMITER ;
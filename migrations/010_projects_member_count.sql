@@ -0,0 +1,52 @@
+-- projects.member_count se mantiene al agregar y quitar miembros, en la
+-- misma transacción, e is_group se deriva de él. Los listados muestran el
+-- tamaño del grupo sin contar members.
+
+ALTER TABLE `projects` ADD COLUMN `member_count` smallint unsigned NOT NULL DEFAULT '0' AFTER `is_group`;
+
+UPDATE `projects` p
+SET p.member_count = (SELECT COUNT(*) FROM `members` m WHERE m.project_id = p.id);
+
+UPDATE `projects` SET is_group = member_count > 1;
+
+DROP PROCEDURE IF EXISTS `CreateProject`;
+DROP PROCEDURE IF EXISTS `AddMember`;
+
+DELIMITER ;;
+CREATE PROCEDURE `CreateProject`(
+IN title varchar(45),
+IN repository_url varchar(250),
+IN activity_id int unsigned,
+IN student_id int unsigned,
+OUT project_id int unsigned,
+OUT p_created_at DATETIME
+)
+BEGIN
+    -- Si el estudiante ya participa en un proyecto de la actividad,
+    -- uq_member_activity_student rechaza el insert en members
+    SET p_created_at = NOW();
+    insert into projects (title, repository_url, activity_id, member_count, created_at, updated_at)
+    values (title, repository_url, activity_id, 1, p_created_at, p_created_at);
+    SET project_id = LAST_INSERT_ID();
+    insert into members (project_id, activity_id, student_id, is_owner)
+    values (project_id, activity_id, student_id, 1);
+END ;;
+
+CREATE PROCEDURE `AddMember`(
+in student_id int unsigned,
+in project_id int unsigned,
+out member_id int unsigned
+)
+BEGIN
+    -- Si el estudiante ya participa en un proyecto de la actividad,
+    -- uq_member_activity_student rechaza el insert
+    insert into members (project_id, activity_id, student_id)
+    select p.id, p.activity_id, student_id from projects p where p.id = project_id;
+    IF ROW_COUNT() > 0 THEN
+        set member_id = last_insert_id();
+        -- las asignaciones se evalúan en orden, is_group usa el nuevo member_count
+        update projects set member_count = member_count + 1, is_group = member_count > 1
+        where projects.id = project_id;
+    END IF;
+END ;;
+DELIMITER ;
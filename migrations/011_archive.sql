@@ -0,0 +1,53 @@
+-- Archivo de actividades de cuatrimestres anteriores. ArchiveService mueve
+-- las actividades calificadas por completo, con sus proyectos y miembros,
+-- a estas tablas; las tablas de trabajo solo conservan los cuatrimestres
+-- recientes. Las actividades archivadas guardan sus estadísticas, que se
+-- eliminan de activity_stats junto con la actividad.
+
+CREATE TABLE IF NOT EXISTS `activities_archive` (
+  `id` int unsigned NOT NULL,
+  `name` varchar(45) NOT NULL,
+  `description` varchar(1000) DEFAULT NULL,
+  `due_date` datetime NOT NULL,
+  `min_grade` decimal(3,1) unsigned NOT NULL,
+  `professor_id` int unsigned NOT NULL,
+  `created_at` datetime NOT NULL,
+  `updated_at` datetime NOT NULL,
+  `project_count` int NOT NULL DEFAULT '0',
+  `student_count` int NOT NULL DEFAULT '0',
+  `graded_count` int NOT NULL DEFAULT '0',
+  `passed_count` int NOT NULL DEFAULT '0',
+  `grade_sum` decimal(10,1) NOT NULL DEFAULT '0.0',
+  `archived_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  KEY `idx_activity_archive_professor_created` (`professor_id`,`created_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+CREATE TABLE IF NOT EXISTS `projects_archive` (
+  `id` int unsigned NOT NULL,
+  `title` varchar(45) NOT NULL,
+  `repository_url` varchar(250) NOT NULL,
+  `activity_id` int unsigned NOT NULL,
+  `is_group` tinyint unsigned NOT NULL DEFAULT '0',
+  `member_count` smallint unsigned NOT NULL DEFAULT '0',
+  `grade` decimal(3,1) unsigned DEFAULT NULL,
+  `status` enum('OPEN','READY','GRADED') NOT NULL DEFAULT 'GRADED',
+  `created_at` datetime NOT NULL,
+  `updated_at` datetime NOT NULL,
+  PRIMARY KEY (`id`),
+  KEY `idx_project_archive_activity_created` (`activity_id`,`created_at`),
+  CONSTRAINT `fk_project_archive_activity` FOREIGN KEY (`activity_id`) REFERENCES `activities_archive` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+CREATE TABLE IF NOT EXISTS `members_archive` (
+  `id` int unsigned NOT NULL,
+  `project_id` int unsigned NOT NULL,
+  `activity_id` int unsigned NOT NULL,
+  `student_id` int unsigned NOT NULL,
+  `is_owner` tinyint unsigned NOT NULL DEFAULT '0',
+  `joined_at` datetime NOT NULL,
+  PRIMARY KEY (`id`),
+  KEY `idx_member_archive_project` (`project_id`),
+  KEY `idx_member_archive_student` (`student_id`),
+  CONSTRAINT `fk_member_archive_project` FOREIGN KEY (`project_id`) REFERENCES `projects_archive` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
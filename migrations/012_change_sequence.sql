@@ -0,0 +1,13 @@
+-- Secuencia de ids del registro de cambios. ChangeRepository.record toma
+-- el próximo id como última sentencia de la transacción y el lock de la
+-- fila se mantiene hasta el commit, así los ids de changes se confirman
+-- en orden y el cursor de GET /api/changes?since= no saltea cambios de
+-- transacciones que todavía no confirmaron.
+
+CREATE TABLE IF NOT EXISTS `change_sequence` (
+  `id` bigint unsigned NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+INSERT INTO `change_sequence` (`id`)
+SELECT COALESCE(MAX(`id`), 0) FROM `changes`
+WHERE NOT EXISTS (SELECT 1 FROM `change_sequence`);
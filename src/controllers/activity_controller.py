@@ -3,17 +3,35 @@ from flask import current_app as app
 from flask import jsonify
 from flask import abort
 from flask import Blueprint
+from flask import Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt
 from mysql.connector.errors import Error, IntegrityError, DataError
 
 from src.models.activity import Activity
 from src.services.activity_service import ActivityService, ActivityOwnerError
+from src.services.archive_service import ArchiveService
 from src.repositories.activity_repository import ActivityRepository
+from src.utils.pagination import get_pagination
+from src.controllers.job_controller import accepted
+from src.utils.grade_export import EXPORT_FORMATS, export_chunks
+from src.utils.response_cache import cache_response
 
 activity_routes_bp = Blueprint('activity_bp', __name__, url_prefix="/api/activities")
 
+
+def _activities_tags(claims, view_args):
+    # los estudiantes ven todas las actividades, o las de un profesor con ?professor_id=
+    if claims["role"] == "student":
+        professor_id = request.args.get("professor_id")
+    else:
+        professor_id = claims["professor_id"]
+    tags = [f"professor:{professor_id}"] if professor_id else ["activities"]
+    # el archivo cambia recién cuando se archivan actividades
+    return tags + ["archive"] if request.args.get("archived") == "true" else tags
+
 @activity_routes_bp.route("/", methods=["GET"])
 @jwt_required()
+@cache_response(_activities_tags, lambda activities: [f"activity:{a['id']}" for a in activities])
 def get_activities():
     claims = get_jwt()
     role = claims["role"]
@@ -22,7 +40,19 @@ def get_activities():
         professor_id = request.args.get("professor_id")
     else:
         professor_id = claims["professor_id"]
-    activities = activity_service.get_activities(professor_id)
+    page = per_page = None
+    if "page" in request.args or "per_page" in request.args:
+        try:
+            page, per_page = get_pagination()
+        except ValueError as err:
+            return jsonify({"message": f"Error de valor. {err}"}), 422
+    # ?archived=true lista las actividades de cuatrimestres anteriores, de solo lectura
+    if request.args.get("archived") == "true":
+        activity_service = ArchiveService(app.db)
+    activities = activity_service.get_activities(professor_id,
+                                                 name=request.args.get("name"),
+                                                 page=page,
+                                                 per_page=per_page)
 
     if activities:
         return jsonify(activities), 200
@@ -129,6 +159,7 @@ def delete_activity(activity_id):
 
 @activity_routes_bp.route("/<int:activity_id>/grades", methods=["GET"])
 @jwt_required()
+@cache_response(lambda claims, view_args: [f"activity:{view_args['activity_id']}"])
 def activity_grades(activity_id):
     """Obtener listado de calificaciones de proyectos de una actividad"""
     claims = get_jwt()
@@ -145,3 +176,65 @@ def activity_grades(activity_id):
         abort(500)
     else:
         return jsonify(projects), 200
+
+@activity_routes_bp.route("/<int:activity_id>/grades/export", methods=["GET"])
+@jwt_required()
+def export_activity_grades(activity_id):
+    """Descargar la planilla de calificaciones de una actividad en csv o xlsx"""
+    claims = get_jwt()
+    if claims["role"] != "professor":
+        abort(403)
+    export_format = request.args.get("format", "csv")
+    try:
+        rows = ActivityService(app.db).export_grades(activity_id, claims["professor_id"])
+        chunks = export_chunks(rows, export_format)
+    except ValueError as err:
+        return jsonify({"message": f"Error de valor. {err}"}), 422
+    except ActivityOwnerError as err:
+        return jsonify({"message": f"{err}"}), 403
+    except Error as err:
+        app.logger.error("MySQL error. %s - %s", err.errno, err.msg)
+        abort(500)
+    else:
+        filename = f"activity_{activity_id}_grades.{export_format}"
+        return Response(stream_with_context(chunks),
+                        mimetype=EXPORT_FORMATS[export_format],
+                        headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+@activity_routes_bp.route("/<int:activity_id>/stats", methods=["GET"])
+@jwt_required()
+def activity_stats(activity_id):
+    """Obtener estadísticas de calificaciones de una actividad"""
+    claims = get_jwt()
+    if claims["role"] != "professor":
+        abort(403)
+    try:
+        stats = ActivityService(app.db).get_stats(activity_id, claims["professor_id"])
+    except ValueError as err:
+        return jsonify({"message": f"Error de valor. {err}"}), 422
+    except ActivityOwnerError as err:
+        return jsonify({"message": f"{err}"}), 403
+    except Error as err:
+        app.logger.error("MySQL error. %s - %s", err.errno, err.msg)
+        abort(500)
+    else:
+        return jsonify(stats), 200
+
+@activity_routes_bp.route("/<int:activity_id>/stats/rebuild", methods=["POST"])
+@jwt_required()
+def rebuild_activity_stats(activity_id):
+    """Recalcular las estadísticas de una actividad en segundo plano"""
+    claims = get_jwt()
+    if claims["role"] != "professor":
+        abort(403)
+    try:
+        job = ActivityService(app.db).rebuild_stats(activity_id, claims["professor_id"], claims["user_id"])
+    except ValueError as err:
+        return jsonify({"message": f"Error de valor. {err}"}), 422
+    except ActivityOwnerError as err:
+        return jsonify({"message": f"{err}"}), 403
+    except Error as err:
+        app.logger.error("MySQL error. %s - %s", err.errno, err.msg)
+        abort(500)
+    else:
+        return accepted(job)
@@ -25,7 +25,7 @@ def register_student():
     try:
         saved_student = AuthService(app.db).create_student(student_to_register)
     except DbError:
-        abort(500)
+        abort(503)
     except AuthPasswordError:
         return jsonify({"message": "La contraseña no cumple las condiciones."}), 401
     except ValueError:
@@ -86,6 +86,8 @@ def validate_token():
         else:
             abort(404)
             
+    except DbError:
+        abort(503)
     except Exception as e:
         app.logger.error(f"Error validando token: {str(e)}")
         abort(500)
@@ -0,0 +1,50 @@
+from flask import request
+from flask import current_app as app
+from flask import jsonify
+from flask import abort
+from flask import Blueprint
+from flask_jwt_extended import jwt_required, get_jwt
+from mysql.connector.errors import Error
+
+from src.db import DbError
+from src.repositories.change_repository import ChangeRepository
+
+change_routes_bp = Blueprint('change_bp', __name__, url_prefix="/api/changes")
+
+# Cantidad máxima de cambios por página del feed
+MAX_CHANGES = 500
+
+@change_routes_bp.route("/", methods=["GET"])
+@jwt_required()
+def get_changes():
+    """Feed de cambios posteriores al cursor since.
+
+    Devuelve los cambios del alcance del usuario y next_cursor,
+    el valor de since para pedir la siguiente página.
+    """
+    claims = get_jwt()
+    try:
+        since = int(request.args.get("since", 0))
+        limit = min(int(request.args.get("limit", 100)), MAX_CHANGES)
+    except ValueError:
+        return jsonify({"message": "since y limit deben ser enteros."}), 422
+    if since < 0 or limit < 1:
+        return jsonify({"message": "since y limit deben ser positivos."}), 422
+
+    if claims["role"] == "professor":
+        scope = {"professor_id": claims["professor_id"]}
+    elif claims["role"] == "student":
+        scope = {"student_id": claims["student_id"]}
+    else:
+        abort(403)
+
+    try:
+        changes = ChangeRepository(app.db).find_since(since, limit, **scope)
+    except DbError:
+        abort(503)
+    except Error as err:
+        app.logger.error("Error al obtener los cambios: %s", err)
+        abort(500)
+    else:
+        next_cursor = changes[-1]["id"] if changes else since
+        return jsonify({"changes": changes, "next_cursor": next_cursor}), 200
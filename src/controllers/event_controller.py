@@ -0,0 +1,85 @@
+import json
+
+from flask import request
+from flask import current_app as app
+from flask import abort
+from flask import Blueprint
+from flask import Response, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt
+
+from src.repositories.change_repository import ChangeRepository
+from src.repositories.project_repository import ProjectRepository
+from src.utils.event_hub import EVENT_TYPES, Subscriber
+
+event_routes_bp = Blueprint('event_bp', __name__, url_prefix="/api/events")
+
+# Segundos entre comentarios de keep-alive en una conexión sin eventos
+HEARTBEAT_SECONDS = 15
+
+# Cambios perdidos que se reenvían como máximo, con más se pide resync
+MAX_MISSED_CHANGES = 500
+
+
+def _format_event(event_id: int, event: str, data: dict) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@event_routes_bp.route("/stream", methods=["GET"])
+@jwt_required(locations=["headers", "query_string"])
+def stream():
+    """Server-Sent Events con los proyectos creados, cambios de miembros y
+    calificaciones del alcance del usuario.
+
+    EventSource no permite enviar headers, por eso también se acepta el
+    token en ?jwt=. Con el header Last-Event-ID primero se reenvían los
+    cambios perdidos desde el registro de cambios; si son demasiados se
+    envía resync para que el cliente recargue.
+    """
+    claims = get_jwt()
+    if claims["role"] == "professor":
+        scope = {"professor_id": claims["professor_id"]}
+        subscriber = Subscriber("professor", claims["professor_id"])
+    elif claims["role"] == "student":
+        scope = {"student_id": claims["student_id"]}
+        project_ids = ProjectRepository(app.db).find_project_ids_by_student(claims["student_id"])
+        subscriber = Subscriber("student", claims["student_id"], project_ids)
+    else:
+        abort(403)
+
+    # primero la suscripción y después el registro: lo publicado entre las
+    # dos consultas llega por ambos lados y se descarta por id
+    event_hub = app.event_hub
+    event_hub.subscribe(subscriber)
+    missed = []
+    last_event_id = request.headers.get("Last-Event-ID")
+    if last_event_id and last_event_id.isdigit():
+        try:
+            missed = ChangeRepository(app.db).find_since(int(last_event_id), MAX_MISSED_CHANGES, **scope)
+        except Exception:
+            event_hub.unsubscribe(subscriber)
+            raise
+    replayed_id = missed[-1]["id"] if missed else 0
+
+    def generate():
+        try:
+            yield "retry: 5000\n\n"
+            if len(missed) == MAX_MISSED_CHANGES:
+                yield "event: resync\ndata: {}\n\n"
+                return
+            for change in missed:
+                event = EVENT_TYPES.get((change["entity"], change["action"]))
+                if event:
+                    yield _format_event(change["id"], event, change)
+            while not subscriber.overflowed:
+                item = subscriber.get(timeout=HEARTBEAT_SECONDS)
+                if item is None:
+                    yield ": keep-alive\n\n"
+                elif item[0] > replayed_id:
+                    yield _format_event(*item)
+            yield "event: resync\ndata: {}\n\n"
+        finally:
+            event_hub.unsubscribe(subscriber)
+
+    return Response(stream_with_context(generate()),
+                    mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -0,0 +1,35 @@
+from flask import current_app as app
+from flask import jsonify
+from flask import abort
+from flask import Blueprint
+from flask_jwt_extended import jwt_required, get_jwt
+from mysql.connector.errors import Error
+
+from src.db import DbError
+from src.repositories.job_repository import JobRepository
+
+job_routes_bp = Blueprint('job_bp', __name__, url_prefix="/api/jobs")
+
+
+def accepted(job):
+    """Respuesta 202 de una operación encolada, con la URL para consultar su estado."""
+    response = jsonify({"job_id": job.id, "status": job.status, "status_url": f"/api/jobs/{job.id}"})
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+    return response, 202
+
+@job_routes_bp.route("/<int:job_id>", methods=["GET"])
+@jwt_required()
+def get_job(job_id: int):
+    """Estado y resultado de un trabajo encolado por el usuario."""
+    try:
+        job = JobRepository(app.db).find_by_id(job_id)
+    except DbError:
+        abort(503)
+    except Error as err:
+        app.logger.error("Error al obtener el trabajo: %s", err)
+        abort(500)
+    if job is None:
+        abort(404)
+    if job.user_id != get_jwt()["user_id"]:
+        abort(403)
+    return jsonify(job), 200
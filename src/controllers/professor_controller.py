@@ -5,13 +5,20 @@ from flask import Blueprint
 
 from src.models.user import Professor
 from src.services.auth_service import AuthService
-from flask_jwt_extended import jwt_required
+from src.services.activity_service import ActivityService
+from src.utils.pagination import get_pagination
+from flask_jwt_extended import jwt_required, get_jwt
+from mysql.connector.errors import Error
 from src.db import DbError
 
 professor_routes_bp = Blueprint(
     "professor_bp", __name__, url_prefix="/api/users/professors"
 )
 
+professor_me_routes_bp = Blueprint(
+    "professor_me_bp", __name__, url_prefix="/api/professors/me"
+)
+
 
 @professor_routes_bp.route("/<int:professor_id>", methods=["GET"])
 @jwt_required()
@@ -22,4 +29,29 @@ def get_professor_by_professor_id(professor_id):
             return jsonify(professor), 200
         abort(404)
     except DbError:
-        abort(500)
\ No newline at end of file
+        abort(503)
+
+
+@professor_me_routes_bp.route("/dashboard", methods=["GET"])
+@jwt_required()
+def get_dashboard():
+    """Actividades del profesor con sus proyectos y estado de calificación.
+
+    Los proyectos de cada actividad se paginan con projects_page y projects_per_page.
+    """
+    claims = get_jwt()
+    if claims["role"] != "professor":
+        abort(403)
+    try:
+        page, per_page = get_pagination(prefix="projects_")
+    except ValueError as err:
+        return jsonify({"message": f"Error de valor. {err}"}), 422
+    try:
+        dashboard = ActivityService(app.db).get_dashboard(claims["professor_id"], page, per_page)
+    except DbError:
+        abort(503)
+    except Error as err:
+        app.logger.error("Error al obtener el dashboard: %s", err)
+        abort(500)
+    else:
+        return jsonify({"professor_id": claims["professor_id"], "activities": dashboard}), 200
@@ -2,12 +2,20 @@ from flask import request, jsonify, abort, Blueprint
 from flask import current_app as app
 from flask_jwt_extended import jwt_required, get_jwt
 
+from src.db import DbError
 from src.services.project_service import (
     ProjectService, ProjectServiceError, ProjectValueError, ProjectOwnerError, NotFoundError)
 from src.models.project import Project
+from src.utils.response_cache import cache_response
 
 project_routes_bp = Blueprint('project_bp', __name__, url_prefix="/api/projects")
 
+
+def _projects_tags(claims, view_args):
+    role = claims.get("role")
+    tags = [f"{role}:{claims.get(f'{role}_id')}"] if role in ("student", "professor") else []
+    return tags + ["archive"] if request.args.get("archived") == "true" else tags
+
 @project_routes_bp.route("/", methods=["POST"])
 @jwt_required()
 def create_project():
@@ -31,6 +39,8 @@ def create_project():
         abort(403, description=str(e))
     except NotFoundError as e:
         abort(404, description=str(e))
+    except DbError:
+        abort(503)
     except Exception as e:
         app.logger.error(f"Error al crear el proyecto: {str(e)}")
         abort(500, description=str(e))
@@ -57,12 +67,15 @@ def add_member(project_id: int):
         abort(403, description=str(e))
     except NotFoundError as e:
         abort(404, description=str(e))
+    except DbError:
+        abort(503)
     except Exception as e:
         app.logger.error("Error al añadir un miembro: %s", e)
         abort(500)
 
 @project_routes_bp.route("/", methods=["GET"])
 @jwt_required()
+@cache_response(_projects_tags, lambda projects: [f"activity:{p['activity_id']}" for p in projects])
 def get_projects():
     # Controlamos que solo los estudiantes y profesores puedan ver los proyectos
     claims = get_jwt()
@@ -75,14 +88,25 @@ def get_projects():
     else:
         return jsonify({"message": "Rol no autorizado."}), 403
     
-    # Filtramos por id de actividad si se proporciona
-    activity_id = request.args.get("activity_id")
-    if activity_id:
-        filters["activity_id"] = activity_id
+    # Filtramos por actividad, datos de los alumnos y fecha de creación si se proporcionan
+    for key in ("activity_id", "student_name", "enrollment_number", "major", "date_from", "date_to"):
+        if request.args.get(key):
+            filters[key] = request.args.get(key)
+    if request.args.get("date"):
+        filters["date_from"] = filters["date_to"] = request.args.get("date")
+
+    # expand=members agrega nombre, matrícula y carrera de cada miembro
+    expand_members = request.args.get("expand") == "members"
+    # archived=true lista los proyectos archivados (ver ArchiveService)
+    archived = request.args.get("archived") == "true"
 
     try:
-        projects = ProjectService(app.db).get_projects(filters)
+        projects = ProjectService(app.db).get_projects(filters, expand_members, archived)
         return jsonify(projects), 200
+    except ValueError as e:
+        return jsonify({"message": f"Error de valor. {e}"}), 422
+    except DbError:
+        abort(503)
     except Exception as e:
         app.logger.error(f"Error al obtener los proyectos: {str(e)}")
         abort(500, description=str(e))
@@ -109,6 +133,8 @@ def remove_member(project_id: int, student_id: int):
         abort(403, description=str(e))
     except NotFoundError as e:
         abort(404, description=str(e))
+    except DbError:
+        abort(503)
     except Exception as e:
         app.logger.error("Error al eliminar miembro: %s", e)
         abort(500, description=str(e))
@@ -137,6 +163,8 @@ def update_project(project_id: int):
         abort(403, description=str(e))
     except NotFoundError as e:
         abort(404, description=str(e))
+    except DbError:
+        abort(503)
     except Exception as e:
         app.logger.error(f"Error al actualizar el proyecto: {str(e)}")
         abort(500, description=str(e))
@@ -158,12 +186,41 @@ def delete_project(project_id: int):
         abort(404, description=str(e))
     except ProjectOwnerError as e:
         abort(403, description=str(e))
+    except DbError:
+        abort(503)
     except Exception as e:
         app.logger.error(f"Error al eliminar el proyecto: {str(e)}")
         abort(500, description=str(e))
     else:
         return "", 204
 
+@project_routes_bp.route("/<int:project_id>/repository", methods=["GET"])
+@jwt_required()
+def repository_stats(project_id: int):
+    """Commits, último commit y tamaño del repositorio del proyecto.
+
+    Responde 202 mientras el repositorio todavía no se leyó.
+    """
+    claims = get_jwt()
+    try:
+        stats = ProjectService(app.db).get_repository_stats(project_id,
+                                                            professor_id=claims.get("professor_id"),
+                                                            student_id=claims.get("student_id"))
+    except ProjectOwnerError as e:
+        abort(403, description=str(e))
+    except NotFoundError as e:
+        abort(404, description=str(e))
+    except DbError:
+        abort(503)
+    except Exception as e:
+        app.logger.error(f"Error al obtener las métricas del repositorio: {str(e)}")
+        abort(500)
+    if stats.status == "PENDING":
+        if app.repository_ingestor:
+            app.repository_ingestor.wake()
+        return jsonify(stats), 202
+    return jsonify(stats), 200
+
 @project_routes_bp.route("/<int:project_id>/grades", methods=["POST"])
 @jwt_required()
 def grade(project_id):
@@ -178,6 +235,8 @@ def grade(project_id):
         graded = ProjectService(app.db).grade(project_id, claims["professor_id"], grade)
     except ValueError as err:
         return jsonify({"message": f"{err}"}), 422
+    except DbError:
+        abort(503)
     except Exception as err:
         app.logger.error("MySQL error. %s - %s", err.errno, err.msg)
         abort(500)
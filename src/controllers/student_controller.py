@@ -1,3 +1,5 @@
+import io
+
 from flask import request
 from flask import current_app as app
 from flask import jsonify
@@ -6,14 +8,94 @@ from flask import Blueprint
 
 from src.models.user import Student
 from src.services.auth_service import AuthService
+from src.services.student_import_service import StudentImportService
+from src.services.jobs import IMPORT_STUDENTS
+from src.controllers.job_controller import accepted
 from src.db import DbError
-from flask_jwt_extended import jwt_required
+from src.utils.pagination import get_pagination
+from flask_jwt_extended import jwt_required, get_jwt
 
 student_routes_bp = Blueprint(
     "student_bp", __name__, url_prefix="/api/users/students"
 )
 
 
+# Cantidad máxima de ids por consulta en GET /api/users/students?ids=
+MAX_STUDENT_IDS = 100
+
+
+@student_routes_bp.route("/", methods=["GET"])
+@jwt_required()
+def get_students():
+    """Obtener varios estudiantes por id, ej: ?ids=1,2,3
+
+    Sin ids, busca compañeros de grupo paginados con filtros opcionales
+    major y available_for_activity, junto con el conteo por carrera.
+    """
+    if "ids" not in request.args:
+        return find_teammates()
+    try:
+        student_ids = [int(id) for id in request.args.get("ids", "").split(",") if id.strip()]
+    except ValueError:
+        return jsonify({"message": "Los ids deben ser enteros separados por coma."}), 422
+    if not student_ids:
+        return jsonify({"message": "Se requiere al menos un id."}), 422
+    if len(student_ids) > MAX_STUDENT_IDS:
+        return jsonify({"message": f"Se pueden consultar hasta {MAX_STUDENT_IDS} estudiantes."}), 422
+
+    try:
+        students = AuthService(app.db).get_students_by_ids(student_ids)
+        return jsonify(students), 200
+    except DbError:
+        abort(503)
+
+def find_teammates():
+    try:
+        page, per_page = get_pagination()
+        activity_id = request.args.get("available_for_activity")
+        activity_id = int(activity_id) if activity_id else None
+    except ValueError as err:
+        return jsonify({"message": f"Error de valor. {err}"}), 422
+
+    try:
+        result = AuthService(app.db).find_teammates(request.args.get("major"), activity_id,
+                                                    page, per_page)
+        return jsonify(result), 200
+    except DbError:
+        abort(503)
+
+@student_routes_bp.route("/import", methods=["POST"])
+@jwt_required()
+def import_students():
+    """Alta masiva de estudiantes desde un CSV enviado en el campo file.
+
+    Columnas: email, password, first_name, last_name, enrollment_number,
+    major y, opcional, enrolled_at. El archivo se valida y las contraseñas
+    se hashean antes de encolar la importación, que responde 202; el resultado del trabajo tiene la cantidad de estudiantes creados
+    y los errores por línea (duplicados o datos inválidos).
+    """
+    claims = get_jwt()
+    if claims["role"] != "professor":
+        abort(403)
+    file = request.files.get("file")
+    if file is None:
+        return jsonify({"message": "Se requiere un archivo CSV en el campo file."}), 422
+    try:
+        content = file.stream.read().decode("utf-8-sig")
+        # el payload queda en la tabla jobs: se encola con las contraseñas ya hasheadas
+        payload = StudentImportService(app.db, app.config["STUDENT_IMPORT_WORKERS"],
+                                       app.config["STUDENT_IMPORT_CHUNK_SIZE"]).prepare(
+            io.StringIO(content, newline=""))
+    except (ValueError, UnicodeDecodeError) as err:
+        return jsonify({"message": f"Error de valor. {err}"}), 422
+    try:
+        job = app.job_queue.enqueue(IMPORT_STUDENTS, payload, priority=10,
+                                    max_attempts=1, user_id=claims["user_id"])
+    except DbError:
+        abort(503)
+    else:
+        return accepted(job)
+
 @student_routes_bp.route("/search", methods=["GET"])
 @jwt_required()
 def search_students():
@@ -30,7 +112,7 @@ def search_students():
             "last_name": s.last_name
         } for s in students]), 200
     except DbError:
-        abort(500)
+        abort(503)
 
 @student_routes_bp.route("/<int:student_id>", methods=["GET"])
 @jwt_required()
@@ -41,4 +123,4 @@ def get_student_by_student_id(student_id):
             return jsonify(student), 200
         abort(404)
     except DbError:
-        abort(500)
\ No newline at end of file
+        abort(503)
\ No newline at end of file
@@ -10,6 +10,7 @@ class Activity:
         self.professor_id = kwargs.get("professor_id")
         self.created_at = kwargs.get("created_at")
         self.updated_at = kwargs.get("updated_at")
+        self.stats = kwargs.get("stats")
 
     def __repr__(self):
         attrs = (f"{k}={v}" for k,v in self.__dict__.items())
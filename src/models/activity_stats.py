@@ -0,0 +1,17 @@
+class ActivityStats:
+    def __init__(self, **kwargs):
+        self.activity_id = kwargs.get("activity_id")
+        self.project_count = kwargs.get("project_count") or 0
+        self.student_count = kwargs.get("student_count") or 0
+        self.graded_count = kwargs.get("graded_count") or 0
+        self.passed_count = kwargs.get("passed_count") or 0
+        grade_sum = float(kwargs.get("grade_sum") or 0)
+        if self.graded_count:
+            self.average_grade = round(grade_sum / self.graded_count, 2)
+            self.pass_rate = round(self.passed_count / self.graded_count, 4)
+        else:
+            self.average_grade = None
+            self.pass_rate = None
+
+    def __repr__(self):
+        return f"<ActivityStats of Activity {self.activity_id}>"
@@ -0,0 +1,19 @@
+class Job:
+    def __init__(self, **kwargs):
+        self.id = kwargs.get("id")
+        self.type = kwargs.get("type")
+        self.payload = kwargs.get("payload")
+        self.status = kwargs.get("status", "QUEUED")
+        self.priority = kwargs.get("priority", 0)
+        self.attempts = kwargs.get("attempts", 0)
+        self.max_attempts = kwargs.get("max_attempts", 3)
+        self.run_at = kwargs.get("run_at")
+        self.result = kwargs.get("result")
+        self.error = kwargs.get("error")
+        self.user_id = kwargs.get("user_id")
+        self.created_at = kwargs.get("created_at")
+        self.started_at = kwargs.get("started_at")
+        self.finished_at = kwargs.get("finished_at")
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.type}>"
@@ -5,6 +5,7 @@ class Project:
         self.repository_url = kwargs.get("repository_url")
         self.activity_id = kwargs.get("activity_id")
         self.is_group = kwargs.get("is_group", False)
+        self.member_count = kwargs.get("member_count", 0)
         self.grade = kwargs.get("grade")
         self.status = kwargs.get("status", "OPEN")
         self.created_at = kwargs.get("created_at")
@@ -0,0 +1,14 @@
+class RepositoryStats:
+    def __init__(self, **kwargs):
+        self.project_id = kwargs.get("project_id")
+        self.repository_url = kwargs.get("repository_url")
+        self.status = kwargs.get("status", "PENDING")
+        self.head_sha = kwargs.get("head_sha")
+        self.commit_count = kwargs.get("commit_count")
+        self.last_commit_at = kwargs.get("last_commit_at")
+        self.size_bytes = kwargs.get("size_bytes")
+        self.error = kwargs.get("error")
+        self.fetched_at = kwargs.get("fetched_at")
+
+    def __repr__(self):
+        return f"<RepositoryStats of Project {self.project_id}>"
@@ -1,30 +1,50 @@
 from datetime import datetime
+from decimal import Decimal
 
 from mysql.connector.errors import Error
 from flask import current_app as app
 
 from src.models.activity import Activity
-from src.db import Database
+from src.models.activity_stats import ActivityStats
+from src.repositories.activity_stats_repository import ActivityStatsRepository, STATS_COLUMNS
+from src.repositories.change_repository import ChangeRepository
+from src.db import Database, retry_transaction
+from src.utils.sql import like_prefix
+
+# Valor de ngram_token_size del servidor (por defecto 2)
+NGRAM_TOKEN_SIZE = 2
 
 class ActivityRepository:
     def __init__(self, db: Database):
         self.db = db
 
-    def find_all(self) -> list[Activity]:
-        with self.db.get_connection() as conn:
+    @staticmethod
+    def _with_stats(row: dict) -> Activity:
+        """Crear la actividad con sus estadísticas unidas desde activity_stats."""
+        stats = {column: row.pop(column, None) for column in STATS_COLUMNS}
+        return Activity(**row, stats=ActivityStats(activity_id=row["id"], **stats))
+
+    def find_all(self, limit: int = None, offset: int = 0) -> list[Activity]:
+        with self.db.get_read_connection() as conn:
             query = """SELECT a.id, a.name, a.description, a.due_date, a.min_grade, a.professor_id, a.created_at,
-                       a.updated_at, u.last_name, u.first_name
+                       a.updated_at, u.last_name, u.first_name,
+                       s.project_count, s.student_count, s.graded_count, s.passed_count, s.grade_sum
                        FROM activities AS a INNER JOIN professors AS p
                        ON a.professor_id = p.id
                        INNER JOIN users AS u ON p.user_id = u.id
+                       LEFT JOIN activity_stats AS s ON s.activity_id = a.id
                        ORDER BY u.last_name ASC, u.first_name ASC, created_at DESC"""
+            params = ()
+            if limit is not None:
+                query += " LIMIT %s OFFSET %s"
+                params = (limit, offset)
             cursor = conn.cursor(dictionary=True)
-            cursor.execute(query)
+            cursor.execute(query, params)
             result = cursor.fetchall()
-            return [Activity(**activity) for activity in result]
+            return [self._with_stats(activity) for activity in result]
 
     def find_by_id(self, activity_id: int) -> Activity:
-        with self.db.get_connection() as conn:
+        with self.db.get_read_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT * FROM activities WHERE id = %s", (activity_id,))
             activity = cursor.fetchone()
@@ -33,34 +53,68 @@ class ActivityRepository:
             else:
                 return Activity(id=None)
 
-    def find_by_name(self, name) -> list[Activity]:
+    def find_by_name(self, name: str, professor_id: int = None,
+                     limit: int = None, offset: int = 0) -> list[Activity]:
         """Buscar actividades por nombre.
 
-        Se utilizan los comodines %name%, con LIKE.
+        Primero se devuelven las que empiezan con name (LIKE 'name%' sobre
+        idx_activity_name) y luego las que lo contienen, resueltas con el
+        índice FULLTEXT ngram ft_activity_name. Dentro de cada grupo se
+        ordenan por created_at descendente.
         """
-        name = f"%{name}%"
-        with self.db.get_connection() as conn:
+        name = name.strip()
+        prefix = like_prefix(name)
+        columns = """a.*, s.project_count, s.student_count, s.graded_count, s.passed_count, s.grade_sum"""
+        professor_clause = " AND a.professor_id = %s" if professor_id is not None else ""
+
+        query = f"""SELECT {columns}, 0 AS match_rank
+                    FROM activities AS a
+                    LEFT JOIN activity_stats AS s ON s.activity_id = a.id
+                    WHERE a.name LIKE %s{professor_clause}"""
+        params = [prefix] + ([professor_id] if professor_id is not None else [])
+
+        # el parser ngram no indexa términos más cortos que ngram_token_size (2)
+        if len(name) >= NGRAM_TOKEN_SIZE:
+            phrase = '"{}"'.format(name.replace('"', ""))
+            query += f"""
+                    UNION ALL
+                    SELECT {columns}, 1 AS match_rank
+                    FROM activities AS a
+                    LEFT JOIN activity_stats AS s ON s.activity_id = a.id
+                    WHERE MATCH(a.name) AGAINST (%s IN BOOLEAN MODE)
+                    AND a.name NOT LIKE %s{professor_clause}"""
+            params += [phrase, prefix] + ([professor_id] if professor_id is not None else [])
+
+        query += " ORDER BY match_rank ASC, created_at DESC"
+        if limit is not None:
+            query += " LIMIT %s OFFSET %s"
+            params += [limit, offset]
+
+        with self.db.get_read_connection() as conn:
             cursor = conn.cursor(dictionary=True)
-            cursor.execute("SELECT * FROM activities WHERE name LIKE %s ORDER BY created_at DESC",
-                           (name,))
+            cursor.execute(query, tuple(params))
             result = cursor.fetchall()
-            if result:
-                activities = []
-                for row in result:
-                    activity = Activity(**row)
-                    activities.append(activity)
-                return activities
-            else:
-                return []
+            activities = []
+            for row in result:
+                row.pop("match_rank")
+                activities.append(self._with_stats(row))
+            return activities
 
-    def find_by_professor(self, professor_id) -> list[Activity]:
+    def find_by_professor(self, professor_id, limit: int = None, offset: int = 0) -> list[Activity]:
         """Buscar todas las actividades de un professor."""
-        with self.db.get_connection() as conn:
+        query = """SELECT a.*, s.project_count, s.student_count, s.graded_count, s.passed_count, s.grade_sum
+                   FROM activities AS a
+                   LEFT JOIN activity_stats AS s ON s.activity_id = a.id
+                   WHERE a.professor_id = %s ORDER BY a.created_at DESC"""
+        params = [professor_id]
+        if limit is not None:
+            query += " LIMIT %s OFFSET %s"
+            params += [limit, offset]
+        with self.db.get_read_connection() as conn:
             cursor = conn.cursor(dictionary=True)
-            cursor.execute("SELECT * FROM activities WHERE professor_id = %s ORDER BY created_at DESC",
-                           (professor_id,))
+            cursor.execute(query, tuple(params))
             result = cursor.fetchall()
-            return [Activity(**activity) for activity in result]
+            return [self._with_stats(activity) for activity in result]
 
     def find_by_due_date(self, due_date: datetime) -> list[Activity]:
         """Buscar actividades por fecha de entrega.
@@ -68,13 +122,31 @@ class ActivityRepository:
         Se asume due_date del tipo datetime.datetime y al buscar
         se utiliza solo due_date.date.
         """
-        with self.db.get_connection() as conn:
+        with self.db.get_read_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT * FROM activities WHERE due_date = %s ORDER BY created_at DESC",
                            (due_date.date,))
             result = cursor.fetchall()
             return [Activity(**activity) for activity in result]
 
+    def find_pending_deadlines(self, since: datetime) -> list[dict]:
+        """Actividades cuyos proyectos todavía hay que cerrar.
+
+        Devuelve las que vencen desde since en adelante y las ya vencidas
+        que conservan proyectos en estado OPEN. Se lee del primario: una
+        réplica atrasada devolvería fechas ya modificadas.
+        """
+        query = """SELECT id, due_date FROM activities WHERE due_date >= %s
+                   UNION
+                   SELECT a.id, a.due_date FROM activities a
+                   WHERE a.id IN (SELECT p.activity_id FROM projects p WHERE p.status = 'OPEN')
+                   AND a.due_date < %s"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, (since, since))
+            return cursor.fetchall()
+
+    @retry_transaction()
     def save(self, activity: Activity) -> Activity:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
@@ -85,39 +157,57 @@ class ActivityRepository:
                                        activity.due_date,
                                        activity.min_grade,
                                        activity.professor_id,
-                                       None))
+                                       None,
+                                       (None, "DATETIME")))
+                ChangeRepository.record(cursor, "activity", "created", activity_id=res[-2])
             except Error:
                 conn.rollback()
                 raise
             else:
                 conn.commit()
-                activity.id = res[-1]
-                return self.find_by_id(activity.id)
+                # se arma con los datos enviados y el id y la fecha que devuelve
+                # el procedimiento, sin volver a leer la actividad
+                activity.id = res[-2]
+                activity.created_at = activity.updated_at = res[-1]
+                activity.min_grade = Decimal(str(activity.min_grade)).quantize(Decimal("0.1"))
+                return activity
 
+    @retry_transaction()
     def update(self, activity: Activity) -> Activity:
         """Actualizar datos de una actividad.
 
         Por defecto no se actualiza el id del professor
-        que creo la actividad originalmente.
+        que creo la actividad originalmente. Devuelve la misma actividad
+        con su updated_at, el resto de los datos los completa el servicio.
         """
         query = """UPDATE activities
-                   SET name = %s, description = %s, due_date = %s, min_grade = %s
+                   SET name = %s, description = %s, due_date = %s, min_grade = %s, updated_at = %s
                    WHERE id = %s"""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             try:
+                # la hora de la base, no la del servidor de la aplicación
+                cursor.execute("SELECT NOW()")
+                activity.updated_at = cursor.fetchone()[0]
                 cursor.execute(query, (activity.name,
                                        activity.description,
                                        activity.due_date,
                                        activity.min_grade,
+                                       activity.updated_at,
                                        activity.id))
+                ActivityStatsRepository.on_min_grade_changed(cursor, activity.id, activity.min_grade)
+                ChangeRepository.record(cursor, "activity", "updated", activity_id=activity.id,
+                                        payload={"due_date": str(activity.due_date),
+                                                 "min_grade": float(activity.min_grade)})
             except Error:
                 conn.rollback()
                 raise
             else:
                 conn.commit()
-                return self.find_by_id(activity.id)
+                activity.min_grade = Decimal(str(activity.min_grade)).quantize(Decimal("0.1"))
+                return activity
 
+    @retry_transaction(idempotent=True)
     def delete(self, activity_id: int) -> None:
         """Eliminar una actividad.
 
@@ -0,0 +1,113 @@
+from mysql.connector.errors import Error
+
+from src.models.activity_stats import ActivityStats
+from src.db import Database, retry_transaction
+
+# Columnas de activity_stats que se agregan al listado de actividades
+STATS_COLUMNS = ("project_count", "student_count", "graded_count", "passed_count", "grade_sum")
+
+class ActivityStatsRepository:
+    """Estadísticas por actividad.
+
+    La tabla activity_stats se mantiene incrementalmente: los métodos
+    on_* reciben el cursor de la transacción que modifica proyectos
+    o miembros, así las estadísticas se actualizan en la misma transacción.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def find_by_activity(self, activity_id: int) -> ActivityStats:
+        with self.db.get_read_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT * FROM activity_stats WHERE activity_id = %s", (activity_id,))
+            row = cursor.fetchone()
+            return ActivityStats(**row) if row else ActivityStats(activity_id=activity_id)
+
+    @retry_transaction(idempotent=True)
+    def rebuild(self, activity_id: int = None) -> None:
+        """Recalcular las estadísticas desde projects y members.
+
+        Sin activity_id se recalculan todas las actividades.
+        """
+        query = """REPLACE INTO activity_stats
+                   (activity_id, project_count, student_count, graded_count, passed_count, grade_sum)
+                   SELECT a.id,
+                          COUNT(p.id),
+                          COALESCE(SUM((SELECT COUNT(*) FROM members m WHERE m.project_id = p.id)), 0),
+                          COUNT(p.grade),
+                          COALESCE(SUM(p.grade >= a.min_grade), 0),
+                          COALESCE(SUM(p.grade), 0)
+                   FROM activities a
+                   LEFT JOIN projects p ON p.activity_id = a.id"""
+        params = ()
+        if activity_id is not None:
+            query += " WHERE a.id = %s"
+            params = (activity_id,)
+        query += " GROUP BY a.id"
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query, params)
+            except Error:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+
+    @staticmethod
+    def on_project_created(cursor, activity_id: int) -> None:
+        cursor.execute(
+            """INSERT INTO activity_stats (activity_id, project_count, student_count)
+               VALUES (%s, 1, 1)
+               ON DUPLICATE KEY UPDATE project_count = project_count + 1,
+                                       student_count = student_count + 1""",
+            (activity_id,))
+
+    @staticmethod
+    def on_project_deleted(cursor, project_id: int) -> None:
+        """Descontar un proyecto. Debe llamarse antes de eliminarlo."""
+        cursor.execute(
+            """UPDATE activity_stats s
+               JOIN projects p ON p.activity_id = s.activity_id
+               JOIN activities a ON a.id = p.activity_id
+               SET s.project_count = s.project_count - 1,
+                   s.student_count = s.student_count - p.member_count,
+                   s.graded_count = s.graded_count - (p.grade IS NOT NULL),
+                   s.passed_count = s.passed_count - COALESCE(p.grade >= a.min_grade, 0),
+                   s.grade_sum = s.grade_sum - COALESCE(p.grade, 0)
+               WHERE p.id = %s""",
+            (project_id,))
+
+    @staticmethod
+    def on_project_graded(cursor, project_id: int, grade: float) -> None:
+        """Aplicar una calificación. Debe llamarse antes de actualizar
+        projects.grade para poder descontar la nota anterior."""
+        cursor.execute(
+            """UPDATE activity_stats s
+               JOIN projects p ON p.activity_id = s.activity_id
+               JOIN activities a ON a.id = p.activity_id
+               SET s.graded_count = s.graded_count + (p.grade IS NULL),
+                   s.passed_count = s.passed_count - COALESCE(p.grade >= a.min_grade, 0)
+                                    + (%s >= a.min_grade),
+                   s.grade_sum = s.grade_sum - COALESCE(p.grade, 0) + %s
+               WHERE p.id = %s""",
+            (grade, grade, project_id))
+
+    @staticmethod
+    def on_members_changed(cursor, project_id: int, delta: int) -> None:
+        cursor.execute(
+            """UPDATE activity_stats s
+               JOIN projects p ON p.activity_id = s.activity_id
+               SET s.student_count = s.student_count + %s
+               WHERE p.id = %s""",
+            (delta, project_id))
+
+    @staticmethod
+    def on_min_grade_changed(cursor, activity_id: int, min_grade) -> None:
+        cursor.execute(
+            """UPDATE activity_stats s
+               SET s.passed_count = (SELECT COUNT(*) FROM projects p
+                                     WHERE p.activity_id = s.activity_id AND p.grade >= %s)
+               WHERE s.activity_id = %s""",
+            (min_grade, activity_id))
@@ -0,0 +1,115 @@
+from datetime import datetime
+
+from mysql.connector.errors import Error
+
+from src.models.activity import Activity
+from src.models.activity_stats import ActivityStats
+from src.repositories.activity_stats_repository import STATS_COLUMNS
+from src.repositories.change_repository import ChangeRepository
+from src.db import Database, retry_transaction
+from src.utils.sql import like_prefix
+
+
+class ArchiveRepository:
+    """Tablas de archivo: activities_archive, projects_archive y members_archive."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    @retry_transaction(idempotent=True)
+    def archive_batch(self, cutoff: datetime, batch_size: int) -> tuple[list[dict], int]:
+        """Mover a las tablas de archivo hasta batch_size actividades vencidas
+        antes de cutoff y con todos sus proyectos calificados.
+
+        Cada lote es una transacción: se copian las actividades (con sus
+        estadísticas), los proyectos y los miembros, y al eliminar las
+        actividades se eliminan en cascada el resto de sus filas.
+
+        Returns:
+            tuple: id y professor_id de las actividades archivadas y la
+                cantidad de proyectos archivados.
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                # el lock de la actividad bloquea altas de proyectos mientras se archiva
+                cursor.execute(
+                    """SELECT a.id, a.professor_id FROM activities a
+                       WHERE a.due_date < %s
+                       AND NOT EXISTS (SELECT 1 FROM projects p
+                                       WHERE p.activity_id = a.id AND p.status <> 'GRADED')
+                       ORDER BY a.id
+                       LIMIT %s
+                       FOR UPDATE""",
+                    (cutoff, batch_size))
+                activities = cursor.fetchall()
+                if not activities:
+                    conn.rollback()
+                    return [], 0
+                ids = tuple(activity["id"] for activity in activities)
+                placeholders = ", ".join(["%s"] * len(ids))
+                cursor.execute(
+                    f"""INSERT INTO activities_archive
+                        (id, name, description, due_date, min_grade, professor_id, created_at, updated_at,
+                         project_count, student_count, graded_count, passed_count, grade_sum)
+                        SELECT a.id, a.name, a.description, a.due_date, a.min_grade, a.professor_id,
+                               a.created_at, a.updated_at,
+                               COALESCE(s.project_count, 0), COALESCE(s.student_count, 0),
+                               COALESCE(s.graded_count, 0), COALESCE(s.passed_count, 0),
+                               COALESCE(s.grade_sum, 0)
+                        FROM activities a
+                        LEFT JOIN activity_stats s ON s.activity_id = a.id
+                        WHERE a.id IN ({placeholders})""",
+                    ids)
+                cursor.execute(
+                    f"""INSERT INTO projects_archive
+                        (id, title, repository_url, activity_id, is_group, member_count, grade, status,
+                         created_at, updated_at)
+                        SELECT id, title, repository_url, activity_id, is_group, member_count, grade, status,
+                               created_at, updated_at
+                        FROM projects WHERE activity_id IN ({placeholders})""",
+                    ids)
+                projects = cursor.rowcount
+                cursor.execute(
+                    f"""INSERT INTO members_archive (id, project_id, activity_id, student_id, is_owner, joined_at)
+                        SELECT id, project_id, activity_id, student_id, is_owner, joined_at
+                        FROM members WHERE activity_id IN ({placeholders})""",
+                    ids)
+                # projects, members, activity_stats y project_repository_stats se eliminan en cascada
+                cursor.execute(f"DELETE FROM activities WHERE id IN ({placeholders})", ids)
+                for activity in activities:
+                    ChangeRepository.record(cursor, "activity", "archived", activity_id=activity["id"],
+                                            professor_id=activity["professor_id"])
+            except Error:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+                return activities, projects
+
+    def find_activities(self, professor_id: int = None, name: str = None,
+                        limit: int = None, offset: int = 0) -> list[Activity]:
+        """Actividades archivadas, de la más reciente a la más antigua."""
+        query = "SELECT * FROM activities_archive"
+        conditions, params = [], []
+        if professor_id is not None:
+            conditions.append("professor_id = %s")
+            params.append(professor_id)
+        if name:
+            conditions.append("name LIKE %s")
+            params.append(like_prefix(name))
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT %s OFFSET %s"
+            params += [limit, offset]
+        with self.db.get_read_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, tuple(params))
+            activities = []
+            for row in cursor.fetchall():
+                stats = {column: row.pop(column) for column in STATS_COLUMNS}
+                row.pop("archived_at")
+                activities.append(Activity(**row, stats=ActivityStats(activity_id=row["id"], **stats)))
+            return activities
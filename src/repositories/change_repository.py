@@ -0,0 +1,78 @@
+import json
+
+from src.db import Database
+
+
+class ChangeRepository:
+    """Registro de cambios de actividades, proyectos y miembros.
+
+    record() recibe el cursor de la transacción que hace el cambio, así
+    el cambio y su registro se confirman o se descartan juntos.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    @staticmethod
+    def record(cursor, entity: str, action: str, activity_id: int = None, project_id: int = None,
+               student_id: int = None, payload: dict = None, professor_id: int = None) -> None:
+        """Agregar un cambio al registro.
+
+        Debe ser la última sentencia antes del commit: el id se toma de
+        change_sequence y el lock de esa fila se mantiene hasta el commit,
+        así los cambios se confirman en el orden de sus ids y un lector que
+        ya vio un id no recibe después uno menor.
+
+        Si no se pasa activity_id se obtiene del proyecto, y si no se pasa
+        professor_id se toma de la actividad. Cuando la transacción elimina
+        la actividad o el proyecto hay que pasar los dos.
+        """
+        cursor.execute("UPDATE change_sequence SET id = LAST_INSERT_ID(id + 1)")
+        payload = json.dumps(payload) if payload is not None else None
+        if activity_id is not None and professor_id is not None:
+            cursor.execute(
+                """INSERT INTO changes (id, entity, action, activity_id, project_id, student_id, professor_id, payload)
+                   VALUES (LAST_INSERT_ID(), %s, %s, %s, %s, %s, %s, %s)""",
+                (entity, action, activity_id, project_id, student_id, professor_id, payload))
+            return
+        cursor.execute(
+            """INSERT INTO changes (id, entity, action, activity_id, project_id, student_id, professor_id, payload)
+               SELECT LAST_INSERT_ID(), %s, %s, a.id, %s, %s, a.professor_id, %s
+               FROM activities a
+               WHERE a.id = COALESCE(%s, (SELECT p.activity_id FROM projects p WHERE p.id = %s))""",
+            (entity, action, project_id, student_id, payload, activity_id, project_id))
+
+    def find_since(self, since: int, limit: int, professor_id: int = None,
+                   student_id: int = None) -> list[dict]:
+        """Cambios con id mayor a since, en orden.
+
+        Con professor_id solo se devuelven los cambios de sus actividades.
+        Con student_id, los de sus proyectos, los que lo involucran y
+        los de actividades.
+        """
+        query = "SELECT * FROM changes WHERE id > %s"
+        params = [since]
+        if professor_id is not None:
+            query += " AND professor_id = %s"
+            params.append(professor_id)
+        elif student_id is not None:
+            query += """ AND (entity = 'activity' OR student_id = %s
+                              OR project_id IN (SELECT project_id FROM members WHERE student_id = %s))"""
+            params += [student_id, student_id]
+        query += " ORDER BY id LIMIT %s"
+        params.append(limit)
+        with self.db.get_read_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, tuple(params))
+            changes = cursor.fetchall()
+            for change in changes:
+                if isinstance(change["payload"], (str, bytes)):
+                    change["payload"] = json.loads(change["payload"])
+                change["created_at"] = change["created_at"].strftime("%Y-%m-%d %H:%M:%S")
+            return changes
+
+    def last_id(self) -> int:
+        with self.db.get_read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM changes")
+            return cursor.fetchone()[0]
@@ -0,0 +1,150 @@
+import json
+from datetime import datetime
+
+from src.db import Database, retry_transaction
+from src.models.job import Job
+
+# Columnas que se devuelven al consultar un trabajo, sin el payload
+JOB_COLUMNS = """id, type, status, priority, attempts, max_attempts, run_at, result, error,
+                 user_id, created_at, started_at, finished_at"""
+
+
+def _job(row: dict) -> Job:
+    for key in ("payload", "result"):
+        if isinstance(row.get(key), (str, bytes)):
+            row[key] = json.loads(row[key])
+    return Job(**row)
+
+
+class JobRepository:
+    """Cola de trabajos en la tabla jobs."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    @retry_transaction()
+    def enqueue(self, job: Job) -> Job:
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """INSERT INTO jobs (type, payload, priority, max_attempts, user_id)
+                   VALUES (%s, %s, %s, %s, %s)""",
+                (job.type, json.dumps(job.payload) if job.payload is not None else None,
+                 job.priority, job.max_attempts, job.user_id))
+            conn.commit()
+            job.id = cursor.lastrowid
+            return job
+
+    def find_by_id(self, job_id: int) -> Job:
+        # se lee del primario, el estado se consulta justo después de encolar
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = %s", (job_id,))
+            row = cursor.fetchone()
+            return _job(row) if row else None
+
+    @retry_transaction()
+    def claim(self, lease_seconds: int) -> Job:
+        """Tomar el próximo trabajo listo, o None si no hay.
+
+        SKIP LOCKED saltea las filas que otro worker está tomando en ese
+        momento, así los workers no se bloquean entre sí. El trabajo queda
+        reservado lease_seconds, si el proceso muere se vuelve a encolar.
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                f"""SELECT {JOB_COLUMNS}, payload FROM jobs
+                    WHERE status = 'QUEUED' AND run_at <= NOW()
+                    ORDER BY priority DESC, run_at, id
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED""")
+            row = cursor.fetchone()
+            if row is None:
+                conn.rollback()
+                return None
+            cursor.execute(
+                """UPDATE jobs SET status = 'RUNNING', attempts = attempts + 1,
+                          started_at = NOW(), locked_until = NOW() + INTERVAL %s SECOND
+                   WHERE id = %s""",
+                (lease_seconds, row["id"]))
+            conn.commit()
+            row["status"] = "RUNNING"
+            row["attempts"] += 1
+            return _job(row)
+
+    @retry_transaction(idempotent=True)
+    def extend_lease(self, job_id: int, attempts: int, lease_seconds: int) -> bool:
+        """Renovar la reserva del intento attempts de un trabajo en ejecución.
+
+        Devuelve False si el trabajo ya no está reservado para ese intento
+        (otro worker lo volvió a encolar o lo tomó).
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """UPDATE jobs SET locked_until = NOW() + INTERVAL %s SECOND
+                   WHERE id = %s AND status = 'RUNNING' AND attempts = %s""",
+                (lease_seconds, job_id, attempts))
+            conn.commit()
+            return cursor.rowcount == 1
+
+    @retry_transaction(idempotent=True)
+    def complete(self, job_id: int, attempts: int, result: dict = None) -> bool:
+        """Registrar el resultado del intento attempts. El payload se borra,
+        puede tener datos sensibles (ej: las contraseñas de una importación).
+
+        Devuelve False, sin modificar nada, si el intento perdió la reserva.
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """UPDATE jobs SET status = 'DONE', result = %s, error = NULL, payload = NULL,
+                          finished_at = NOW(), locked_until = NULL
+                   WHERE id = %s AND status = 'RUNNING' AND attempts = %s""",
+                (json.dumps(result) if result is not None else None, job_id, attempts))
+            conn.commit()
+            return cursor.rowcount == 1
+
+    @retry_transaction(idempotent=True)
+    def fail(self, job_id: int, attempts: int, error: str, retry_at: datetime = None) -> bool:
+        """Registrar un error del intento attempts. Con retry_at se vuelve a
+        encolar para esa fecha, si no el trabajo termina y, como en
+        complete(), se borra el payload.
+
+        Devuelve False, sin modificar nada, si el intento perdió la reserva.
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            if retry_at is None:
+                cursor.execute(
+                    """UPDATE jobs SET status = 'FAILED', error = %s, payload = NULL,
+                              finished_at = NOW(), locked_until = NULL
+                       WHERE id = %s AND status = 'RUNNING' AND attempts = %s""",
+                    (error[:500], job_id, attempts))
+            else:
+                cursor.execute(
+                    """UPDATE jobs SET status = 'QUEUED', error = %s, run_at = %s, locked_until = NULL
+                       WHERE id = %s AND status = 'RUNNING' AND attempts = %s""",
+                    (error[:500], retry_at, job_id, attempts))
+            conn.commit()
+            return cursor.rowcount == 1
+
+    @retry_transaction(idempotent=True)
+    def requeue_expired(self) -> int:
+        """Volver a encolar los trabajos de workers que murieron sin terminarlos.
+
+        Los que ya agotaron sus intentos se marcan como fallidos.
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """UPDATE jobs
+                   SET status = IF(attempts < max_attempts, 'QUEUED', 'FAILED'),
+                       payload = IF(attempts < max_attempts, payload, NULL),
+                       error = 'El worker no terminó el trabajo a tiempo.',
+                       finished_at = IF(attempts < max_attempts, NULL, NOW()),
+                       locked_until = NULL
+                   WHERE status = 'RUNNING' AND locked_until < NOW()""")
+            conn.commit()
+            return cursor.rowcount
@@ -1,74 +1,250 @@
+from datetime import date, datetime
+
 from src.models.project import Project
 from src.models.member import Member
+from src.repositories.activity_stats_repository import ActivityStatsRepository
+from src.repositories.change_repository import ChangeRepository
+from src.db import retry_transaction
+from src.utils.sql import like_prefix
 from mysql.connector.errors import IntegrityError
 from mysql.connector.errors import DatabaseError
 from mysql.connector.errors import Error
 
+# uq_member_activity_student: un estudiante tiene un solo proyecto por actividad
+DUPLICATE_ENTRY = 1062
+NO_REFERENCED_ROW = 1452
+
+
 class ProjectError(Exception):
     pass
 
+
+def _parse_date(value) -> date:
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Fecha con formato incorrecto: {value}. Se espera AAAA-MM-DD.")
+
+
+# Filtros permitidos sobre el proyecto: nombre -> (condición, parámetros)
+PROJECT_FILTERS = {
+    "student_id": ("m.student_id = %s", lambda v: (int(v),)),
+    "professor_id": ("a.professor_id = %s", lambda v: (int(v),)),
+    "activity_id": ("p.activity_id = %s", lambda v: (int(v),)),
+    "date_from": ("p.created_at >= %s", lambda v: (_parse_date(v),)),
+    "date_to": ("p.created_at < %s + INTERVAL 1 DAY", lambda v: (_parse_date(v),)),
+}
+
+# Tablas de trabajo y de archivo (migrations/011_archive.sql)
+PROJECT_TABLES = {"activities": "activities", "projects": "projects", "members": "members"}
+ARCHIVE_TABLES = {"activities": "activities_archive", "projects": "projects_archive",
+                  "members": "members_archive"}
+
+# Filtros permitidos sobre alguno de los miembros del proyecto.
+# Se combinan en un único EXISTS para que apliquen al mismo miembro.
+MEMBER_FILTERS = {
+    "student_name": ("(uf.last_name LIKE %s OR uf.first_name LIKE %s)",
+                     lambda v: (like_prefix(v), like_prefix(v))),
+    "enrollment_number": ("sf.enrollment_number = %s", lambda v: (int(v),)),
+    "major": ("sf.major = %s", lambda v: (str(v),)),
+}
+
+
+def build_project_filters(filters: dict, members_table: str = "members") -> tuple[list[str], list]:
+    """Construye las condiciones WHERE para find_projects_with_details.
+
+    Solo se aceptan las claves de PROJECT_FILTERS y MEMBER_FILTERS,
+    el resto se ignora. Los valores siempre van como parámetros.
+    members_table es members o members_archive.
+
+    Raises:
+        ValueError: Si algún valor no tiene el formato esperado.
+    """
+    where_clauses = []
+    params = []
+    for key, (condition, to_params) in PROJECT_FILTERS.items():
+        if filters.get(key) not in (None, ""):
+            try:
+                params.extend(to_params(filters[key]))
+            except (TypeError, ValueError) as err:
+                raise ValueError(f"Valor inválido para {key}. {err}")
+            where_clauses.append(condition)
+
+    member_clauses = []
+    for key, (condition, to_params) in MEMBER_FILTERS.items():
+        if filters.get(key) not in (None, ""):
+            try:
+                params.extend(to_params(filters[key]))
+            except (TypeError, ValueError) as err:
+                raise ValueError(f"Valor inválido para {key}. {err}")
+            member_clauses.append(condition)
+    if member_clauses:
+        where_clauses.append(
+            f"""EXISTS (SELECT 1 FROM {members_table} mf
+                       JOIN students sf ON sf.id = mf.student_id
+                       JOIN users uf ON uf.id = sf.user_id
+                       WHERE mf.project_id = p.id AND """ + " AND ".join(member_clauses) + ")")
+    return where_clauses, params
+
 class ProjectRepository:
     def __init__(self, db):
         self.db = db
 
     def find_all(self) -> list[dict]:
-        with self.db.get_connection() as conn:
+        with self.db.get_read_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT * FROM projects")
             return cursor.fetchall()
 
     def find_by_id(self, project_id: int) -> Project:
-        with self.db.get_connection() as conn:
+        with self.db.get_read_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT * FROM projects WHERE id = %s", (project_id,))
             project = cursor.fetchone()
             return Project(**project) if project else Project(id=None)
 
+    def find_with_activity(self, project_id: int) -> tuple[Project, dict]:
+        """Un proyecto y el professor_id, due_date y min_grade de su actividad
+        en una sola consulta. Devuelve (Project(id=None), None) si no existe."""
+        with self.db.get_read_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                """SELECT p.*, a.professor_id, a.due_date, a.min_grade
+                   FROM projects p
+                   JOIN activities a ON a.id = p.activity_id
+                   WHERE p.id = %s""",
+                (project_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return Project(id=None), None
+            activity = {key: row.pop(key) for key in ("professor_id", "due_date", "min_grade")}
+            return Project(**row), activity
+
     def find_by_activity(self, activity_id: int) -> list[dict]:
-        with self.db.get_connection() as conn:
+        with self.db.get_read_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT * FROM projects WHERE activity_id = %s", (activity_id,))
             return cursor.fetchall()
 
-    def find_projects_with_details(self, filters: dict = None) -> list[dict]:
-        with self.db.get_connection() as conn:
+    def find_projects_with_details(self, filters: dict = None, expand_members: bool = False,
+                                   archived: bool = False) -> list[dict]:
+        """Proyectos con datos de su actividad e ids de sus miembros.
+
+        Con expand_members se agrega la columna members, un arreglo JSON
+        con nombre, matrícula y carrera de cada miembro. Con archived se
+        leen los proyectos archivados en lugar de los actuales.
+        """
+        tables = ARCHIVE_TABLES if archived else PROJECT_TABLES
+        with self.db.get_read_connection() as conn:
             cursor = conn.cursor(dictionary=True)
-            query = """
+            members_column = ""
+            if expand_members:
+                members_column = f""",
+                       (SELECT JSON_ARRAYAGG(JSON_OBJECT(
+                                   'student_id', s.id,
+                                   'first_name', u.first_name,
+                                   'last_name', u.last_name,
+                                   'enrollment_number', s.enrollment_number,
+                                   'major', s.major,
+                                   'is_owner', mm.is_owner))
+                        FROM {tables["members"]} mm
+                        JOIN students s ON s.id = mm.student_id
+                        JOIN users u ON u.id = s.user_id
+                        WHERE mm.project_id = p.id) as members"""
+            query = f"""
                 SELECT p.*, a.name as activity_name, a.due_date, a.professor_id,
-                       GROUP_CONCAT(DISTINCT m2.student_id) as member_ids
-                FROM projects p
-                JOIN activities a ON p.activity_id = a.id
-                LEFT JOIN members m ON p.id = m.project_id
-                LEFT JOIN members m2 ON p.id = m2.project_id
+                       GROUP_CONCAT(DISTINCT m2.student_id) as member_ids{members_column}
+                FROM {tables["projects"]} p
+                JOIN {tables["activities"]} a ON p.activity_id = a.id
+                LEFT JOIN {tables["members"]} m ON p.id = m.project_id
+                LEFT JOIN {tables["members"]} m2 ON p.id = m2.project_id
             """
-            where_clauses = []
-            params = []
-
-            if filters:
-                if 'student_id' in filters:
-                    where_clauses.append("m.student_id = %s")
-                    params.append(filters['student_id'])
-                if 'professor_id' in filters:
-                    where_clauses.append("a.professor_id = %s")
-                    params.append(filters['professor_id'])
-                if 'activity_id' in filters:
-                    where_clauses.append("p.activity_id = %s")
-                    params.append(filters['activity_id'])
+            where_clauses, params = build_project_filters(filters or {}, tables["members"])
 
             if where_clauses:
                 query += " WHERE " + " AND ".join(where_clauses)
 
-            query += " GROUP BY p.id, a.name, a.due_date"
+            query += " GROUP BY p.id, a.name, a.due_date ORDER BY p.created_at DESC, p.id DESC"
             cursor.execute(query, tuple(params))
             return cursor.fetchall()
 
+    def find_by_professor_ranked(self, professor_id: int, offset: int, limit: int) -> list[dict]:
+        """Proyectos de todas las actividades de un profesor en una sola consulta.
+
+        Se devuelven como máximo limit proyectos por actividad, a partir
+        de offset, ordenados del más reciente al más antiguo.
+        """
+        query = """
+            SELECT r.id, r.title, r.repository_url, r.activity_id, r.is_group, r.member_count,
+                   r.grade, r.status,
+                   r.created_at, r.updated_at,
+                   (SELECT GROUP_CONCAT(m.student_id) FROM members m
+                    WHERE m.project_id = r.id) AS member_ids
+            FROM (
+                SELECT p.*, ROW_NUMBER() OVER (PARTITION BY p.activity_id
+                                               ORDER BY p.created_at DESC, p.id DESC) AS position
+                FROM projects p
+                JOIN activities a ON a.id = p.activity_id
+                WHERE a.professor_id = %s
+            ) r
+            WHERE r.position > %s AND r.position <= %s
+            ORDER BY r.activity_id, r.position
+        """
+        with self.db.get_read_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, (professor_id, offset, offset + limit))
+            return cursor.fetchall()
+
+    def find_project_ids_by_student(self, student_id: int) -> list[int]:
+        with self.db.get_read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT project_id FROM members WHERE student_id = %s", (student_id,))
+            return [row[0] for row in cursor.fetchall()]
+
+    def iter_grade_rows(self, activity_id: int, batch_size: int = 200):
+        """Filas de la planilla de calificaciones de una actividad, una por miembro.
+
+        Se leen de a batch_size proyectos, paginando por id (keyset), y la
+        conexión se devuelve a la pool después de cada lote: una descarga
+        lenta no retiene una conexión mientras el cliente lee.
+        """
+        query = """
+            SELECT p.id AS project_id, p.title, p.repository_url, p.status, p.grade,
+                   (p.grade >= a.min_grade) AS passed, p.created_at,
+                   m.is_owner, s.enrollment_number, u.last_name, u.first_name, s.major
+            FROM projects p
+            JOIN activities a ON a.id = p.activity_id
+            JOIN members m ON m.project_id = p.id
+            JOIN students s ON s.id = m.student_id
+            JOIN users u ON u.id = s.user_id
+            WHERE p.id IN ({})
+            ORDER BY p.id, m.is_owner DESC, u.last_name, u.first_name
+        """
+        last_id = 0
+        while True:
+            with self.db.get_read_connection() as conn:
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute(
+                    "SELECT id FROM projects WHERE activity_id = %s AND id > %s ORDER BY id LIMIT %s",
+                    (activity_id, last_id, batch_size))
+                project_ids = [row["id"] for row in cursor.fetchall()]
+                if not project_ids:
+                    return
+                cursor.execute(query.format(", ".join(["%s"] * len(project_ids))), tuple(project_ids))
+                rows = cursor.fetchall()
+            yield from rows
+            if len(project_ids) < batch_size:
+                return
+            last_id = project_ids[-1]
+
     def get_project_members(self, project_id: int) -> list[Member]:
-        with self.db.get_connection() as conn:
+        with self.db.get_read_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT * FROM members WHERE project_id = %s", (project_id,))
             results = cursor.fetchall()
             return [Member(**member) for member in results] if results else []
 
+    @retry_transaction()
     def create_project(self, project: Project, student_id: int) -> Project:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
@@ -78,19 +254,31 @@ class ProjectRepository:
                      project.repository_url,
                      project.activity_id,
                      student_id,
-                     None))
+                     None,
+                     (None, "DATETIME")))
+                ActivityStatsRepository.on_project_created(cursor, project.activity_id)
+                ChangeRepository.record(cursor, "project", "created", activity_id=project.activity_id,
+                                        project_id=res[-2], student_id=student_id,
+                                        payload={"title": project.title})
             except DatabaseError as e:
                 conn.rollback()
-                if e.errno == 1644:  # SQLSTATE '45000'
+                if e.errno == DUPLICATE_ENTRY:
                     raise ProjectError("El estudiante ya participa en un proyecto para esta actividad")
                 raise IntegrityError from e
             else:
                 conn.commit()
-                project = self.find_by_id(res[-1])
-                return project
+                # el resto de las columnas toman su valor por defecto
+                return Project(id=res[-2],
+                               title=project.title,
+                               repository_url=project.repository_url,
+                               activity_id=project.activity_id,
+                               is_group=0,
+                               member_count=1,
+                               created_at=res[-1],
+                               updated_at=res[-1])
 
     def is_project_owner(self, project_id: int, student_id: int) -> bool:
-        with self.db.get_connection() as conn:
+        with self.db.get_read_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute(
                 "SELECT 1 FROM members WHERE project_id = %s AND student_id = %s AND is_owner = 1",
@@ -99,7 +287,7 @@ class ProjectRepository:
             return cursor.fetchone() is not None
 
     def validate_member(self, student_id: int, project_id: int) -> bool:
-        with self.db.get_connection() as conn:
+        with self.db.get_read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT 1 FROM members WHERE student_id = %s AND project_id = %s",
@@ -107,6 +295,7 @@ class ProjectRepository:
             )
             return cursor.fetchone() is not None
 
+    @retry_transaction()
     def add_member(self, student_id: int, project_id: int) -> Member:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
@@ -115,21 +304,29 @@ class ProjectRepository:
                     (student_id,
                      project_id,
                      None))
+                if res[-1] is None:
+                    # AddMember no inserta nada si el proyecto no existe
+                    conn.rollback()
+                    raise ProjectError("El proyecto no existe")
+                ActivityStatsRepository.on_members_changed(cursor, project_id, 1)
+                ChangeRepository.record(cursor, "member", "added", project_id=project_id,
+                                        student_id=student_id)
                 conn.commit()
-                return Member(id=res[-1], 
-                            project_id=project_id, 
-                            student_id=student_id)
-            except DatabaseError as e:
+            except IntegrityError as e:
                 conn.rollback()
-                if e.errno == 1644:  # SQLSTATE '45000'
+                if e.errno == DUPLICATE_ENTRY:
                     raise ProjectError("El estudiante ya participa en un proyecto para esta actividad")
-            except IntegrityError:
-                conn.rollback()
-                raise ProjectError("El id no pertenece a un estudiante")
-            except Error as e:
+                if e.errno == NO_REFERENCED_ROW:
+                    raise ProjectError("El id no pertenece a un estudiante")
+                raise
+            except Error:
                 conn.rollback()
                 raise
+            return Member(id=res[-1],
+                          project_id=project_id,
+                          student_id=student_id)
 
+    @retry_transaction(idempotent=True)
     def remove_student_from_project(self, student_id: int, project_id: int) -> None:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
@@ -138,22 +335,24 @@ class ProjectRepository:
                     "DELETE FROM members WHERE student_id = %s AND project_id = %s",
                     (student_id, project_id)
                 )
-                
-                # Si solo queda un miembro en el proyecto, se convierte en un proyecto individual
-                cursor.execute("""
-                    UPDATE projects p
-                    SET is_group = CASE 
-                        WHEN (SELECT COUNT(*) FROM members m WHERE m.project_id = p.id) <= 1 THEN 0
-                        ELSE 1
-                    END
-                    WHERE id = %s
-                """, (project_id,))
-                
+                removed = cursor.rowcount
+                if removed:
+                    ActivityStatsRepository.on_members_changed(cursor, project_id, -removed)
+                    # Si solo queda un miembro en el proyecto, se convierte en un proyecto individual.
+                    # Las asignaciones se evalúan en orden, is_group usa el nuevo member_count
+                    cursor.execute(
+                        """UPDATE projects SET member_count = member_count - %s, is_group = member_count > 1
+                           WHERE id = %s""",
+                        (removed, project_id))
+                    ChangeRepository.record(cursor, "member", "removed", project_id=project_id,
+                                            student_id=student_id)
+
                 conn.commit()
             except IntegrityError:
                 conn.rollback()
                 raise ProjectError("No se puede eliminar al estudiante del proyecto")
 
+    @retry_transaction(idempotent=True)
     def update_status(self, project_id: int, status: str):
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
@@ -167,39 +366,98 @@ class ProjectRepository:
                 conn.rollback()
                 raise
                 
-    def update_grade(self, project_id: int, grade: float):
+    @retry_transaction(idempotent=True)
+    def close_open_projects(self, activity_id: int, batch_size: int) -> int:
+        """Pasar a READY hasta batch_size proyectos OPEN de una actividad vencida.
+
+        Cada lote es una transacción corta. El vencimiento se vuelve a
+        comprobar en la sentencia, por si la fecha cambió en otro nodo
+        después de agendarse. Devuelve la cantidad de proyectos actualizados.
+        """
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             try:
+                # un UPDATE con JOIN no admite LIMIT, la actividad se comprueba con EXISTS
                 cursor.execute(
-                    "UPDATE projects SET grade = %s, status = 'GRADED' WHERE id = %s",
-                    (grade, project_id)
+                    """UPDATE projects SET status = 'READY'
+                       WHERE activity_id = %s AND status = 'OPEN'
+                       AND EXISTS (SELECT 1 FROM activities a
+                                   WHERE a.id = projects.activity_id AND DATE(a.due_date) < CURRENT_DATE)
+                       LIMIT %s""",
+                    (activity_id, batch_size)
                 )
+                closed = cursor.rowcount
+                if closed:
+                    ChangeRepository.record(cursor, "activity", "closed", activity_id=activity_id,
+                                            payload={"closed": closed})
+                conn.commit()
+                return closed
+            except Error:
+                conn.rollback()
+                raise
+
+    @retry_transaction()
+    def update_grade(self, project_id: int, grade: float) -> datetime:
+        """Calificar un proyecto. Devuelve su nuevo updated_at."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                # la hora de la base, no la del servidor de la aplicación
+                cursor.execute("SELECT NOW()")
+                updated_at = cursor.fetchone()[0]
+                ActivityStatsRepository.on_project_graded(cursor, project_id, grade)
+                cursor.execute(
+                    "UPDATE projects SET grade = %s, status = 'GRADED', updated_at = %s WHERE id = %s",
+                    (grade, updated_at, project_id)
+                )
+                ChangeRepository.record(cursor, "project", "graded", project_id=project_id,
+                                        payload={"grade": float(grade)})
                 conn.commit()
             except IntegrityError:
                 conn.rollback()
                 raise
+            return updated_at
 
+    @retry_transaction()
     def update(self, project: Project) -> Project:
+        """Actualizar título y repositorio. Devuelve el mismo proyecto
+        con su updated_at, el resto de los datos los completa el servicio."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             try:
+                cursor.execute("SELECT NOW()")
+                project.updated_at = cursor.fetchone()[0]
                 cursor.execute(
-                    "UPDATE projects SET title = %s, repository_url = %s WHERE id = %s",
-                    (project.title, project.repository_url, project.id)
+                    "UPDATE projects SET title = %s, repository_url = %s, updated_at = %s WHERE id = %s",
+                    (project.title, project.repository_url, project.updated_at, project.id)
                 )
+                ChangeRepository.record(cursor, "project", "updated", project_id=project.id,
+                                        payload={"title": project.title,
+                                                 "repository_url": project.repository_url})
             except Error:
                 conn.rollback()
                 raise ProjectError("Error al actualizar el proyecto")
             else:
                 conn.commit()
-                return self.find_by_id(project.id)
+                return project
 
+    @retry_transaction(idempotent=True)
     def delete(self, project_id: int) -> None:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             try:
+                # después del DELETE ya no se puede obtener la actividad del proyecto
+                cursor.execute(
+                    """SELECT p.activity_id, a.professor_id FROM projects p
+                       JOIN activities a ON a.id = p.activity_id
+                       WHERE p.id = %s""",
+                    (project_id,))
+                owner = cursor.fetchone()
+                ActivityStatsRepository.on_project_deleted(cursor, project_id)
                 cursor.execute("DELETE FROM projects WHERE id = %s", (project_id,))
+                if owner is not None:
+                    ChangeRepository.record(cursor, "project", "deleted", activity_id=owner[0],
+                                            project_id=project_id, professor_id=owner[1])
             except Error:
                 conn.rollback()
                 raise ProjectError("Error al eliminar el proyecto")
@@ -0,0 +1,70 @@
+import json
+
+from src.db import Database
+
+
+class QueryStatsRepository:
+    """Consultas observadas por el servidor, desde performance_schema.
+
+    MySQL agrupa las sentencias por digest (la consulta normalizada, sin
+    literales) y guarda una muestra con valores reales, que es la que se
+    puede pasar a EXPLAIN. Con réplicas configuradas las lecturas se
+    registran en cada réplica, no en el primario.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def find_digests(self, schema: str, min_calls: int = 1, limit: int = 50) -> list[dict]:
+        """SELECT, UPDATE y DELETE del esquema, de las que más filas leen a las que menos."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                """SELECT DIGEST AS digest, DIGEST_TEXT AS digest_text,
+                          QUERY_SAMPLE_TEXT AS sample,
+                          COUNT_STAR AS calls,
+                          SUM_TIMER_WAIT / 1000000000000 AS total_seconds,
+                          SUM_ROWS_EXAMINED AS rows_examined,
+                          SUM_ROWS_SENT AS rows_sent,
+                          SUM_NO_INDEX_USED AS no_index_used,
+                          SUM_SORT_ROWS AS sort_rows,
+                          SUM_CREATED_TMP_TABLES AS tmp_tables
+                   FROM performance_schema.events_statements_summary_by_digest
+                   WHERE SCHEMA_NAME = %s AND COUNT_STAR >= %s
+                     AND (DIGEST_TEXT LIKE 'SELECT%%' OR DIGEST_TEXT LIKE 'UPDATE%%'
+                          OR DIGEST_TEXT LIKE 'DELETE%%')
+                   ORDER BY SUM_ROWS_EXAMINED DESC
+                   LIMIT %s""",
+                (schema, min_calls, limit))
+            return cursor.fetchall()
+
+    def explain(self, query: str) -> dict:
+        """Plan de ejecución de una consulta, sin ejecutarla."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"EXPLAIN FORMAT=JSON {query}")
+            return json.loads(cursor.fetchone()[0])
+
+    def find_indexes(self, schema: str) -> dict[str, list[list[str]]]:
+        """Columnas de cada índice, en orden, agrupadas por tabla."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                """SELECT TABLE_NAME AS table_name, INDEX_NAME AS index_name, COLUMN_NAME AS column_name
+                   FROM information_schema.STATISTICS
+                   WHERE TABLE_SCHEMA = %s
+                   ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX""",
+                (schema,))
+            indexes = {}
+            for row in cursor.fetchall():
+                indexes.setdefault((row["table_name"], row["index_name"]), []).append(row["column_name"])
+            tables = {}
+            for (table, _), columns in indexes.items():
+                tables.setdefault(table, []).append(columns)
+            return tables
+
+    def reset(self) -> None:
+        """Vaciar las estadísticas, para medir solo la próxima carga de trabajo."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("TRUNCATE TABLE performance_schema.events_statements_summary_by_digest")
@@ -0,0 +1,97 @@
+from mysql.connector.errors import IntegrityError
+
+from src.db import Database, retry_transaction
+from src.models.repository_stats import RepositoryStats
+
+
+class RepositoryStatsRepository:
+    """Métricas de los repositorios de los proyectos."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def find_by_project(self, project_id: int) -> RepositoryStats:
+        with self.db.get_read_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                """SELECT project_id, repository_url, status, head_sha, commit_count,
+                          last_commit_at, size_bytes, error, fetched_at
+                   FROM project_repository_stats WHERE project_id = %s""",
+                (project_id,))
+            row = cursor.fetchone()
+            return RepositoryStats(**row) if row else None
+
+    def find_stale(self, refresh_seconds: int, limit: int) -> list[dict]:
+        """Proyectos cuyo repositorio nunca se leyó, cambió de URL o se leyó
+        hace más de refresh_seconds, sin contar los ya calificados.
+
+        Primero los que nunca se leyeron y luego los más antiguos.
+        """
+        with self.db.get_read_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                """SELECT p.id AS project_id, p.repository_url
+                   FROM projects p
+                   LEFT JOIN project_repository_stats r ON r.project_id = p.id
+                   WHERE (r.project_id IS NULL
+                          OR r.repository_url <> p.repository_url
+                          OR r.fetched_at IS NULL
+                          OR (p.status <> 'GRADED' AND r.fetched_at < NOW() - INTERVAL %s SECOND))
+                     AND (r.claimed_until IS NULL OR r.claimed_until < NOW())
+                   ORDER BY r.fetched_at IS NOT NULL, r.fetched_at
+                   LIMIT %s""",
+                (refresh_seconds, limit))
+            return cursor.fetchall()
+
+    @retry_transaction()
+    def claim(self, project_id: int, repository_url: str, lease_seconds: int) -> RepositoryStats:
+        """Reservar el proyecto para esta instancia durante lease_seconds.
+
+        Returns:
+            RepositoryStats: Las métricas anteriores (sin datos si es la
+                primera vez), o None si otra instancia ya lo reservó.
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                """SELECT project_id, repository_url, status, head_sha, commit_count,
+                          last_commit_at, size_bytes, error, fetched_at,
+                          claimed_until IS NOT NULL AND claimed_until >= NOW() AS claimed
+                   FROM project_repository_stats WHERE project_id = %s FOR UPDATE""",
+                (project_id,))
+            row = cursor.fetchone()
+            if row and row.pop("claimed"):
+                conn.rollback()
+                return None
+            if row:
+                cursor.execute(
+                    """UPDATE project_repository_stats
+                       SET claimed_until = NOW() + INTERVAL %s SECOND WHERE project_id = %s""",
+                    (lease_seconds, project_id))
+            else:
+                try:
+                    cursor.execute(
+                        """INSERT INTO project_repository_stats (project_id, repository_url, claimed_until)
+                           VALUES (%s, %s, NOW() + INTERVAL %s SECOND)""",
+                        (project_id, repository_url, lease_seconds))
+                except IntegrityError:
+                    # otra instancia lo insertó al mismo tiempo
+                    conn.rollback()
+                    return None
+            conn.commit()
+            return RepositoryStats(**row) if row else RepositoryStats(project_id=project_id)
+
+    @retry_transaction(idempotent=True)
+    def save(self, stats: RepositoryStats) -> None:
+        """Guardar el resultado de una lectura y liberar la reserva."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """UPDATE project_repository_stats
+                   SET repository_url = %s, status = %s, head_sha = %s, commit_count = %s,
+                       last_commit_at = %s, size_bytes = %s, error = %s,
+                       fetched_at = NOW(), claimed_until = NULL
+                   WHERE project_id = %s""",
+                (stats.repository_url, stats.status, stats.head_sha, stats.commit_count,
+                 stats.last_commit_at, stats.size_bytes, stats.error, stats.project_id))
+            conn.commit()
@@ -1,7 +1,30 @@
 from src.models.user import Student, Professor
 from typing import Union
 from mysql.connector.errors import IntegrityError
-from src.db import Database
+from src.db import Database, retry_transaction
+
+
+# Columnas por las que se puede filtrar en get_students y get_professors
+STUDENT_FILTER_COLUMNS = {
+    "id": "s.id",
+    "enrollment_number": "s.enrollment_number",
+    "major": "s.major",
+    "email": "u.email",
+}
+PROFESSOR_FILTER_COLUMNS = {
+    "id": "p.id",
+    "department": "p.department",
+    "specialty": "p.specialty",
+    "email": "u.email",
+}
+
+
+def _filter_clauses(filter_criteria: dict, columns: dict) -> str:
+    """Arma las condiciones 'columna = %s' solo con columnas permitidas."""
+    unknown = set(filter_criteria) - set(columns)
+    if unknown:
+        raise ValueError(f"Criterios de filtrado no permitidos: {', '.join(sorted(unknown))}")
+    return " AND ".join(f"{columns[key]} = %s" for key in filter_criteria)
 
 
 class UserRepository:
@@ -12,7 +35,7 @@ class UserRepository:
         """Obtiene un usuario por su id, ya sea estudiante o profesor."""
 
         try:
-            with self.db.get_connection() as conn:
+            with self.db.get_read_connection() as conn:
                 cursor = conn.cursor(dictionary=True)
                 query = """
                 SELECT u.id AS user_id, u.email, s.id AS student_id, p.id AS professor_id,
@@ -59,7 +82,7 @@ class UserRepository:
         """Obtiene un usuario por su email, ya sea estudiante o profesor."""
 
         try:
-            with self.db.get_connection() as conn:
+            with self.db.get_read_connection() as conn:
                 cursor = conn.cursor(dictionary=True)
                 query = """
                 SELECT u.id AS user_id, u.password, s.id AS student_id, p.id AS professor_id,
@@ -98,7 +121,7 @@ class UserRepository:
             list: Lista de estudiantes.
         """
         try:
-            with self.db.get_connection() as conn:
+            with self.db.get_read_connection() as conn:
                 cursor = conn.cursor(dictionary=True)
                 query = """
                 SELECT s.*, u.email, u.first_name, u.last_name, u.created_at
@@ -107,9 +130,7 @@ class UserRepository:
                 """
                 if filter_criteria:
                     query += " WHERE "
-                    query += " AND ".join(
-                        f"{key} = %s" for key in filter_criteria.keys()
-                    )
+                    query += _filter_clauses(filter_criteria, STUDENT_FILTER_COLUMNS)
                     cursor.execute(query, tuple(filter_criteria.values()))
                 else:
                     cursor.execute(query)
@@ -130,6 +151,61 @@ class UserRepository:
         except:
             raise
 
+    def find_teammates(self, major: str = None, available_for_activity: int = None,
+                       limit: int = 20, offset: int = 0) -> tuple[list[Student], list[dict], int]:
+        """Busca compañeros de grupo, paginados, con el conteo por carrera.
+
+        Args:
+            major (str, optional): Carrera de los estudiantes.
+            available_for_activity (int, optional): Excluye a los estudiantes que
+                ya participan en un proyecto de esa actividad.
+        Returns:
+            tuple: (estudiantes de la página, [{"major": ..., "count": ...}],
+                total de estudiantes). Los conteos por carrera no se filtran
+                por major; el total sí, con la misma condición que la página.
+        """
+        availability_clause = ""
+        availability_params = []
+        if available_for_activity is not None:
+            availability_clause = """
+                AND NOT EXISTS (SELECT 1 FROM members m
+                                WHERE m.activity_id = %s AND m.student_id = s.id)"""
+            availability_params = [available_for_activity]
+
+        filter_clause = availability_clause
+        filter_params = list(availability_params)
+        if major:
+            filter_clause += " AND s.major = %s"
+            filter_params.append(major)
+
+        students_query = f"""
+            SELECT s.*, u.email, u.first_name, u.last_name, u.created_at
+            FROM students s
+            JOIN users u ON s.user_id = u.id
+            WHERE 1 = 1{filter_clause}
+            ORDER BY u.last_name, u.first_name, s.id LIMIT %s OFFSET %s"""
+        students_params = filter_params + [limit, offset]
+
+        # la comparación de major usa la collation de la columna, como la página
+        total_query = f"SELECT COUNT(*) AS total FROM students s WHERE 1 = 1{filter_clause}"
+
+        facets_query = f"""
+            SELECT s.major, COUNT(*) AS count
+            FROM students s
+            WHERE 1 = 1{availability_clause}
+            GROUP BY s.major
+            ORDER BY s.major"""
+
+        with self.db.get_read_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(students_query, tuple(students_params))
+            students = [Student(**result) for result in cursor.fetchall()]
+            cursor.execute(facets_query, tuple(availability_params))
+            facets = cursor.fetchall()
+            cursor.execute(total_query, tuple(filter_params))
+            total = cursor.fetchone()["total"]
+            return students, facets, total
+
     def get_professors(self, filter_criteria: dict = None) -> list:
         """Devuelve una lista de profesores.
         Args:
@@ -138,7 +214,7 @@ class UserRepository:
             list: Lista de profesores.
         """
         try:
-            with self.db.get_connection() as conn:
+            with self.db.get_read_connection() as conn:
                 cursor = conn.cursor(dictionary=True)
                 query = """
                 SELECT p.*, u.email, u.first_name, u.last_name, u.created_at
@@ -147,9 +223,7 @@ class UserRepository:
                 """
                 if filter_criteria:
                     query += " WHERE "
-                    query += " AND ".join(
-                        f"{key} = %s" for key in filter_criteria.keys()
-                    )
+                    query += _filter_clauses(filter_criteria, PROFESSOR_FILTER_COLUMNS)
                     cursor.execute(query, tuple(filter_criteria.values()))
                 else:
                     cursor.execute(query)
@@ -169,6 +243,7 @@ class UserRepository:
         except:
             raise
 
+    @retry_transaction()
     def create_student(self, student: Student) -> Student:
         """Llama al procedimiento almacenado para crear un estudiante."""
         with self.db.get_connection() as conn:
@@ -196,9 +271,72 @@ class UserRepository:
                 student.password = None
                 return student
 
+    def find_existing_student_keys(self, emails: list[str],
+                                   enrollment_numbers: list[int]) -> tuple[set, set]:
+        """Emails y números de matrícula de la lista que ya están registrados.
+
+        Se consulta el primario porque a continuación se insertan los que faltan.
+        """
+        existing_emails, existing_enrollments = set(), set()
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            if emails:
+                placeholders = ", ".join(["%s"] * len(emails))
+                cursor.execute(f"SELECT email FROM users WHERE email IN ({placeholders})",
+                               tuple(emails))
+                existing_emails = {row[0].lower() for row in cursor.fetchall()}
+            if enrollment_numbers:
+                placeholders = ", ".join(["%s"] * len(enrollment_numbers))
+                cursor.execute(f"""SELECT enrollment_number FROM students
+                                   WHERE enrollment_number IN ({placeholders})""",
+                               tuple(enrollment_numbers))
+                existing_enrollments = {row[0] for row in cursor.fetchall()}
+        return existing_emails, existing_enrollments
+
+    @retry_transaction()
+    def create_students(self, students: list[Student]) -> int:
+        """Crear varios estudiantes en una transacción.
+
+        Los usuarios y los estudiantes se insertan con una sentencia de
+        varias filas cada uno, en lugar de una llamada a CreateStudent por
+        estudiante. Si algún email o matrícula ya existe no se guarda ninguno.
+
+        Raises:
+            IntegrityError: Si algún email o número de matrícula está repetido.
+        """
+        if not students:
+            return 0
+        rows = ", ".join(["(%s, %s, %s, %s, NOW())"] * len(students))
+        with self.db.get_connection() as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"INSERT INTO users (email, password, first_name, last_name, created_at) VALUES {rows}",
+                    tuple(value for student in students
+                          for value in (student.email, student.password,
+                                        student.first_name, student.last_name)))
+                # con innodb_autoinc_lock_mode = 2 los ids de una sentencia
+                # pueden no ser consecutivos, se leen por email
+                placeholders = ", ".join(["%s"] * len(students))
+                cursor.execute(f"SELECT id, email FROM users WHERE email IN ({placeholders})",
+                               tuple(student.email for student in students))
+                user_ids = {email.lower(): user_id for user_id, email in cursor.fetchall()}
+                rows = ", ".join(["(%s, %s, %s, %s)"] * len(students))
+                cursor.execute(
+                    f"INSERT INTO students (user_id, enrollment_number, major, enrolled_at) VALUES {rows}",
+                    tuple(value for student in students
+                          for value in (user_ids[student.email.lower()], student.enrollment_number,
+                                        student.major, student.enrolled_at)))
+            except IntegrityError:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+                return len(students)
+
     def get_professor_by_id(self, professor_id: int) -> dict:
         query = "SELECT * FROM professors WHERE id = %s"
-        with self.db.get_connection() as conn:
+        with self.db.get_read_connection() as conn:
             cur = conn.cursor(dictionary=True)
             cur.execute(query, (professor_id,))
             professor_data =cur.fetchone()
@@ -209,7 +347,7 @@ class UserRepository:
             
     def search_students(self, search_term: str) -> list:
         try:
-            with self.db.get_connection() as conn:
+            with self.db.get_read_connection() as conn:
                 cursor = conn.cursor(dictionary=True)
                 query = """
                 SELECT s.*, u.email, u.first_name, u.last_name
@@ -228,7 +366,7 @@ class UserRepository:
 
     def get_student_by_student_id(self, student_id: int) -> Student:
         try:
-            with self.db.get_connection() as conn:
+            with self.db.get_read_connection() as conn:
                 cursor = conn.cursor(dictionary=True)
                 query = """
                 SELECT s.*, u.email, u.first_name, u.last_name, u.created_at
@@ -244,9 +382,25 @@ class UserRepository:
         except:
             raise
 
+    def get_students_by_ids(self, student_ids: list[int]) -> list[Student]:
+        """Devuelve los estudiantes de la lista de ids en una sola consulta."""
+        if not student_ids:
+            return []
+        placeholders = ", ".join(["%s"] * len(student_ids))
+        with self.db.get_read_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            query = f"""
+            SELECT s.*, u.email, u.first_name, u.last_name, u.created_at
+            FROM students s
+            JOIN users u ON s.user_id = u.id
+            WHERE s.id IN ({placeholders})
+            """
+            cursor.execute(query, tuple(student_ids))
+            return [Student(**result) for result in cursor.fetchall()]
+
     def get_professor_by_professor_id(self, professor_id: int) -> Professor:
         try:
-            with self.db.get_connection() as conn:
+            with self.db.get_read_connection() as conn:
                 cursor = conn.cursor(dictionary=True)
                 query = """
                 SELECT p.*, u.email, u.first_name, u.last_name, u.created_at
@@ -2,11 +2,17 @@ from datetime import datetime
 
 from flask import current_app as app
 
+from src.db import pin_to_primary
 from src.models.activity import Activity
 from src.models.project import Project
+from src.models.activity_stats import ActivityStats
 from src.repositories.activity_repository import ActivityRepository
+from src.repositories.activity_stats_repository import ActivityStatsRepository
 from src.repositories.project_repository import ProjectRepository
 from src.repositories.user_repository import UserRepository
+from src.services.project_service import ProjectService
+from src.services.jobs import REBUILD_ACTIVITY_STATS
+from src.utils.response_cache import invalidate
 
 class ActivityOwnerError(Exception):
     pass
@@ -14,6 +20,7 @@ class ActivityOwnerError(Exception):
 class ActivityService:
     def __init__(self, db):
         self.activity_repository = ActivityRepository(db)
+        self.activity_stats_repository = ActivityStatsRepository(db)
         self.project_repository = ProjectRepository(db)
         self.user_repository = UserRepository(db)
 
@@ -26,15 +33,21 @@ class ActivityService:
                 raise ActivityOwnerError("El professor_id de la petición no coincide con el de la actividad.")
         return activity
 
-    def get_activities(self, professor_id=None):
-        """Obtiene todas las actividades, filtrando por professor_id si existe."""
+    def get_activities(self, professor_id=None, name=None, page=None, per_page=None):
+        """Obtiene todas las actividades, filtrando por professor_id y nombre si existen.
 
+        Si se indica page y per_page el resultado se pagina.
+        """
+        limit = per_page if page else None
+        offset = (page - 1) * per_page if page else 0
         if professor_id:
-            if self.user_repository.get_professor_by_id(professor_id):
-                return self.activity_repository.find_by_professor(professor_id)
-            else:
+            if not self.user_repository.get_professor_by_id(professor_id):
                 raise ValueError("El id de profesor no existe.")
-        return self.activity_repository.find_all()
+        if name:
+            return self.activity_repository.find_by_name(name, professor_id or None, limit, offset)
+        if professor_id:
+            return self.activity_repository.find_by_professor(professor_id, limit, offset)
+        return self.activity_repository.find_all(limit, offset)
 
     def create(self, activity: Activity) -> Activity:
         if activity.name is None:
@@ -60,9 +73,14 @@ class ActivityService:
         if activity.professor_id is None: # esto no debería pasar nunca
             app.logger.critical("activity.professor_id is None, no debería pasar nunca.")
             raise RuntimeError("El professor_id de la actividad no puede estar vacío.")
-        return self.activity_repository.save(activity)
+        activity = self.activity_repository.save(activity)
+        self._schedule_deadline(activity)
+        invalidate(f"professor:{activity.professor_id}", "activities")
+        return activity
 
     def update(self, activity: Activity) -> Activity:
+        # las validaciones previas a una escritura no pueden leer de una réplica atrasada
+        pin_to_primary()
         og_activity = self.activity_repository.find_by_id(activity.id)
         if og_activity.id is None: # si la actividad no existe su id es None
             return og_activity
@@ -91,7 +109,17 @@ class ActivityService:
                     raise ValueError("La nota mínima de la actividad no está en el rango 1 - 10.")
             else:
                 raise ValueError("La nota mínima de la actividad debe ser decimal.")
-        return self.activity_repository.update(activity)
+        activity = self.activity_repository.update(activity)
+        activity.created_at = og_activity.created_at
+        self._schedule_deadline(activity)
+        # con otro nombre puede aparecer en búsquedas que antes no la incluían
+        invalidate(f"activity:{activity.id}", f"professor:{activity.professor_id}", "activities")
+        return activity
+
+    def _schedule_deadline(self, activity: Activity) -> None:
+        """Avisar al scheduler de cierre el nuevo vencimiento de la actividad."""
+        if activity.id and getattr(app, "deadline_scheduler", None):
+            app.deadline_scheduler.schedule(activity.id, activity.due_date)
 
     def delete (self, activity_id: int, professor_id: int):
         """Elimina una actividad.
@@ -99,6 +127,7 @@ class ActivityService:
         Solo si existe, es del professor pasado por
         param y si no esta vencida todavia.
         """
+        pin_to_primary()
         activity = self.activity_repository.find_by_id(activity_id)
         if activity.id is None:
             raise ValueError("La actividad no existe.")
@@ -108,6 +137,7 @@ class ActivityService:
             raise ValueError("La actividad ya se venció.")
 
         self.activity_repository.delete(activity.id)
+        invalidate(f"activity:{activity.id}")
 
     def get_grades(self, activity_id: int, professor_id: int) -> list[Project]:
         og_activity = self.activity_repository.find_by_id(activity_id)
@@ -116,3 +146,63 @@ class ActivityService:
         if professor_id != og_activity.professor_id:
             raise ActivityOwnerError("El professor_id de la petición no coincide con el de la actividad.")
         return [Project(**project) for project in self.project_repository.find_by_activity(activity_id)]
+
+    def export_grades(self, activity_id: int, professor_id: int):
+        """Filas de la planilla de calificaciones de una actividad del professor.
+
+        Devuelve un generador, las filas se leen de la base a medida que se consumen.
+        """
+        og_activity = self.activity_repository.find_by_id(activity_id)
+        if og_activity.id is None:
+            raise ValueError("La actividad no existe.")
+        if professor_id != og_activity.professor_id:
+            raise ActivityOwnerError("El professor_id de la petición no coincide con el de la actividad.")
+        return self.project_repository.iter_grade_rows(activity_id)
+
+    def get_stats(self, activity_id: int, professor_id: int) -> ActivityStats:
+        """Obtiene las estadísticas de una actividad del professor."""
+        og_activity = self.activity_repository.find_by_id(activity_id)
+        if og_activity.id is None:
+            raise ValueError("La actividad no existe.")
+        if professor_id != og_activity.professor_id:
+            raise ActivityOwnerError("El professor_id de la petición no coincide con el de la actividad.")
+        return self.activity_stats_repository.find_by_activity(activity_id)
+
+    def rebuild_stats(self, activity_id: int, professor_id: int, user_id: int):
+        """Encolar el recálculo de las estadísticas de una actividad del professor."""
+        og_activity = self.activity_repository.find_by_id(activity_id)
+        if og_activity.id is None:
+            raise ValueError("La actividad no existe.")
+        if professor_id != og_activity.professor_id:
+            raise ActivityOwnerError("El professor_id de la petición no coincide con el de la actividad.")
+        return app.job_queue.enqueue(REBUILD_ACTIVITY_STATS, {"activity_id": activity_id},
+                                     user_id=user_id)
+
+    def get_dashboard(self, professor_id: int, page: int = 1, per_page: int = 20) -> list[dict]:
+        """Obtiene las actividades del professor con sus proyectos y el estado de calificación.
+
+        Se resuelve con dos consultas sin importar la cantidad de actividades:
+        las actividades con sus estadísticas y una página de proyectos por actividad.
+        """
+        activities = self.activity_repository.find_by_professor(professor_id)
+        projects_by_activity = {activity.id: [] for activity in activities}
+        offset = (page - 1) * per_page
+        for project in self.project_repository.find_by_professor_ranked(professor_id, offset, per_page):
+            # la actividad puede haberse creado (o archivado) entre las dos consultas
+            activity_projects = projects_by_activity.get(project["activity_id"])
+            if activity_projects is not None:
+                activity_projects.append(ProjectService.format_project(project))
+
+        today = datetime.today().date()
+        dashboard = []
+        for activity in activities:
+            stats = activity.stats
+            dashboard.append({
+                "activity": activity,
+                "is_closed": activity.due_date.date() < today,
+                "pending_grades": stats.project_count - stats.graded_count,
+                "projects": projects_by_activity[activity.id],
+                "projects_page": page,
+                "projects_per_page": per_page,
+            })
+        return dashboard
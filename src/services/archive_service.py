@@ -0,0 +1,70 @@
+import logging
+from datetime import date, datetime
+
+from src.repositories.archive_repository import ArchiveRepository
+
+logger = logging.getLogger(__name__)
+
+
+def term_start(day: date, terms_ago: int = 0, start_months: tuple[int, ...] = (3, 8)) -> datetime:
+    """Inicio del cuatrimestre de day, o del de terms_ago cuatrimestres antes.
+
+    Cada cuatrimestre empieza el día 1 de uno de start_months y dura hasta
+    el comienzo del siguiente; los meses anteriores al primero pertenecen
+    al último cuatrimestre del año anterior.
+    """
+    starts = sorted(start_months)
+    index = sum(1 for month in starts if month <= day.month) - 1
+    year, position = divmod(day.year * len(starts) + index - terms_ago, len(starts))
+    return datetime(year, starts[position], 1)
+
+
+class ArchiveService:
+    """Archivo de las actividades de cuatrimestres anteriores.
+
+    Se conservan en las tablas de trabajo las actividades de los últimos
+    terms cuatrimestres (el actual incluido) y las que tienen proyectos
+    sin calificar; el resto se mueve a las tablas de archivo de a
+    batch_size actividades por transacción.
+    """
+
+    def __init__(self, db, terms: int = 2, batch_size: int = 50,
+                 term_start_months: tuple[int, ...] = (3, 8), response_cache=None):
+        self.terms = terms
+        self.batch_size = batch_size
+        self.term_start_months = term_start_months
+        self.response_cache = response_cache
+        self.archive_repository = ArchiveRepository(db)
+
+    def cutoff(self, today: date = None) -> datetime:
+        return term_start(today or date.today(), self.terms - 1, self.term_start_months)
+
+    def archive(self, today: date = None) -> dict:
+        """Archivar las actividades vencidas antes del cutoff. Devuelve el
+        cutoff y la cantidad de actividades y proyectos archivados."""
+        if self.terms < 1:
+            raise ValueError("Se debe conservar al menos el cuatrimestre actual.")
+        cutoff = self.cutoff(today)
+        total_activities = total_projects = 0
+        while True:
+            activities, projects = self.archive_repository.archive_batch(cutoff, self.batch_size)
+            if not activities:
+                break
+            total_activities += len(activities)
+            total_projects += projects
+            if self.response_cache is not None:
+                # los listados con estas actividades, y los del archivo, dejan de valer
+                tags = {f"activity:{a['id']}" for a in activities}
+                tags |= {f"professor:{a['professor_id']}" for a in activities}
+                self.response_cache.invalidate("activities", "archive", *sorted(tags))
+            logger.info("Archived %s activities and %s projects due before %s.",
+                        len(activities), projects, cutoff)
+        return {"cutoff": cutoff.strftime("%Y-%m-%d"),
+                "activities": total_activities,
+                "projects": total_projects}
+
+    def get_activities(self, professor_id=None, name=None, page=None, per_page=None):
+        """Actividades archivadas, con los mismos filtros que ActivityService.get_activities."""
+        limit = per_page if page else None
+        offset = (page - 1) * per_page if page else 0
+        return self.archive_repository.find_activities(professor_id or None, name, limit, offset)
@@ -1,10 +1,12 @@
 import json
 
 import bcrypt
+from flask import current_app as app, has_app_context
 from flask_jwt_extended import create_access_token
 from mysql.connector.errors import IntegrityError
 
 from src.models.user import User, Student, Professor
+from src.db import pin_to_primary
 from src.repositories.user_repository import UserRepository
 
 class AuthPasswordError(Exception):
@@ -14,8 +16,21 @@ class AuthPasswordError(Exception):
 class AuthService:
     def __init__(self, db):
         self.user_repository = UserRepository(db)
+        self.profile_cache = getattr(app, "profile_cache", None) if has_app_context() else None
+
+    def _get_user(self, user_id: int):
+        """Perfil de un usuario, desde el cache si está."""
+        if self.profile_cache is None:
+            return self.user_repository.get_user_by_id(user_id)
+        user = self.profile_cache.get(user_id)
+        if user is None:
+            user = self.user_repository.get_user_by_id(user_id)
+            self.profile_cache.set(user)
+        return user
 
     def login(self, user: User) -> tuple:
+        # un estudiante recién registrado todavía puede no estar en las réplicas
+        pin_to_primary()
         try:
             # Intentar obtener el usuario por su email
             saved_user = self.user_repository.get_user_by_email(user.email)
@@ -47,14 +62,18 @@ class AuthService:
         except Exception as e:
             return None, "SERVER_ERROR", None, None
 
-    def create_student(self, student: Student):
-        if not student.email:
-            raise ValueError(f"Email empty.")
+    @staticmethod
+    def check_password(password: str) -> None:
         # Validar requisitos de contraseña (8-16 caracteres, una mayúscula y un número)
-        if not (len(student.password) > 8 and len(student.password) < 16):
+        if not (len(password) > 8 and len(password) < 16):
             raise AuthPasswordError(
-                f"La contraseña no cumple las condiciones. Longitud de contraseña: {len(student.password)}"
+                f"La contraseña no cumple las condiciones. Longitud de contraseña: {len(password)}"
             )
+
+    def create_student(self, student: Student):
+        if not student.email:
+            raise ValueError(f"Email empty.")
+        self.check_password(student.password)
         try:
             student.password = bcrypt.hashpw(
                 student.password.encode("utf-8"), bcrypt.gensalt()
@@ -68,14 +87,14 @@ class AuthService:
             return saved_student
 
     def get_student(self, user_id: int) -> Student:
-        student = self.user_repository.get_user_by_id(user_id)
+        student = self._get_user(user_id)
         if isinstance(student, Student):
             return student
         else:
             return None
 
     def get_professor(self, user_id: int) -> Professor:
-        professor = self.user_repository.get_user_by_id(user_id)
+        professor = self._get_user(user_id)
         if isinstance(professor, Professor):
             return professor
         else:
@@ -85,7 +104,34 @@ class AuthService:
         return self.user_repository.search_students(search_term)
 
     def get_student_by_student_id(self, student_id: int) -> Student:
-        return self.user_repository.get_student_by_student_id(student_id)
+        if self.profile_cache is None:
+            return self.user_repository.get_student_by_student_id(student_id)
+        student = self.profile_cache.get_by_role_id("student", student_id)
+        if student is None:
+            student = self.user_repository.get_student_by_student_id(student_id)
+            self.profile_cache.set(student)
+        return student
+
+    def get_students_by_ids(self, student_ids: list[int]) -> list[Student]:
+        return self.user_repository.get_students_by_ids(student_ids)
+
+    def find_teammates(self, major: str = None, available_for_activity: int = None,
+                       page: int = 1, per_page: int = 20) -> dict:
+        students, facets, total = self.user_repository.find_teammates(
+            major, available_for_activity, per_page, (page - 1) * per_page)
+        return {
+            "students": students,
+            "facets": {"major": facets},
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+        }
 
     def get_professor_by_professor_id(self, professor_id: int) -> Professor:
-        return self.user_repository.get_professor_by_professor_id(professor_id)
\ No newline at end of file
+        if self.profile_cache is None:
+            return self.user_repository.get_professor_by_professor_id(professor_id)
+        professor = self.profile_cache.get_by_role_id("professor", professor_id)
+        if professor is None:
+            professor = self.user_repository.get_professor_by_professor_id(professor_id)
+            self.profile_cache.set(professor)
+        return professor
\ No newline at end of file
@@ -0,0 +1,76 @@
+import threading
+
+from mysql.connector.errors import Error
+
+from src.db import DbError
+from src.repositories.change_repository import ChangeRepository
+
+
+class ChangePublisher:
+    """Publica en el proceso los cambios nuevos del registro changes.
+
+    Un único hilo lee los cambios por lotes desde el último id entregado
+    y llama a cada suscriptor con la lista completa del lote, en lugar
+    de que cada consumidor consulte las tablas por su cuenta.
+    """
+
+    def __init__(self, db, logger, interval_seconds: float = 1.0, batch_size: int = 500):
+        self.logger = logger
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.change_repository = ChangeRepository(db)
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.cursor = None
+
+    def subscribe(self, callback) -> None:
+        """Registrar un callable que recibe cada lote de cambios.
+
+        El hilo de publicación se inicia con el primer suscriptor.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="change-publisher", daemon=True)
+                self._thread.start()
+
+    def unsubscribe(self, callback) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def publish_pending(self) -> int:
+        """Leer y entregar los cambios pendientes. Devuelve cuántos se entregaron."""
+        if self.cursor is None:
+            # solo se publican los cambios posteriores al inicio
+            self.cursor = self.change_repository.last_id()
+        changes = self.change_repository.find_since(self.cursor, self.batch_size)
+        if not changes:
+            return 0
+        self.cursor = changes[-1]["id"]
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(changes)
+            except Exception as err:
+                self.logger.error("Change subscriber %s failed. %s", callback, err)
+        return len(changes)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                published = self.publish_pending()
+            except (Error, DbError) as err:
+                self.logger.error("Change publisher error. %s", err)
+                published = 0
+            # si el lote vino completo puede haber más cambios pendientes
+            if published < self.batch_size:
+                self._stop.wait(self.interval_seconds)
@@ -0,0 +1,164 @@
+import heapq
+import threading
+from datetime import datetime, time, timedelta
+
+import mysql.connector
+from mysql.connector.errors import Error
+
+from src.db import DbError
+from src.repositories.activity_repository import ActivityRepository
+from src.repositories.project_repository import ProjectRepository
+
+# Nombre del lock de MySQL que elige al nodo que ejecuta el scheduler
+LEADER_LOCK_NAME = "gespro_deadline_scheduler"
+
+
+def closing_time(due_date: datetime) -> datetime:
+    """Momento en que se cierran los proyectos de una actividad.
+
+    Las entregas se aceptan durante todo el día de due_date,
+    por lo que se cierran al comenzar el día siguiente.
+    """
+    return datetime.combine(due_date.date() + timedelta(days=1), time.min)
+
+
+class DeadlineScheduler:
+    """Cierra los proyectos de cada actividad cuando vence su plazo.
+
+    Mantiene una cola de prioridad con el próximo cierre de cada actividad
+    y, al llegar ese momento, pasa sus proyectos de OPEN a READY en lotes
+    pequeños. Solo ejecuta el nodo que obtiene el lock LEADER_LOCK_NAME,
+    el resto espera para tomar su lugar si se pierde la conexión.
+    """
+
+    def __init__(self, db, logger, batch_size: int = 500, reload_seconds: int = 300,
+                 leader_retry_seconds: int = 30, response_cache=None):
+        self.db = db
+        self.logger = logger
+        self.response_cache = response_cache
+        self.batch_size = batch_size
+        self.reload_seconds = reload_seconds
+        self.leader_retry_seconds = leader_retry_seconds
+        self.activity_repository = ActivityRepository(db)
+        self.project_repository = ProjectRepository(db)
+        self._heap = []
+        self._deadlines = {}  # activity_id -> cierre vigente, descarta entradas viejas del heap
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._leader_conn = None
+        self._next_reload = datetime.min
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="deadline-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+        self._release_leadership()
+
+    def schedule(self, activity_id: int, due_date: datetime) -> None:
+        """Agregar o reprogramar el cierre de una actividad."""
+        deadline = closing_time(due_date)
+        with self._lock:
+            self._deadlines[activity_id] = deadline
+            heapq.heappush(self._heap, (deadline, activity_id))
+        self._wake.set()
+
+    def _is_leader(self) -> bool:
+        if self._leader_conn is not None:
+            try:
+                self._leader_conn.ping(reconnect=False)
+                return True
+            except Error:
+                self.logger.warning("Deadline scheduler lost its leader connection.")
+                self._leader_conn = None
+        try:
+            conn = mysql.connector.connect(**self.db.connection_args)
+            cursor = conn.cursor()
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (LEADER_LOCK_NAME,))
+            (acquired,) = cursor.fetchone()
+        except Error as err:
+            self.logger.error("Deadline scheduler could not reach the database. %s", err)
+            return False
+        if acquired != 1:
+            conn.close()
+            return False
+        self.logger.info("Deadline scheduler elected leader.")
+        self._leader_conn = conn
+        self._next_reload = datetime.min
+        return True
+
+    def _release_leadership(self) -> None:
+        if self._leader_conn is not None:
+            try:
+                self._leader_conn.close()
+            except Error:
+                pass
+            self._leader_conn = None
+
+    def _reload(self, now: datetime) -> None:
+        """Volver a leer los vencimientos, para tomar las actividades
+        creadas o modificadas en otros nodos."""
+        pending = self.activity_repository.find_pending_deadlines(now - timedelta(days=1))
+        with self._lock:
+            self._heap = []
+            self._deadlines = {}
+            for row in pending:
+                deadline = closing_time(row["due_date"])
+                self._deadlines[row["id"]] = deadline
+                self._heap.append((deadline, row["id"]))
+            heapq.heapify(self._heap)
+        self._next_reload = now + timedelta(seconds=self.reload_seconds)
+
+    def _pop_due(self, now: datetime) -> list[int]:
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, activity_id = heapq.heappop(self._heap)
+                if self._deadlines.get(activity_id) == deadline:
+                    del self._deadlines[activity_id]
+                    due.append(activity_id)
+        return due
+
+    def close_activity(self, activity_id: int) -> int:
+        """Cerrar los proyectos OPEN de una actividad en lotes."""
+        total = 0
+        while not self._stop.is_set():
+            closed = self.project_repository.close_open_projects(activity_id, self.batch_size)
+            total += closed
+            if closed < self.batch_size:
+                break
+        if total and self.response_cache is not None:
+            self.response_cache.invalidate(f"activity:{activity_id}")
+        self.logger.info("Deadline scheduler closed %s projects of activity %s.", total, activity_id)
+        return total
+
+    def _seconds_until_next(self, now: datetime) -> float:
+        next_run = self._next_reload
+        with self._lock:
+            if self._heap and self._heap[0][0] < next_run:
+                next_run = self._heap[0][0]
+        return max((next_run - now).total_seconds(), 0.0)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            if not self._is_leader():
+                self._wake.wait(self.leader_retry_seconds)
+                continue
+            now = datetime.now()
+            try:
+                if now >= self._next_reload:
+                    self._reload(now)
+                for activity_id in self._pop_due(now):
+                    self.close_activity(activity_id)
+            except (Error, DbError) as err:
+                self.logger.error("Deadline scheduler error. %s", err)
+                self._wake.wait(self.leader_retry_seconds)
+                continue
+            self._wake.wait(self._seconds_until_next(datetime.now()))
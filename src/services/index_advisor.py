@@ -0,0 +1,200 @@
+import re
+
+from mysql.connector.errors import Error
+
+from src.repositories.query_stats_repository import QueryStatsRepository
+
+# Accesos que leen la tabla o el índice completo
+FULL_SCANS = {"ALL": "full_scan", "index": "full_index_scan"}
+# Nombre de índice de MySQL, como máximo 64 caracteres
+MAX_INDEX_NAME = 64
+
+_CONDITION = re.compile(r"`\w+`\.`(\w+)`\.`(\w+)`\s*(<=>|>=|<=|<>|!=|=|<|>|\bin\b|\blike\b|\bbetween\b)",
+                        re.IGNORECASE)
+_TABLE = re.compile(r"\b(?:FROM|JOIN|UPDATE)\s+`?(\w+)`?(?:\s+(?:AS\s+)?`?(\w+)`?)?", re.IGNORECASE)
+_NOT_ALIAS = {"where", "join", "left", "right", "inner", "cross", "straight_join", "on", "using",
+              "set", "group", "order", "limit", "having", "window", "for", "union", "as"}
+_ORDER_BY = re.compile(r"\bORDER\s+BY\s+(.+?)(?:\bLIMIT\b|\bFOR\b|$)", re.IGNORECASE | re.DOTALL)
+_ORDER_ITEM = re.compile(r"^`?(?:(\w+)`?\.`?)?(\w+)`?(?:\s+(?:ASC|DESC))?$", re.IGNORECASE)
+
+
+def table_aliases(query: str) -> dict[str, str]:
+    """Tabla de cada alias de la consulta (las tablas sin alias se mapean a sí mismas)."""
+    aliases = {}
+    for table, alias in _TABLE.findall(query):
+        aliases[table] = table
+        if alias and alias.lower() not in _NOT_ALIAS:
+            aliases[alias] = table
+    return aliases
+
+
+def plan_tables(plan) -> list[dict]:
+    """Accesos a tablas del plan de EXPLAIN FORMAT=JSON, incluidas las subconsultas."""
+    tables = []
+    if isinstance(plan, dict):
+        table = plan.get("table")
+        if isinstance(table, dict) and "table_name" in table:
+            tables.append(table)
+        for value in plan.values():
+            tables.extend(plan_tables(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            tables.extend(plan_tables(item))
+    return tables
+
+
+def plan_flags(plan) -> set[str]:
+    """filesort y temporary_table si el plan ordena o agrupa sin índice."""
+    flags = set()
+    if isinstance(plan, dict):
+        if plan.get("using_filesort"):
+            flags.add("filesort")
+        if plan.get("using_temporary_table"):
+            flags.add("temporary_table")
+        for value in plan.values():
+            flags |= plan_flags(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            flags |= plan_flags(item)
+    return flags
+
+
+def condition_columns(condition: str, alias: str) -> tuple[list[str], list[str]]:
+    """Columnas de alias comparadas por igualdad y por rango en una condición del plan."""
+    equality, ranges = [], []
+    for table, column, operator in _CONDITION.findall(condition or ""):
+        if table != alias:
+            continue
+        target = equality if operator.lower() in ("=", "<=>", "in") else ranges
+        if column not in equality and column not in ranges:
+            target.append(column)
+    return equality, ranges
+
+
+def order_columns(query: str, aliases: dict[str, str]) -> tuple[str, list[str]]:
+    """Tabla y columnas del ORDER BY, si todas son de la misma tabla."""
+    match = _ORDER_BY.search(query)
+    if not match:
+        return None, []
+    # sin alias, la columna solo se puede atribuir si la consulta lee una tabla
+    tables = set(aliases.values())
+    single_table = tables.pop() if len(tables) == 1 else None
+    table, columns = None, []
+    for item in match.group(1).split(","):
+        parsed = _ORDER_ITEM.match(item.strip())
+        if not parsed:
+            return None, []
+        alias, column = parsed.groups()
+        item_table = aliases.get(alias) if alias else single_table
+        if item_table is None or table not in (None, item_table):
+            return None, []
+        table = item_table
+        columns.append(column)
+    return table, columns
+
+
+def is_covered(columns: list[str], indexes: list[list[str]]) -> bool:
+    """Un índice existente ya empieza por esas columnas."""
+    return any(index[:len(columns)] == columns for index in indexes)
+
+
+def index_ddl(table: str, columns: list[str]) -> str:
+    name = f"idx_{table}_{'_'.join(columns)}"[:MAX_INDEX_NAME]
+    return f"ALTER TABLE `{table}` ADD INDEX `{name}` ({', '.join(f'`{c}`' for c in columns)});"
+
+
+def analyze_query(digest: dict, plan: dict, indexes: dict[str, list[list[str]]]) -> tuple[dict, list[dict]]:
+    """Problemas del plan de una consulta y los índices candidatos para resolverlos.
+
+    Para cada tabla leída completa se propone un índice con las columnas
+    comparadas por igualdad y luego la primera de rango. Si la consulta
+    ordena con filesort y lee una sola tabla, se agregan las columnas del
+    ORDER BY. El beneficio estimado son las filas que se dejarían de leer
+    en la carga observada.
+    """
+    query = digest["sample"]
+    aliases = table_aliases(query)
+    tables = plan_tables(plan)
+    flags = plan_flags(plan)
+    issues = sorted(flags)
+    candidates = []
+
+    for node in tables:
+        alias = node["table_name"]
+        table = aliases.get(alias, alias)
+        access = node.get("access_type")
+        if access in FULL_SCANS:
+            issues.append(f"{FULL_SCANS[access]}:{table}")
+        if access != "ALL" or alias.startswith("<"):
+            continue
+        equality, ranges = condition_columns(node.get("attached_condition"), alias)
+        columns = equality + ranges[:1]
+        if not columns or is_covered(columns, indexes.get(table, [])):
+            continue
+        rows = node.get("rows_examined_per_scan", 0)
+        filtered = float(node.get("filtered", 100)) / 100
+        candidates.append({"table": table, "columns": columns,
+                           "benefit": int(digest["calls"] * rows * (1 - filtered))})
+
+    if "filesort" in flags and len(tables) == 1:
+        table, order = order_columns(query, aliases)
+        alias = tables[0]["table_name"]
+        if table and table == aliases.get(alias, alias):
+            equality, _ = condition_columns(tables[0].get("attached_condition"), alias)
+            columns = equality + [column for column in order if column not in equality]
+            if not is_covered(columns, indexes.get(table, [])):
+                # el índice con el ORDER BY también resuelve el filtro
+                replaced = [c for c in candidates if c["table"] == table and is_covered(c["columns"], [columns])]
+                candidates = [c for c in candidates if c not in replaced]
+                candidates.append({"table": table, "columns": columns,
+                                   "benefit": int(digest["sort_rows"] or 0) + sum(c["benefit"] for c in replaced)})
+
+    report = {"digest_text": digest["digest_text"],
+              "calls": digest["calls"],
+              "total_seconds": float(digest["total_seconds"] or 0),
+              "rows_examined": digest["rows_examined"],
+              "rows_sent": digest["rows_sent"],
+              "issues": issues}
+    return report, candidates
+
+
+class IndexAdvisor:
+    """Propone índices a partir de las consultas que hizo la aplicación.
+
+    Se vacían las estadísticas con reset(), se corre una carga de trabajo
+    (tráfico real, las pruebas de integración) y después advise() pasa por
+    EXPLAIN cada consulta observada.
+    """
+
+    def __init__(self, db, schema: str):
+        self.schema = schema
+        self.query_stats_repository = QueryStatsRepository(db)
+
+    def reset(self) -> None:
+        self.query_stats_repository.reset()
+
+    def advise(self, min_calls: int = 1, limit: int = 50) -> dict:
+        """Consultas con problemas y los índices candidatos, del de mayor beneficio al de menor."""
+        indexes = self.query_stats_repository.find_indexes(self.schema)
+        queries, candidates = [], {}
+        for digest in self.query_stats_repository.find_digests(self.schema, min_calls, limit):
+            if not digest["sample"]:
+                continue
+            try:
+                plan = self.query_stats_repository.explain(digest["sample"])
+            except Error as err:
+                # la muestra puede estar truncada (performance_schema_max_sql_text_length)
+                queries.append({"digest_text": digest["digest_text"], "calls": digest["calls"],
+                                "issues": [], "error": err.msg})
+                continue
+            report, found = analyze_query(digest, plan, indexes)
+            if report["issues"]:
+                queries.append(report)
+            for candidate in found:
+                key = (candidate["table"], tuple(candidate["columns"]))
+                merged = candidates.setdefault(key, {**candidate, "benefit": 0, "queries": 0,
+                                                     "ddl": index_ddl(candidate["table"], candidate["columns"])})
+                merged["benefit"] += candidate["benefit"]
+                merged["queries"] += 1
+        return {"queries": queries,
+                "candidates": sorted(candidates.values(), key=lambda c: c["benefit"], reverse=True)}
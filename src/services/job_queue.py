@@ -0,0 +1,139 @@
+import random
+import threading
+from datetime import datetime, timedelta
+
+from mysql.connector.errors import Error
+
+from src.db import DbError
+from src.models.job import Job
+from src.repositories.job_repository import JobRepository
+
+
+class JobError(Exception):
+    """Error que no tiene sentido reintentar, el trabajo falla enseguida."""
+    pass
+
+
+def retry_delay(attempts: int, base_seconds: float, max_seconds: float) -> float:
+    """Espera antes del próximo intento: exponencial con jitter, hasta max_seconds."""
+    delay = min(base_seconds * 2 ** (attempts - 1), max_seconds)
+    return random.uniform(delay / 2, delay)
+
+
+class JobQueue:
+    """Ejecuta en el proceso los trabajos de la tabla jobs.
+
+    Cada tipo de trabajo tiene un handler registrado con register(), que
+    recibe el payload y devuelve el resultado (un dict serializable). Los
+    workers toman los trabajos por prioridad, y los que fallan se
+    reintentan con backoff exponencial hasta max_attempts.
+    """
+
+    def __init__(self, db, logger, workers: int = 2, poll_seconds: float = 1.0,
+                 lease_seconds: int = 600, retry_base_seconds: float = 5.0,
+                 retry_max_seconds: float = 600.0):
+        self.logger = logger
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.job_repository = JobRepository(db)
+        self._handlers = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def register(self, job_type: str, handler) -> None:
+        self._handlers[job_type] = handler
+
+    def enqueue(self, job_type: str, payload: dict = None, priority: int = 0,
+                max_attempts: int = 3, user_id: int = None) -> Job:
+        """Encolar un trabajo. Mayor priority se ejecuta antes."""
+        if job_type not in self._handlers:
+            raise ValueError(f"Tipo de trabajo desconocido: {job_type}.")
+        job = self.job_repository.enqueue(Job(type=job_type, payload=payload, priority=priority,
+                                              max_attempts=max_attempts, user_id=user_id))
+        self._wake.set()
+        return job
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join()
+
+    def _heartbeat(self, job: Job, done: threading.Event) -> None:
+        """Renovar la reserva del trabajo mientras el handler se ejecuta."""
+        while not done.wait(self.lease_seconds / 3):
+            try:
+                if not self.job_repository.extend_lease(job.id, job.attempts, self.lease_seconds):
+                    self.logger.warning("Job %s (%s) lost its lease.", job.id, job.type)
+                    return
+            except (Error, DbError) as err:
+                # se reintenta en la próxima vuelta, la reserva todavía no venció
+                self.logger.error("Job %s lease renewal failed. %s", job.id, err)
+
+    def _finish(self, job: Job, finished: bool) -> None:
+        if not finished:
+            self.logger.warning("Job %s (%s) attempt %s lost its lease, result discarded.",
+                                job.id, job.type, job.attempts)
+
+    def run_once(self) -> bool:
+        """Ejecutar el próximo trabajo listo. Devuelve False si no había ninguno."""
+        job = self.job_repository.claim(self.lease_seconds)
+        if job is None:
+            return False
+        handler = self._handlers.get(job.type)
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, done),
+                                     name=f"job-heartbeat-{job.id}", daemon=True)
+        heartbeat.start()
+        try:
+            if handler is None:
+                raise JobError(f"No hay handler para los trabajos {job.type}.")
+            result = handler(job.payload or {})
+        except JobError as err:
+            self.logger.error("Job %s (%s) failed. %s", job.id, job.type, err)
+            outcome = (str(err), None)
+        except Exception as err:
+            if job.attempts < job.max_attempts:
+                retry_at = datetime.now() + timedelta(
+                    seconds=retry_delay(job.attempts, self.retry_base_seconds, self.retry_max_seconds))
+                self.logger.warning("Job %s (%s) attempt %s failed, retrying at %s. %s",
+                                    job.id, job.type, job.attempts, retry_at, err)
+                outcome = (str(err), retry_at)
+            else:
+                self.logger.error("Job %s (%s) failed after %s attempts. %s",
+                                  job.id, job.type, job.attempts, err)
+                outcome = (str(err), None)
+        else:
+            outcome = None
+        finally:
+            done.set()
+            heartbeat.join()
+        if outcome is None:
+            self._finish(job, self.job_repository.complete(job.id, job.attempts, result))
+        else:
+            self._finish(job, self.job_repository.fail(job.id, job.attempts, *outcome))
+        return True
+
+    def _run(self) -> None:
+        next_requeue = datetime.min
+        while not self._stop.is_set():
+            try:
+                if datetime.now() >= next_requeue:
+                    self.job_repository.requeue_expired()
+                    next_requeue = datetime.now() + timedelta(seconds=self.lease_seconds / 10)
+                if self.run_once():
+                    continue
+            except (Error, DbError) as err:
+                self.logger.error("Job worker error. %s", err)
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
@@ -0,0 +1,37 @@
+from src.repositories.activity_stats_repository import ActivityStatsRepository
+from src.services.archive_service import ArchiveService
+from src.services.job_queue import JobError
+from src.services.student_import_service import StudentImportService
+
+# Tipos de trabajo
+REBUILD_ACTIVITY_STATS = "activity_stats.rebuild"
+IMPORT_STUDENTS = "students.import"
+ARCHIVE_ACTIVITIES = "activities.archive"
+
+
+def register_jobs(job_queue, db, config, response_cache=None) -> None:
+    """Registrar los handlers de cada tipo de trabajo."""
+
+    def rebuild_activity_stats(payload: dict) -> dict:
+        ActivityStatsRepository(db).rebuild(payload.get("activity_id"))
+        if response_cache is not None and payload.get("activity_id"):
+            response_cache.invalidate(f"activity:{payload['activity_id']}")
+        return {"activity_id": payload.get("activity_id")}
+
+    def import_students(payload: dict) -> dict:
+        service = StudentImportService(db, config.STUDENT_IMPORT_WORKERS,
+                                       config.STUDENT_IMPORT_CHUNK_SIZE)
+        return service.import_prepared(payload)
+
+    def archive_activities(payload: dict) -> dict:
+        service = ArchiveService(db, payload.get("terms") or config.ARCHIVE_TERMS,
+                                 config.ARCHIVE_BATCH_SIZE, config.ARCHIVE_TERM_START_MONTHS,
+                                 response_cache)
+        try:
+            return service.archive()
+        except ValueError as err:
+            raise JobError(str(err))
+
+    job_queue.register(REBUILD_ACTIVITY_STATS, rebuild_activity_stats)
+    job_queue.register(IMPORT_STUDENTS, import_students)
+    job_queue.register(ARCHIVE_ACTIVITIES, archive_activities)
@@ -0,0 +1,44 @@
+import copy
+import time
+
+from src.models.user import Student
+from src.utils.lru_cache import ExpiringLRUCache
+
+
+class ProfileCache:
+    """Perfiles de usuarios (Student o Professor) en memoria del proceso.
+
+    Los perfiles se guardan por user_id durante ttl segundos, y aparte se
+    recuerda el user_id de cada student_id y professor_id, que no cambia.
+    Solo se guardan usuarios existentes, así un alta nunca deja un perfil
+    viejo; cualquier modificación o baja de users, students o professors
+    debe llamar a invalidate().
+    """
+
+    def __init__(self, ttl: int = 300, maxsize: int = 10000):
+        self.ttl = ttl
+        self._profiles = ExpiringLRUCache(maxsize)
+        self._user_ids = ExpiringLRUCache(maxsize)
+
+    @staticmethod
+    def _role(profile) -> str:
+        return "student" if isinstance(profile, Student) else "professor"
+
+    def get(self, user_id: int):
+        profile = self._profiles.get(user_id)
+        # una copia, el JSON provider formatea las fechas sobre el objeto
+        return copy.copy(profile) if profile is not None else None
+
+    def get_by_role_id(self, role: str, role_id: int):
+        """Perfil por student_id (role "student") o professor_id (role "professor")."""
+        user_id = self._user_ids.get((role, role_id))
+        return self.get(user_id) if user_id is not None else None
+
+    def set(self, profile) -> None:
+        if profile is None or profile.user_id is None:
+            return
+        self._profiles.set(profile.user_id, copy.copy(profile), time.time() + self.ttl)
+        self._user_ids.set((self._role(profile), profile.id), profile.user_id, float("inf"))
+
+    def invalidate(self, user_id: int) -> None:
+        self._profiles.delete(user_id)
@@ -1,10 +1,16 @@
 from datetime import datetime
+from decimal import Decimal
+import json
 import re
 
+from src.db import pin_to_primary
 from src.models.project import Project
 from src.repositories.project_repository import ProjectRepository, ProjectError
 from src.repositories.activity_repository import ActivityRepository
 from src.repositories.user_repository import UserRepository
+from src.repositories.repository_stats_repository import RepositoryStatsRepository
+from src.models.repository_stats import RepositoryStats
+from src.utils.response_cache import invalidate
 
 class ProjectServiceError(Exception):
     pass
@@ -24,8 +30,11 @@ class ProjectService:
         self.project_repository = ProjectRepository(db)
         self.activity_repository = ActivityRepository(db)
         self.user_repository = UserRepository(db)
+        self.repository_stats_repository = RepositoryStatsRepository(db)
 
     def create_project(self, project: Project, student_id: int) -> Project:
+        # las validaciones previas a una escritura no pueden leer de una réplica atrasada
+        pin_to_primary()
         # Validar que se incluyó un ID de actividad
         if project.activity_id is None:
             raise ProjectValueError("El id de la actividad es obligatorio")
@@ -50,11 +59,14 @@ class ProjectService:
             raise ProjectValueError("Formato de URL de repositorio no válido")
 
         try:
-            return self.project_repository.create_project(project, student_id)
+            project = self.project_repository.create_project(project, student_id)
         except ProjectError as e:
             raise ProjectServiceError(str(e))
+        invalidate(f"activity:{activity.id}", f"professor:{activity.professor_id}", f"student:{student_id}")
+        return project
 
     def add_member(self, project_id: int, student_id: int, requesting_student_id: int) -> dict:
+        pin_to_primary()
         project = self.project_repository.find_by_id(project_id)
         if not project.id:
             raise NotFoundError("Proyecto no encontrado")
@@ -71,11 +83,13 @@ class ProjectService:
             member = self.project_repository.add_member(student_id, project_id)
             if member is None:
                 raise ProjectServiceError("El id no pertenece a ningún estudiante")
-            return member
         except ProjectError as e:
             raise ProjectServiceError(str(e))
+        invalidate(f"activity:{project.activity_id}", f"student:{student_id}")
+        return member
 
     def remove_member(self, project_id: int, student_id: int, requesting_student_id: int) -> None:
+        pin_to_primary()
         # Validar que el proyecto exista
         project = self.project_repository.find_by_id(project_id)
         if not project.id:
@@ -97,15 +111,46 @@ class ProjectService:
             self.project_repository.remove_student_from_project(student_id, project_id)
         except ProjectError as e:
             raise ProjectServiceError(str(e))
-
-    def get_projects(self, filters: dict = None) -> list[dict]:
-        projects = self.project_repository.find_projects_with_details(filters)
-        for project in projects:
-            project['member_ids'] = [int(id) for id in project['member_ids'].split(',')]
-            project['created_at'] = project['created_at'].strftime('%Y-%m-%d %H:%M:%S')
-            project['updated_at'] = project['updated_at'].strftime('%Y-%m-%d %H:%M:%S')
+        invalidate(f"activity:{project.activity_id}")
+
+    @staticmethod
+    def format_project(project: dict) -> dict:
+        """Formatea una fila de proyecto para devolverla como JSON."""
+        member_ids = project.get('member_ids')
+        project['member_ids'] = [int(id) for id in member_ids.split(',')] if member_ids else []
+        project['created_at'] = project['created_at'].strftime('%Y-%m-%d %H:%M:%S')
+        project['updated_at'] = project['updated_at'].strftime('%Y-%m-%d %H:%M:%S')
+        if 'due_date' in project:
             project['due_date'] = project['due_date'].strftime('%Y-%m-%d')
-        return projects
+        if isinstance(project.get('members'), (str, bytes)):
+            project['members'] = json.loads(project['members'])
+        return project
+
+    def get_projects(self, filters: dict = None, expand_members: bool = False,
+                     archived: bool = False) -> list[dict]:
+        projects = self.project_repository.find_projects_with_details(filters, expand_members, archived)
+        return [self.format_project(project) for project in projects]
+
+    def get_repository_stats(self, project_id: int, professor_id: int = None,
+                             student_id: int = None) -> RepositoryStats:
+        """Métricas del repositorio de un proyecto del profesor o del estudiante.
+
+        Se leen de la tabla que mantiene RepositoryIngestor. Si todavía no se
+        leyó el repositorio, o cambió su URL, se devuelve con estado PENDING.
+        """
+        project = self.project_repository.find_by_id(project_id)
+        if not project.id:
+            raise NotFoundError("Proyecto no encontrado")
+        if professor_id is not None:
+            activity = self.activity_repository.find_by_id(project.activity_id)
+            if activity.professor_id != professor_id:
+                raise ProjectOwnerError("La actividad del proyecto no pertenece al profesor solicitante.")
+        elif not self.project_repository.validate_member(student_id, project_id):
+            raise ProjectOwnerError("El estudiante no es miembro del proyecto.")
+        stats = self.repository_stats_repository.find_by_project(project_id)
+        if stats is None or stats.repository_url != project.repository_url:
+            return RepositoryStats(project_id=project_id, repository_url=project.repository_url)
+        return stats
 
     def _validate_repository_url(self, url: str) -> bool:
         # Validar formato básico de URL de Git
@@ -113,6 +158,7 @@ class ProjectService:
         return bool(re.match(git_url_pattern, url))
 
     def update(self, project : Project, student_id: int) -> Project:
+        pin_to_primary()
         # Validar que el proyecto exista
         og_project = self.project_repository.find_by_id(project.id)
         if og_project.id is None:
@@ -138,12 +184,18 @@ class ProjectService:
             project.repository_url = og_project.repository_url
 
         try:
-            return self.project_repository.update(project)
+            project = self.project_repository.update(project)
         except ProjectError as e:
             raise
+        # completar con los datos que no cambian, sin volver a leer el proyecto
+        for field in ("activity_id", "is_group", "member_count", "grade", "status", "created_at"):
+            setattr(project, field, getattr(og_project, field))
+        invalidate(f"activity:{project.activity_id}")
+        return project
 
     def delete(self, project_id: int, student_id: int) -> None:
         """Elimina un proyecto, solo si existe y el estudiante es el dueño"""
+        pin_to_primary()
 
         project = self.project_repository.find_by_id(project_id)
         if not project.id:
@@ -159,6 +211,7 @@ class ProjectService:
             raise ProjectServiceError("No se puede eliminar el proyecto una vez finalizado el plazo de actividad")
 
         self.project_repository.delete(project_id)
+        invalidate(f"activity:{project.activity_id}")
 
     def grade(self, project_id: int, professor_id: int, grade: str) -> Project:
         """Llamar a calificar un proyecto.
@@ -168,31 +221,24 @@ class ProjectService:
         Revisar que haya pasado la due_date de la actividad.
         Revisar si la nota está entre 0 y 10.
         """
-        project = self.project_repository.find_by_id(project_id)
+        pin_to_primary()
+        project, activity = self.project_repository.find_with_activity(project_id)
         if project.id is None:
             raise ValueError("El proyecto no existe.")
-        activity = self.activity_repository.find_by_id(project.activity_id)
-        if activity.id:
-            if professor_id != activity.professor_id:
-                raise ValueError("La actividad del proyecto no pertenece al profesor solicitante.")
-            else:
-                if activity.due_date.date() >= datetime.today().date():
-                    raise ValueError("No se puede calificar. La actividad sigue abierta.")
-
-                try:
-                    grade = float(grade)
-                except ValueError:
-                    raise ValueError("Calificación inválida.")
-                else:
-                    if 0.0 <= grade <= 10.0:
-                        try:
-                            self.project_repository.update_grade(project.id, grade)
-                        except:
-                            raise
-                        else:
-                            return self.project_repository.find_by_id(project.id)
-                    else:
-                        raise ValueError("Calificación inválida.")
-        else:
-            # thisi is highly unusual
-            raise RuntimeError("Error de FK entre proyecto y actividad")
+        if professor_id != activity["professor_id"]:
+            raise ValueError("La actividad del proyecto no pertenece al profesor solicitante.")
+        if activity["due_date"].date() >= datetime.today().date():
+            raise ValueError("No se puede calificar. La actividad sigue abierta.")
+
+        try:
+            grade = float(grade)
+        except ValueError:
+            raise ValueError("Calificación inválida.")
+        if not 0.0 <= grade <= 10.0:
+            raise ValueError("Calificación inválida.")
+
+        project.updated_at = self.project_repository.update_grade(project.id, grade)
+        project.grade = Decimal(str(grade)).quantize(Decimal("0.1"))
+        project.status = "GRADED"
+        invalidate(f"activity:{project.activity_id}")
+        return project
@@ -0,0 +1,206 @@
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from mysql.connector.errors import Error
+
+from src.db import DbError
+from src.models.repository_stats import RepositoryStats
+from src.repositories.repository_stats_repository import RepositoryStatsRepository
+
+# Sin preguntas por credenciales y solo con protocolos que no ejecutan comandos
+GIT_ENV = {"GIT_TERMINAL_PROMPT": "0", "GIT_ALLOW_PROTOCOL": "http:https:git:file"}
+
+
+class GitError(Exception):
+    pass
+
+
+def _git(args: list[str], cwd: str = None, timeout: int = 120) -> str:
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True,
+                                timeout=timeout, env={**os.environ, **GIT_ENV})
+    except subprocess.TimeoutExpired:
+        raise GitError(f"git {args[0]} superó los {timeout} segundos.")
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        raise GitError(lines[-1] if lines else f"git {args[0]} terminó con código {result.returncode}.")
+    return result.stdout.strip()
+
+
+def clone_url(repository_url: str) -> str:
+    """Las URLs sin esquema son válidas en los proyectos, git las tomaría como rutas locales."""
+    return repository_url if "://" in repository_url else f"https://{repository_url}"
+
+
+def sync_repository(url: str, path: str, timeout: int = 120) -> None:
+    """Clonar el repositorio en path, o traer solo lo nuevo si ya estaba clonado."""
+    if os.path.isdir(path):
+        try:
+            current_url = _git(["config", "--get", "remote.origin.url"], cwd=path, timeout=timeout)
+        except GitError:
+            current_url = None
+        if current_url == url:
+            _git(["fetch", "--prune", "--quiet", "origin"], cwd=path, timeout=timeout)
+            return
+        shutil.rmtree(path)
+    _git(["clone", "--mirror", "--quiet", "--", url, path], timeout=timeout)
+
+
+def read_stats(path: str, previous: RepositoryStats = None, timeout: int = 120) -> dict:
+    """Commits, fecha del último commit y tamaño de un repositorio clonado.
+
+    Si el HEAD anterior es ancestro del actual solo se cuentan los commits
+    nuevos, y si no cambió se reutilizan los valores anteriores.
+    """
+    try:
+        head = _git(["rev-parse", "--verify", "--quiet", "HEAD^{commit}"], cwd=path, timeout=timeout)
+    except GitError:
+        head = None  # repositorio vacío
+    stats = {"head_sha": head, "commit_count": 0, "last_commit_at": None}
+    if head:
+        previous_head = previous.head_sha if previous and previous.commit_count is not None else None
+        if previous_head == head:
+            stats["commit_count"] = previous.commit_count
+            stats["last_commit_at"] = previous.last_commit_at
+        else:
+            if previous_head and _is_ancestor(path, previous_head, head, timeout):
+                new_commits = _git(["rev-list", "--count", f"{previous_head}..{head}"], cwd=path, timeout=timeout)
+                stats["commit_count"] = previous.commit_count + int(new_commits)
+            else:
+                stats["commit_count"] = int(_git(["rev-list", "--count", head], cwd=path, timeout=timeout))
+            timestamp = _git(["log", "-1", "--format=%ct", head], cwd=path, timeout=timeout)
+            stats["last_commit_at"] = datetime.fromtimestamp(int(timestamp))
+    stats["size_bytes"] = _repository_size(path, timeout)
+    return stats
+
+
+def _is_ancestor(path: str, ancestor: str, head: str, timeout: int) -> bool:
+    try:
+        _git(["merge-base", "--is-ancestor", ancestor, head], cwd=path, timeout=timeout)
+    except GitError:
+        # no es ancestro o ya no existe (push forzado)
+        return False
+    return True
+
+
+def _repository_size(path: str, timeout: int) -> int:
+    """Tamaño de los objetos del repositorio en bytes."""
+    counts = dict(line.split(": ", 1)
+                  for line in _git(["count-objects", "-v"], cwd=path, timeout=timeout).splitlines())
+    return (int(counts.get("size", 0)) + int(counts.get("size-pack", 0))) * 1024
+
+
+class RepositoryIngestor:
+    """Lee en segundo plano los repositorios de los proyectos.
+
+    Un hilo busca los proyectos sin métricas o con métricas viejas y los
+    reparte en un pool de a lo sumo workers hilos, que clonan o actualizan
+    el repositorio en cache_dir y guardan las métricas en la base. Los
+    requests solo leen la tabla, nunca esperan a git.
+    """
+
+    def __init__(self, db, logger, cache_dir: str, workers: int = 4, refresh_seconds: int = 900,
+                 scan_seconds: int = 60, git_timeout: int = 120):
+        self.logger = logger
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.refresh_seconds = refresh_seconds
+        self.scan_seconds = scan_seconds
+        self.git_timeout = git_timeout
+        # clone/fetch y los comandos de lectura, con margen
+        self.lease_seconds = git_timeout * 6
+        self.repository_stats_repository = RepositoryStatsRepository(db)
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._executor = None
+        self._thread = None
+
+    def start(self) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="repository-ingestor")
+        self._thread = threading.Thread(target=self._run, name="repository-scanner", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+        if self._executor:
+            self._executor.shutdown(wait=True)
+
+    def wake(self) -> None:
+        """Buscar proyectos pendientes sin esperar al próximo ciclo."""
+        self._wake.set()
+
+    def on_changes(self, changes: list[dict]) -> None:
+        """Suscriptor del ChangePublisher: un proyecto nuevo o con otra URL se lee enseguida."""
+        if any(change["entity"] == "project" and change["action"] in ("created", "updated")
+               for change in changes):
+            self.wake()
+
+    def ingest(self, project_id: int, repository_url: str, previous: RepositoryStats) -> RepositoryStats:
+        """Actualizar las métricas de un proyecto ya reservado."""
+        path = os.path.join(self.cache_dir, str(project_id))
+        if previous.repository_url != repository_url:
+            previous = None
+        stats = RepositoryStats(project_id=project_id, repository_url=repository_url)
+        try:
+            sync_repository(clone_url(repository_url), path, self.git_timeout)
+            for key, value in read_stats(path, previous, self.git_timeout).items():
+                setattr(stats, key, value)
+            stats.status = "OK"
+        except GitError as err:
+            # se conservan las métricas anteriores si las había
+            if previous is not None:
+                stats.head_sha, stats.commit_count = previous.head_sha, previous.commit_count
+                stats.last_commit_at, stats.size_bytes = previous.last_commit_at, previous.size_bytes
+            stats.status = "ERROR"
+            stats.error = str(err)[:255]
+        self.repository_stats_repository.save(stats)
+        return stats
+
+    def _ingest_and_release(self, project_id: int, repository_url: str, previous: RepositoryStats) -> None:
+        try:
+            self.ingest(project_id, repository_url, previous)
+        except (Error, DbError) as err:
+            self.logger.error("Repository ingestion of project %s failed. %s", project_id, err)
+        except Exception as err:
+            self.logger.exception("Unexpected repository ingestion error on project %s. %s", project_id, err)
+        finally:
+            with self._lock:
+                self._in_flight.discard(project_id)
+            self._wake.set()
+
+    def _schedule(self) -> None:
+        with self._lock:
+            free = self.workers * 2 - len(self._in_flight)
+        if free <= 0:
+            return
+        for row in self.repository_stats_repository.find_stale(self.refresh_seconds, free):
+            project_id = row["project_id"]
+            with self._lock:
+                if project_id in self._in_flight:
+                    continue
+            previous = self.repository_stats_repository.claim(project_id, row["repository_url"],
+                                                              self.lease_seconds)
+            if previous is None:
+                continue  # lo tomó otra instancia
+            with self._lock:
+                self._in_flight.add(project_id)
+            self._executor.submit(self._ingest_and_release, project_id, row["repository_url"], previous)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self._schedule()
+            except (Error, DbError) as err:
+                self.logger.error("Repository scanner error. %s", err)
+            self._wake.wait(self.scan_seconds)
@@ -0,0 +1,183 @@
+import csv
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import bcrypt
+from mysql.connector.errors import IntegrityError
+
+from src.models.user import Student
+from src.repositories.user_repository import UserRepository
+from src.services.auth_service import AuthService, AuthPasswordError
+
+# Columnas obligatorias del CSV, enrolled_at es opcional
+REQUIRED_COLUMNS = ("email", "password", "first_name", "last_name", "enrollment_number", "major")
+
+
+def _hash_password(password: str) -> bytes:
+    """Se ejecuta en los procesos del pool, debe estar al nivel del módulo."""
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+
+
+def check_columns(fieldnames) -> None:
+    """Raises ValueError si al encabezado le faltan columnas obligatorias."""
+    missing = [column for column in REQUIRED_COLUMNS if column not in (fieldnames or [])]
+    if missing:
+        raise ValueError(f"Faltan columnas en el CSV: {', '.join(missing)}.")
+
+
+def parse_students_csv(lines) -> tuple[list[tuple[int, Student]], list[dict]]:
+    """Leer los estudiantes de un CSV con encabezado.
+
+    Args:
+        lines: Archivo de texto o iterable de líneas.
+    Returns:
+        tuple: ([(número de línea, estudiante)], [errores por línea]).
+            Las filas con errores y los emails o matrículas repetidos
+            dentro del archivo no se devuelven como estudiantes.
+    Raises:
+        ValueError: Si faltan columnas obligatorias.
+    """
+    reader = csv.DictReader(lines)
+    check_columns(reader.fieldnames)
+
+    students, errors = [], []
+    emails, enrollments = {}, {}
+    for row in reader:
+        line = reader.line_num
+        values = {key: (value or "").strip() for key, value in row.items() if key}
+        empty = [column for column in REQUIRED_COLUMNS if not values.get(column)]
+        if empty:
+            errors.append({"line": line, "message": f"Campos vacíos: {', '.join(empty)}."})
+            continue
+        try:
+            AuthService.check_password(values["password"])
+        except AuthPasswordError as err:
+            errors.append({"line": line, "message": f"{err}"})
+            continue
+        try:
+            enrollment_number = int(values["enrollment_number"])
+        except ValueError:
+            errors.append({"line": line, "message": "El número de matrícula debe ser entero."})
+            continue
+        enrolled_at = None
+        if values.get("enrolled_at"):
+            try:
+                enrolled_at = datetime.strptime(values["enrolled_at"], "%Y-%m-%d")
+            except ValueError:
+                errors.append({"line": line, "field": "enrolled_at",
+                               "message": "La fecha de inscripción debe tener el formato AAAA-MM-DD."})
+                continue
+        email = values["email"].lower()
+        if email in emails:
+            errors.append({"line": line, "field": "email", "duplicate_of_line": emails[email],
+                           "message": f"El email {values['email']} está repetido en el archivo."})
+            continue
+        if enrollment_number in enrollments:
+            errors.append({"line": line, "field": "enrollment_number",
+                           "duplicate_of_line": enrollments[enrollment_number],
+                           "message": f"La matrícula {enrollment_number} está repetida en el archivo."})
+            continue
+        emails[email] = line
+        enrollments[enrollment_number] = line
+        students.append((line, Student(email=values["email"],
+                                       password=values["password"],
+                                       first_name=values["first_name"],
+                                       last_name=values["last_name"],
+                                       enrollment_number=enrollment_number,
+                                       major=values["major"],
+                                       enrolled_at=enrolled_at)))
+    return students, errors
+
+
+class StudentImportService:
+    """Alta masiva de estudiantes desde un CSV.
+
+    Las contraseñas se hashean en un pool de procesos y los estudiantes se
+    insertan en transacciones de chunk_size filas. Los emails o matrículas
+    ya registrados se informan por línea sin cortar la importación.
+    """
+
+    def __init__(self, db, workers: int = None, chunk_size: int = 500):
+        self.user_repository = UserRepository(db)
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+    def import_csv(self, lines) -> dict:
+        return self.import_prepared(self.prepare(lines))
+
+    def prepare(self, lines) -> dict:
+        """Validar el CSV y hashear las contraseñas.
+
+        El resultado es el payload del trabajo de importación: se guarda en
+        la tabla jobs, por eso solo lleva los hashes y nunca la contraseña.
+
+        Raises:
+            ValueError: Si faltan columnas obligatorias.
+        """
+        students, errors = parse_students_csv(lines)
+        # spawn y no fork, la aplicación ya tiene hilos y conexiones abiertas
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            hashes = executor.map(_hash_password, [student.password for _, student in students],
+                                  chunksize=16)
+            rows = [{"line": line,
+                     "email": student.email,
+                     "password": password.decode("ascii"),
+                     "first_name": student.first_name,
+                     "last_name": student.last_name,
+                     "enrollment_number": student.enrollment_number,
+                     "major": student.major,
+                     "enrolled_at": student.enrolled_at.strftime("%Y-%m-%d") if student.enrolled_at else None}
+                    for (line, student), password in zip(students, hashes)]
+        return {"students": rows, "errors": errors}
+
+    def import_prepared(self, payload: dict) -> dict:
+        """Guardar los estudiantes devueltos por prepare()."""
+        students = [(row["line"], Student(email=row["email"],
+                                          password=row["password"].encode("ascii"),
+                                          first_name=row["first_name"],
+                                          last_name=row["last_name"],
+                                          enrollment_number=row["enrollment_number"],
+                                          major=row["major"],
+                                          enrolled_at=datetime.strptime(row["enrolled_at"], "%Y-%m-%d")
+                                          if row["enrolled_at"] else None))
+                    for row in payload["students"]]
+        errors = list(payload["errors"])
+        created = 0
+        for start in range(0, len(students), self.chunk_size):
+            chunk = self._without_registered(students[start:start + self.chunk_size], errors)
+            created += self._save_chunk(chunk, errors)
+        errors.sort(key=lambda error: error["line"])
+        return {"created": created, "errors": errors}
+
+    def _without_registered(self, chunk: list, errors: list) -> list:
+        """Quitar del chunk los estudiantes cuyo email o matrícula ya existe."""
+        emails, enrollments = self.user_repository.find_existing_student_keys(
+            [student.email for _, student in chunk],
+            [student.enrollment_number for _, student in chunk])
+        pending = []
+        for line, student in chunk:
+            if student.email.lower() in emails:
+                errors.append({"line": line, "field": "email",
+                               "message": f"El email {student.email} ya está registrado."})
+            elif student.enrollment_number in enrollments:
+                errors.append({"line": line, "field": "enrollment_number",
+                               "message": f"La matrícula {student.enrollment_number} ya está registrada."})
+            else:
+                pending.append((line, student))
+        return pending
+
+    def _save_chunk(self, chunk: list, errors: list) -> int:
+        try:
+            return self.user_repository.create_students([student for _, student in chunk])
+        except IntegrityError:
+            # otro alta registró alguno mientras tanto, se guardan de a uno
+            created = 0
+            for line, student in chunk:
+                try:
+                    created += self.user_repository.create_students([student])
+                except IntegrityError:
+                    errors.append({"line": line,
+                                   "message": "Error de integridad: el correo o número de matrícula ya existe."})
+            return created
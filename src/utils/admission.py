@@ -0,0 +1,157 @@
+import math
+import random
+import threading
+import time
+
+from flask import g, jsonify, request
+
+# Métodos que escriben en la base
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+# Blueprints sin control de admisión: el stream de eventos mantiene la conexión abierta
+EXEMPT_BLUEPRINTS = {"event_bp"}
+MAX_RETRY_AFTER = 30
+
+
+class AdaptiveLimit:
+    """Límite de requests concurrentes de una clase de rutas, ajustado por latencia.
+
+    Mientras la latencia media se mantiene cerca de la mínima observada el
+    límite crece de a poco (hasta max_limit); cuando crece por encima de
+    tolerance veces la mínima, hay cola en la base y el límite baja (hasta
+    min_limit). Un request sin lugar espera a lo sumo max_wait segundos, y
+    si por la cola y la latencia actual no lo conseguiría en ese tiempo se
+    rechaza enseguida.
+    """
+
+    def __init__(self, name: str, min_limit: int, initial: int, max_limit: int,
+                 max_wait: float = 0.5, tolerance: float = 2.0, smoothing: float = 0.2):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(initial)
+        self.max_wait = max_wait
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.latency = None
+        self.min_latency = None
+        self._cond = threading.Condition()
+
+    def _expected_wait(self) -> float:
+        """Segundos hasta que se libere un lugar para el próximo en la cola."""
+        return (self.waiting + 1) * (self.latency or 0.0) / max(int(self.limit), 1)
+
+    def _retry_after(self) -> int:
+        # con jitter, para que los clientes rechazados no vuelvan todos juntos
+        seconds = math.ceil(self._expected_wait()) + random.random() * 2
+        return min(max(1, round(seconds)), MAX_RETRY_AFTER)
+
+    def acquire(self) -> int:
+        """Tomar un lugar. Devuelve None si se admite el request, o los
+        segundos a informar en Retry-After si se rechaza."""
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return None
+            if self._expected_wait() > self.max_wait:
+                self.rejected += 1
+                return self._retry_after()
+            self.waiting += 1
+            deadline = time.monotonic() + self.max_wait
+            try:
+                while self.in_flight >= int(self.limit):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected += 1
+                        return self._retry_after()
+                    self._cond.wait(remaining)
+                self.in_flight += 1
+                return None
+            finally:
+                self.waiting -= 1
+
+    def release(self, latency: float = None) -> None:
+        """Liberar el lugar y ajustar el límite con la latencia del request.
+
+        Sin latency (ej: respuestas del cache) solo se libera el lugar. El
+        límite baja solo si hubo contención: el request ocupaba el último
+        lugar o había otros esperando. Sin contención, una latencia alta es
+        propia de la consulta y no de una cola en la base.
+        """
+        with self._cond:
+            contended = self.in_flight >= int(self.limit) or self.waiting > 0
+            self.in_flight -= 1
+            self._cond.notify()
+            if latency is None:
+                return
+            if self.latency is None:
+                self.latency = self.min_latency = latency
+            else:
+                self.latency += self.smoothing * (latency - self.latency)
+                # la mínima sube muy despacio, así se adapta si cambia la carga de base
+                self.min_latency = min(latency, self.min_latency + 0.001 * (self.latency - self.min_latency))
+            if self.latency > self.tolerance * self.min_latency:
+                if contended:
+                    self.limit = max(self.min_limit, self.limit * 0.95)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+def route_class(req) -> str:
+    if req.blueprint == "auth_bp":
+        return "auth"
+    if req.method in WRITE_METHODS:
+        return "writes"
+    return "listings"
+
+
+class AdmissionControl:
+    """Limita los requests concurrentes antes de que lleguen a los controladores.
+
+    Cada clase de rutas (auth, listings, writes) tiene su AdaptiveLimit.
+    Los requests que no consiguen lugar reciben 503 con Retry-After sin
+    haber pedido una conexión a MySQL.
+    """
+
+    def __init__(self, limits: dict[str, tuple[int, int, int]], max_wait: float = 0.5):
+        self.limits = {name: AdaptiveLimit(name, *bounds, max_wait=max_wait)
+                       for name, bounds in limits.items()}
+
+    def init_app(self, app) -> None:
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def _before_request(self):
+        if request.method == "OPTIONS" or request.blueprint is None or request.blueprint in EXEMPT_BLUEPRINTS:
+            return None
+        limit = self.limits.get(route_class(request))
+        if limit is None:
+            return None
+        retry_after = limit.acquire()
+        if retry_after is not None:
+            response = jsonify({
+                "error": "Servicio no disponible",
+                "message": f"El servidor está saturado, reintente en {retry_after} segundos."
+            })
+            response.headers["Retry-After"] = str(retry_after)
+            return response, 503
+        g._admission = (limit, time.monotonic())
+        return None
+
+    def _release(self) -> None:
+        admission = g.pop("_admission", None)
+        if admission is not None:
+            limit, start = admission
+            # los HIT del cache de respuestas (g._cache_hit) no dicen nada de la base
+            limit.release(None if g.pop("_cache_hit", False) else time.monotonic() - start)
+
+    def _after_request(self, response):
+        # antes de enviar el cuerpo: en las descargas en stream solo se mide la vista
+        self._release()
+        return response
+
+    def _teardown_request(self, error=None):
+        self._release()
@@ -0,0 +1,82 @@
+import json
+
+import click
+from flask import current_app as app
+
+from src.services.archive_service import ArchiveService
+from src.services.index_advisor import IndexAdvisor
+from src.services.jobs import ARCHIVE_ACTIVITIES
+from src.services.student_import_service import StudentImportService
+
+
+@click.command("import-students")
+@click.argument("csv_file", type=click.File("r", encoding="utf-8-sig"))
+def import_students_command(csv_file):
+    """Alta masiva de estudiantes desde CSV_FILE."""
+    service = StudentImportService(app.db,
+                                   app.config["STUDENT_IMPORT_WORKERS"],
+                                   app.config["STUDENT_IMPORT_CHUNK_SIZE"])
+    try:
+        result = service.import_csv(csv_file)
+    except ValueError as err:
+        raise click.ClickException(str(err))
+    click.echo(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+@click.command("index-advisor")
+@click.option("--reset", is_flag=True, help="Vaciar las estadísticas antes de correr una carga de trabajo.")
+@click.option("--min-calls", default=1, show_default=True, help="Ignorar las consultas con menos ejecuciones.")
+@click.option("--limit", default=50, show_default=True, help="Consultas a analizar, las que más filas leen.")
+@click.option("--json", "as_json", is_flag=True, help="Salida en JSON.")
+def index_advisor_command(reset, min_calls, limit, as_json):
+    """Índices candidatos según las consultas observadas en performance_schema."""
+    advisor = IndexAdvisor(app.db, app.config["DB_NAME"])
+    if reset:
+        advisor.reset()
+        click.echo("Estadísticas vaciadas, corré la carga de trabajo y volvé a ejecutar el comando.")
+        return
+    result = advisor.advise(min_calls, limit)
+    if as_json:
+        click.echo(json.dumps(result, ensure_ascii=False, indent=2, default=str))
+        return
+
+    for query in result["queries"]:
+        click.echo(f"{query['calls']} ejecuciones, {query.get('rows_examined', '?')} filas leídas: "
+                   f"{', '.join(query['issues']) or query.get('error')}")
+        click.echo(f"    {query['digest_text'][:200]}")
+    if not result["candidates"]:
+        click.echo("No hay índices candidatos.")
+        return
+    click.echo("")
+    click.echo("-- Índices candidatos (beneficio estimado en filas que se dejan de leer)")
+    for candidate in result["candidates"]:
+        click.echo(f"-- {candidate['benefit']} filas, {candidate['queries']} consulta(s)")
+        click.echo(candidate["ddl"])
+
+
+@click.command("archive")
+@click.option("--terms", type=int, help="Cuatrimestres a conservar, el actual incluido (por defecto ARCHIVE_TERMS).")
+@click.option("--enqueue", is_flag=True, help="Encolar el archivo como trabajo en lugar de ejecutarlo.")
+def archive_command(terms, enqueue):
+    """Archivar las actividades calificadas de cuatrimestres anteriores."""
+    if enqueue:
+        job = app.job_queue.enqueue(ARCHIVE_ACTIVITIES, {"terms": terms})
+        click.echo(f"Trabajo {job.id} encolado.")
+        return
+    service = ArchiveService(app.db,
+                             terms or app.config["ARCHIVE_TERMS"],
+                             app.config["ARCHIVE_BATCH_SIZE"],
+                             app.config["ARCHIVE_TERM_START_MONTHS"],
+                             app.response_cache)
+    try:
+        result = service.archive()
+    except ValueError as err:
+        raise click.ClickException(str(err))
+    click.echo(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+def register_commands(app) -> None:
+    """Registrar los comandos de `flask`."""
+    app.cli.add_command(import_students_command)
+    app.cli.add_command(index_advisor_command)
+    app.cli.add_command(archive_command)
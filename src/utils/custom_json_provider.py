@@ -3,7 +3,10 @@ from datetime import datetime
 from flask.json.provider import DefaultJSONProvider
 
 from src.models.activity import Activity
+from src.models.activity_stats import ActivityStats
+from src.models.job import Job
 from src.models.project import Project
+from src.models.repository_stats import RepositoryStats
 from src.models.user import Student, Professor
 
 
@@ -19,11 +22,26 @@ class CustomJSONProvider(DefaultJSONProvider):
             o.updated_at = o.updated_at.strftime("%Y-%m-%d %H:%M:%S") if isinstance(o.updated_at, datetime) else o.updated_at
             return o.__dict__
 
+        if isinstance(o, ActivityStats):
+            return o.__dict__
+
         if isinstance(o, Project):
             o.created_at = o.created_at.strftime("%Y-%m-%d %H:%M:%S") if isinstance(o.created_at, datetime) else o.created_at
             o.updated_at = o.updated_at.strftime("%Y-%m-%d %H:%M:%S") if isinstance(o.updated_at, datetime) else o.updated_at
             return o.__dict__
 
+        if isinstance(o, RepositoryStats):
+            o.last_commit_at = o.last_commit_at.strftime("%Y-%m-%d %H:%M:%S") if isinstance(o.last_commit_at, datetime) else o.last_commit_at
+            o.fetched_at = o.fetched_at.strftime("%Y-%m-%d %H:%M:%S") if isinstance(o.fetched_at, datetime) else o.fetched_at
+            return o.__dict__
+
+        if isinstance(o, Job):
+            # el payload puede ser grande (ej: el CSV de una importación)
+            job = {key: value for key, value in o.__dict__.items() if key != "payload"}
+            for key in ("run_at", "created_at", "started_at", "finished_at"):
+                job[key] = job[key].strftime("%Y-%m-%d %H:%M:%S") if isinstance(job[key], datetime) else job[key]
+            return job
+
         if isinstance(o, Student):
             o.enrolled_at = o.enrolled_at.strftime("%Y-%m-%d") if isinstance(o.enrolled_at, datetime) else o.enrolled_at
             o.created_at = o.created_at.strftime("%Y-%m-%d %H:%M:%S") if isinstance(o.created_at, datetime) else o.created_at
@@ -1,4 +1,9 @@
+import random
+
 from flask import jsonify
+from werkzeug.exceptions import ServiceUnavailable
+
+from src.db import DbError
 
 def register_error_handlers(app):
     """Registra los manejadores de errores para la aplicación"""
@@ -43,4 +48,21 @@ def register_error_handlers(app):
         return jsonify({
             "error": "Error del servidor",
             "message": error.description if error.description != "" else "Ha ocurrido un error interno en el servidor"
-        }), 500
\ No newline at end of file
+        }), 500
+
+    @app.errorhandler(503)
+    def service_unavailable_error(error):
+        """Maneja la falta de conexiones a la base: el cliente puede reintentar"""
+        response = jsonify({
+            "error": "Servicio no disponible",
+            "message": error.description if error.description != "" else "El servidor está saturado, reintente en unos segundos"
+        })
+        # con jitter, para que los clientes no reintenten todos juntos
+        response.headers["Retry-After"] = str(random.randint(1, 3))
+        return response, 503
+
+    @app.errorhandler(DbError)
+    def db_error(error):
+        """Maneja los DbError que no capturó el controlador"""
+        app.logger.error(f"Error de base de datos: {str(error)}")
+        return service_unavailable_error(ServiceUnavailable(description=""))
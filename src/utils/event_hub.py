@@ -0,0 +1,109 @@
+import queue
+import threading
+
+# Cambios del registro que se envían por SSE: (entity, action) -> evento
+EVENT_TYPES = {
+    ("project", "created"): "project-created",
+    ("member", "added"): "member-changed",
+    ("member", "removed"): "member-changed",
+    ("project", "graded"): "graded",
+}
+
+
+class Subscriber:
+    """Conexión SSE de un usuario.
+
+    Solo guarda una cola acotada y los proyectos que le interesan,
+    para que miles de conexiones ociosas ocupen poca memoria.
+    """
+
+    def __init__(self, role: str, scope_id: int, project_ids=(), max_pending: int = 100):
+        self.role = role
+        self.scope_id = scope_id
+        self.project_ids = set(project_ids)
+        self.queue = queue.Queue(max_pending)
+        self.overflowed = False
+
+    def get(self, timeout: float):
+        """Próximo evento, o None si no llegó ninguno en timeout segundos."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventHub:
+    """Reparte los cambios del ChangePublisher entre las conexiones SSE.
+
+    Las conexiones se indexan por profesor, por estudiante y por proyecto,
+    así cada cambio solo recorre las conexiones a las que corresponde.
+    """
+
+    def __init__(self, change_publisher):
+        self.change_publisher = change_publisher
+        self._by_professor = {}
+        self._by_student = {}
+        self._by_project = {}
+        self._lock = threading.Lock()
+        self._listening = False
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            if subscriber.role == "professor":
+                self._by_professor.setdefault(subscriber.scope_id, set()).add(subscriber)
+            else:
+                self._by_student.setdefault(subscriber.scope_id, set()).add(subscriber)
+                for project_id in subscriber.project_ids:
+                    self._by_project.setdefault(project_id, set()).add(subscriber)
+            if not self._listening:
+                self._listening = True
+                self.change_publisher.subscribe(self.dispatch)
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            if subscriber.role == "professor":
+                self._discard(self._by_professor, subscriber.scope_id, subscriber)
+            else:
+                self._discard(self._by_student, subscriber.scope_id, subscriber)
+                for project_id in subscriber.project_ids:
+                    self._discard(self._by_project, project_id, subscriber)
+
+    @staticmethod
+    def _discard(index: dict, key, subscriber: Subscriber) -> None:
+        subscribers = index.get(key)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del index[key]
+
+    def _track_membership(self, change: dict) -> None:
+        """Actualizar los proyectos de los estudiantes conectados."""
+        project_id = change["project_id"]
+        for subscriber in self._by_student.get(change["student_id"], ()):
+            if change["action"] in ("created", "added"):
+                subscriber.project_ids.add(project_id)
+                self._by_project.setdefault(project_id, set()).add(subscriber)
+            elif change["action"] == "removed":
+                subscriber.project_ids.discard(project_id)
+                self._discard(self._by_project, project_id, subscriber)
+
+    def dispatch(self, changes: list[dict]) -> None:
+        """Entregar un lote de cambios a las conexiones de su alcance."""
+        with self._lock:
+            for change in changes:
+                event = EVENT_TYPES.get((change["entity"], change["action"]))
+                if event is None:
+                    continue
+                targets = set(self._by_professor.get(change["professor_id"], ()))
+                targets.update(self._by_student.get(change["student_id"], ()))
+                targets.update(self._by_project.get(change["project_id"], ()))
+                if change["action"] in ("created", "added"):
+                    self._track_membership(change)
+                for subscriber in targets:
+                    try:
+                        subscriber.queue.put_nowait((change["id"], event, change))
+                    except queue.Full:
+                        # el cliente no consume, se le pide que vuelva a sincronizar
+                        subscriber.overflowed = True
+                if change["action"] == "removed":
+                    self._track_membership(change)
@@ -0,0 +1,93 @@
+import csv
+import io
+import tempfile
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # la exportación a xlsx es opcional
+    Workbook = None
+
+# Columnas de la planilla: (clave de la fila, encabezado)
+GRADE_COLUMNS = [
+    ("project_id", "Proyecto"),
+    ("title", "Título"),
+    ("repository_url", "Repositorio"),
+    ("status", "Estado"),
+    ("grade", "Nota"),
+    ("passed", "Aprobado"),
+    ("created_at", "Creado"),
+    ("enrollment_number", "Matrícula"),
+    ("last_name", "Apellido"),
+    ("first_name", "Nombre"),
+    ("major", "Carrera"),
+    ("is_owner", "Responsable"),
+]
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _values(row: dict) -> list:
+    values = []
+    for key, _ in GRADE_COLUMNS:
+        value = row[key]
+        if key in ("passed", "is_owner"):
+            value = None if value is None else ("Sí" if value else "No")
+        values.append(value)
+    return values
+
+
+def csv_chunks(rows):
+    """Escribir las filas como CSV a medida que se leen.
+
+    Se acumulan hasta CHUNK_SIZE caracteres antes de entregar cada parte,
+    la primera lleva el BOM para que Excel reconozca el UTF-8.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow([header for _, header in GRADE_COLUMNS])
+    for row in rows:
+        writer.writerow(_values(row))
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def xlsx_chunks(rows):
+    """Escribir las filas en un libro xlsx y entregarlo por partes.
+
+    El libro se arma en modo write_only, que guarda las filas en un archivo
+    temporal en lugar de mantenerlas en memoria.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Calificaciones")
+    sheet.append([header for _, header in GRADE_COLUMNS])
+    for row in rows:
+        sheet.append(_values(row))
+    with tempfile.TemporaryFile() as file:
+        workbook.save(file)
+        file.seek(0)
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+
+def export_chunks(rows, export_format: str):
+    """Generador con el contenido de la planilla en el formato pedido.
+
+    Raises:
+        ValueError: Si el formato no existe o no está disponible.
+    """
+    if export_format == "csv":
+        return csv_chunks(rows)
+    if export_format == "xlsx":
+        if Workbook is None:
+            raise ValueError("La exportación a xlsx requiere openpyxl.")
+        return xlsx_chunks(rows)
+    raise ValueError(f"Formato desconocido, debe ser uno de: {', '.join(EXPORT_FORMATS)}.")
@@ -1,10 +1,42 @@
+import hashlib
+import time
+
 from flask_jwt_extended import JWTManager
 from flask import request, make_response
 
+from src.utils.lru_cache import ExpiringLRUCache
+
+
+class CachingJWTManager(JWTManager):
+    """JWTManager que recuerda los tokens ya verificados.
+
+    Cada request con @jwt_required() verifica la firma y decodifica el
+    token. Los claims de un token válido se guardan, por el digest del
+    token, hasta su exp (o max_ttl segundos si no vence), y los siguientes
+    requests con el mismo token los toman de ahí.
+    """
+
+    def __init__(self, app=None, cache_size: int = 10000, max_ttl: int = 3600):
+        self.verified_tokens = ExpiringLRUCache(cache_size)
+        self.max_ttl = max_ttl
+        super().__init__(app)
+
+    def _decode_jwt_from_config(self, encoded_token: str, csrf_value=None, allow_expired: bool = False) -> dict:
+        if csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        key = hashlib.sha256(encoded_token.encode()).digest()
+        claims = self.verified_tokens.get(key)
+        if claims is None:
+            claims = super()._decode_jwt_from_config(encoded_token)
+            self.verified_tokens.set(key, claims, min(claims.get("exp", float("inf")),
+                                                      time.time() + self.max_ttl))
+        # una copia, get_jwt() la expone a las vistas
+        return dict(claims)
+
 
 def init_jwt(app):
     """Inicializa la configuración de JWT"""
-    jwt = JWTManager(app)
+    jwt = CachingJWTManager(app, app.config.get("JWT_DECODE_CACHE_SIZE", 10000))
 
     @app.before_request
     def handle_preflight():
@@ -0,0 +1,22 @@
+from flask import request
+
+
+def get_pagination(prefix: str = "", default_per_page: int = 20, max_per_page: int = 100) -> tuple[int, int]:
+    """Lee los parámetros de paginación del request.
+
+    Args:
+        prefix (str): Prefijo de los parámetros, ej: "projects_" para
+            projects_page y projects_per_page.
+    Returns:
+        tuple: (page, per_page), page comienza en 1.
+    Raises:
+        ValueError: Si los parámetros no son enteros positivos.
+    """
+    try:
+        page = int(request.args.get(f"{prefix}page", 1))
+        per_page = int(request.args.get(f"{prefix}per_page", default_per_page))
+    except ValueError:
+        raise ValueError("Los parámetros de paginación deben ser enteros.")
+    if page < 1 or per_page < 1:
+        raise ValueError("Los parámetros de paginación deben ser mayores a 0.")
+    return page, min(per_page, max_per_page)
@@ -0,0 +1,389 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, current_app as app, g, has_app_context, make_response, request
+from flask_jwt_extended import get_jwt
+
+from src.db import pin_to_primary
+
+try:
+    import redis
+except ImportError:  # el backend redis es opcional
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Antigüedad a partir de la cual un temporal de FileBackend se considera abandonado
+TEMP_FILE_SECONDS = 60
+
+
+class MemoryBackend:
+    """Entradas en memoria del proceso, para un solo worker o las pruebas."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> bytes:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: bytes, ttl: int) -> None:
+        self._entries[key] = (value, time.time() + ttl if ttl else None)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(self, keys: list[str]) -> list[bytes]:
+        with self._lock:
+            return [self._get(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ttl: int = None) -> None:
+        with self._lock:
+            self._set(key, value, ttl)
+
+    def add(self, key: str, value: bytes, ttl: int = None) -> bool:
+        with self._lock:
+            if self._get(key) is not None:
+                return False
+            self._set(key, value, ttl)
+            return True
+
+
+class FileBackend:
+    """Entradas en archivos de un directorio, compartidas por los workers del mismo host.
+
+    Cada entrada es un archivo con el vencimiento en la primera línea. Se
+    escriben en un temporal y se renombran, así nunca se lee una a medias.
+    Cada sweep_seconds una escritura lanza sweep() en un hilo, que elimina
+    las entradas vencidas que nadie volvió a leer, los temporales que dejó
+    un worker interrumpido y, si quedan más de max_entries, las más viejas.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 10000, sweep_seconds: float = 60):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.sweep_seconds = sweep_seconds
+        self._next_sweep = time.monotonic() + sweep_seconds
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def sweep(self) -> int:
+        """Eliminar los archivos vencidos o sobrantes. Devuelve cuántos se eliminaron."""
+        now = time.time()
+        entries, expired = [], []
+        for entry in os.scandir(self.directory):
+            try:
+                modified_at = entry.stat().st_mtime
+                if entry.name.startswith(".tmp"):
+                    # un temporal se renombra enseguida, si sigue ahí es de un worker interrumpido
+                    if now - modified_at > TEMP_FILE_SECONDS:
+                        expired.append(entry.path)
+                    continue
+                with open(entry.path, "rb") as file:
+                    expires_at = float(file.readline())
+            except (FileNotFoundError, ValueError):
+                # eliminado por otro worker, o todavía se está escribiendo (add)
+                continue
+            if expires_at and expires_at <= now:
+                expired.append(entry.path)
+            else:
+                entries.append((modified_at, entry.path))
+        entries.sort()
+        expired += [path for _, path in entries[:max(0, len(entries) - self.max_entries)]]
+        removed = 0
+        for path in expired:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def _sweep_if_due(self) -> None:
+        with self._lock:
+            if time.monotonic() < self._next_sweep:
+                return
+            self._next_sweep = time.monotonic() + self.sweep_seconds
+        threading.Thread(target=self._sweep, name="response-cache-sweep", daemon=True).start()
+
+    def _sweep(self) -> None:
+        try:
+            removed = self.sweep()
+        except OSError as err:
+            logger.warning("Response cache sweep failed. %s", err)
+        else:
+            logger.debug("Response cache sweep removed %s files.", removed)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    @staticmethod
+    def _content(value: bytes, ttl: int) -> bytes:
+        expires_at = time.time() + ttl if ttl else 0
+        return f"{expires_at}\n".encode() + value
+
+    def _get(self, key: str) -> bytes:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                expires_at, value = file.read().split(b"\n", 1)
+        except (FileNotFoundError, ValueError):
+            return None
+        if float(expires_at) and float(expires_at) <= time.time():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return None
+        return value
+
+    def get_many(self, keys: list[str]) -> list[bytes]:
+        return [self._get(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ttl: int = None) -> None:
+        self._sweep_if_due()
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(self._content(value, ttl))
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def add(self, key: str, value: bytes, ttl: int = None) -> bool:
+        self._sweep_if_due()
+        # _get borra la entrada si venció, O_EXCL falla si otro worker la creó antes
+        if self._get(key) is not None:
+            return False
+        try:
+            fd = os.open(self._path(key), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "wb") as file:
+            file.write(self._content(value, ttl))
+        return True
+
+
+class RedisBackend:
+    """Entradas en un servidor Redis (o compatible), compartidas entre hosts."""
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise ValueError("El backend redis del cache requiere el paquete redis.")
+        self.client = redis.Redis.from_url(url)
+
+    def get_many(self, keys: list[str]) -> list[bytes]:
+        return self.client.mget(keys)
+
+    def set(self, key: str, value: bytes, ttl: int = None) -> None:
+        self.client.set(key, value, ex=ttl)
+
+    def add(self, key: str, value: bytes, ttl: int = None) -> bool:
+        return bool(self.client.set(key, value, ex=ttl, nx=True))
+
+
+class ResponseCache:
+    """Cache de respuestas compartido entre workers, con invalidación por tags.
+
+    Cada tag (ej: "activity:3", "professor:1") tiene una versión en el
+    backend, y cada entrada guarda las versiones de sus tags al momento de
+    generarse. Invalidar un tag le asigna una versión nueva, así todas las
+    entradas con ese tag dejan de valer sin tener que buscarlas. Los
+    errores del backend se registran y se tratan como un miss.
+
+    La versión incluye el momento en que se creó: durante pin_seconds
+    después de una invalidación las respuestas se generan leyendo del
+    primario, para no guardar con la versión nueva datos de una réplica
+    que todavía no recibió la escritura.
+    """
+
+    def __init__(self, backend, ttl: int = 300, prefix: str = "gespro:", pin_seconds: float = 5):
+        self.backend = backend
+        self.ttl = ttl
+        self.prefix = prefix
+        self.pin_seconds = pin_seconds
+
+    @staticmethod
+    def _new_version(created_at: float = None) -> bytes:
+        created_at = time.time() if created_at is None else created_at
+        return f"{created_at:.3f}:{uuid.uuid4().hex}".encode()
+
+    def recently_invalidated(self, versions: dict[str, str]) -> bool:
+        """Alguno de los tags cambió de versión hace menos de pin_seconds (0 lo desactiva)."""
+        if self.pin_seconds <= 0:
+            return False
+        threshold = time.time() - self.pin_seconds
+        for version in versions.values():
+            created_at, _, _ = version.partition(":")
+            try:
+                if float(created_at) > threshold:
+                    return True
+            except ValueError:
+                # versión sin fecha, anterior a este formato
+                continue
+        return False
+
+    @staticmethod
+    def invalidated_since(versions: dict[str, str], since: float) -> bool:
+        """Alguno de los tags se invalidó después de since (time.time())."""
+        for version in versions.values():
+            created_at, _, _ = version.partition(":")
+            try:
+                # la versión se redondea al milisegundo
+                if float(created_at) >= since - 0.001:
+                    return True
+            except ValueError:
+                continue
+        return False
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def tag_versions(self, tags: list[str]) -> dict[str, str]:
+        tags = list(dict.fromkeys(tags))
+        if not tags:
+            return {}
+        versions = {}
+        for tag, version in zip(tags, self.backend.get_many([self._tag_key(tag) for tag in tags])):
+            if version is None:
+                # un tag sin versión (nuevo o descartado por el backend) recibe una nueva,
+                # las entradas viejas con ese tag no pueden volver a ser válidas; no es
+                # una invalidación, por eso no lleva fecha
+                self.backend.add(self._tag_key(tag), self._new_version(0))
+                version = self.backend.get_many([self._tag_key(tag)])[0]
+            versions[tag] = version.decode() if isinstance(version, bytes) else version
+        return versions
+
+    def get(self, key: str) -> bytes:
+        try:
+            entry = self.backend.get_many([f"{self.prefix}{key}"])[0]
+            if entry is None:
+                return None
+            header, body = entry.split(b"\n", 1)
+            versions = json.loads(header)
+            if self.tag_versions(list(versions)) != versions:
+                return None
+            return body
+        except Exception as err:
+            logger.warning("Response cache read failed. %s", err)
+            return None
+
+    def set(self, key: str, body: bytes, versions: dict[str, str]) -> None:
+        try:
+            self.backend.set(f"{self.prefix}{key}", json.dumps(versions).encode() + b"\n" + body, self.ttl)
+        except Exception as err:
+            logger.warning("Response cache write failed. %s", err)
+
+    def invalidate(self, *tags: str) -> None:
+        for tag in tags:
+            try:
+                self.backend.set(self._tag_key(tag), self._new_version())
+            except Exception as err:
+                # las entradas con el tag siguen valiendo hasta vencer su ttl
+                logger.error("Response cache invalidation of %s failed. %s", tag, err)
+
+
+def create_response_cache(config) -> ResponseCache:
+    """Cache según RESPONSE_CACHE_BACKEND: memory, file, redis o none (sin cache)."""
+    backend = config.RESPONSE_CACHE_BACKEND
+    pin_seconds = getattr(config, "RESPONSE_CACHE_PIN_SECONDS", 5)
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return ResponseCache(MemoryBackend(), config.RESPONSE_CACHE_TTL, pin_seconds=pin_seconds)
+    if backend == "file":
+        return ResponseCache(FileBackend(config.RESPONSE_CACHE_URL,
+                                         getattr(config, "RESPONSE_CACHE_MAX_ENTRIES", 10000)),
+                             config.RESPONSE_CACHE_TTL, pin_seconds=pin_seconds)
+    if backend == "redis":
+        return ResponseCache(RedisBackend(config.RESPONSE_CACHE_URL), config.RESPONSE_CACHE_TTL,
+                             pin_seconds=pin_seconds)
+    raise ValueError(f"Backend de cache desconocido: {backend}.")
+
+
+def invalidate(*tags: str) -> None:
+    """Invalidar tags del cache de la aplicación, si hay uno configurado."""
+    cache = getattr(app, "response_cache", None) if has_app_context() else None
+    if cache is not None:
+        cache.invalidate(*tags)
+
+
+def cache_key(claims: dict) -> str:
+    """Ruta + rol + id del profesor o estudiante + argumentos de la query."""
+    role = claims.get("role")
+    scope = claims.get(f"{role}_id")
+    args = sorted(request.args.items(multi=True))
+    raw = json.dumps([request.path, role, scope, args])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def cache_response(tags, item_tags=None):
+    """Cachear las respuestas 200 de una vista JSON protegida con jwt_required.
+
+    tags(claims, view_args) da los tags conocidos antes de ejecutar la vista
+    y item_tags(body) los que surgen del resultado (ej: la actividad de cada
+    proyecto listado). Las versiones de los primeros se leen antes de la
+    consulta, así una invalidación concurrente no deja una entrada vieja;
+    las de los segundos recién se conocen después, y si alguna es posterior
+    al inicio del request la respuesta no se guarda.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = getattr(app, "response_cache", None)
+            if cache is None:
+                return view(*args, **kwargs)
+            claims = get_jwt()
+            key = cache_key(claims)
+            body = cache.get(key)
+            if body is not None:
+                response = Response(body, 200, mimetype="application/json")
+                response.headers["X-Cache"] = "HIT"
+                g._cache_hit = True
+                return response
+
+            started_at = time.time()
+            try:
+                versions = cache.tag_versions(tags(claims, kwargs))
+            except Exception as err:
+                logger.warning("Response cache read failed. %s", err)
+                return view(*args, **kwargs)
+            if cache.recently_invalidated(versions):
+                # una réplica atrasada devolvería los datos previos a la escritura
+                pin_to_primary()
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and response.is_json:
+                body = response.get_data()
+                try:
+                    item_versions = {}
+                    if item_tags is not None:
+                        item_versions = cache.tag_versions(
+                            [tag for tag in item_tags(json.loads(body)) if tag not in versions])
+                except Exception as err:
+                    logger.warning("Response cache read failed. %s", err)
+                else:
+                    # una invalidación durante la consulta, el cuerpo puede ser previo
+                    if not cache.invalidated_since(item_versions, started_at):
+                        cache.set(key, body, {**versions, **item_versions})
+            response.headers["X-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
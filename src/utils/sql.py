@@ -0,0 +1,8 @@
+def like_prefix(value) -> str:
+    """Patrón LIKE 'valor%' escapando los comodines.
+
+    Un patrón de prefijo permite que MySQL use índices B-tree,
+    a diferencia de '%valor%'.
+    """
+    escaped = str(value).strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
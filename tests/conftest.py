@@ -0,0 +1,30 @@
+import pytest
+
+from config import TestingConfig
+from src.db import Database
+from tests.utils import cleanup
+
+
+@pytest.fixture
+def db():
+    """Base de pruebas cargada con gespro_struct_data.sql, se limpia al terminar."""
+    db = Database(TestingConfig)
+
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+
+        with open("gespro_struct_data.sql", "r") as file:
+            sql_script = file.read()
+
+        for statement in sql_script.split(";"):
+            if statement.strip():
+                cursor.execute(statement)
+
+        conn.commit()
+
+        cursor.close()
+
+    yield db
+
+    with db.get_connection() as conn:
+        cleanup(conn)
@@ -3,17 +3,13 @@ import datetime
 
 from mysql.connector.errors import IntegrityError, DataError, Error
 
-from config import TestingConfig
-from src.db import Database
 from src.models.activity import Activity
 from src.repositories.activity_repository import ActivityRepository
-from tests.utils import cleanup
 
 
-@pytest.fixture
-def config():
-    db = Database(TestingConfig)
-
+@pytest.fixture(autouse=True)
+def config(db):
+    """Base de pruebas cargada con los datos de ejemplo, ver conftest.py."""
     return db
 
 
@@ -22,33 +18,6 @@ def activity_repository(config):
     db = config
     return ActivityRepository(db)
 
-
-@pytest.fixture(autouse=True)
-def setup(config):
-    db = config
-
-    with db.get_connection() as conn:
-        cursor = conn.cursor()
-
-        with open("gespro_struct_data.sql", "r") as file:
-            sql_script = file.read()
-
-        sql_statements = sql_script.split(";")
-
-        for statement in sql_statements:
-            if statement.strip():
-                cursor.execute(statement)
-
-        conn.commit()
-
-        cursor.close()
-
-    yield
-
-    db = config
-    with db.get_connection() as conn:
-        cleanup(conn)
-
 def test_update_all_fields_success(activity_repository):
     # Arrange
     original_activity = activity_repository.find_by_id(1)
@@ -173,6 +142,37 @@ def test_save_with_all_fields(activity_repository):
     # Assert
     assert saved_activity.id == 4
 
+def test_save_returns_activity_without_reading_it_again(activity_repository):
+    # Arrange
+    activity = Activity(
+        name="Activity Test",
+        description="Test Description",
+        due_date="2025-01-21",
+        min_grade=6,
+        professor_id=1,
+    )
+
+    # Act
+    saved_activity = activity_repository.save(activity)
+
+    # Assert
+    stored_activity = activity_repository.find_by_id(saved_activity.id)
+    assert saved_activity.created_at == stored_activity.created_at
+    assert saved_activity.updated_at == stored_activity.updated_at
+    assert saved_activity.min_grade == stored_activity.min_grade
+
+
+def test_update_returns_the_updated_at_written_by_the_database(activity_repository):
+    # Arrange
+    activity = activity_repository.find_by_id(1)
+    activity.name = "Nombre actualizado"
+
+    # Act
+    updated_activity = activity_repository.update(activity)
+
+    # Assert
+    assert updated_activity.updated_at == activity_repository.find_by_id(1).updated_at
+
 def test_save_raises_integrity_error_invalid_professor_id(activity_repository):
     # Arrange
     wrong_professor_id = 100
@@ -257,4 +257,44 @@ def test_delete_non_valid_activity_id(activity_repository):
 
     # act assert
     with pytest.raises(Error):
-        activity_repository.delete(activity_id)
\ No newline at end of file
+        activity_repository.delete(activity_id)
+
+
+def test_find_by_name_returns_prefix_matches_before_contained_ones(activity_repository):
+    # arrange
+    activity_repository.save(Activity(name="Scrum avanzado", description="Roles y ceremonias",
+                                      due_date="2029-03-01", min_grade=6, professor_id=2))
+
+    # act
+    activities = activity_repository.find_by_name("scrum")
+
+    # assert
+    assert [activity.name for activity in activities] == ["Scrum avanzado", "Simulacro Scrum"]
+
+
+def test_find_by_name_single_character_only_matches_prefix(activity_repository):
+    # act
+    activities = activity_repository.find_by_name("S")
+
+    # assert
+    assert [activity.name for activity in activities] == ["Simulacro Scrum"]
+
+
+def test_find_by_name_filters_by_professor_and_paginates(activity_repository):
+    # act
+    own = activity_repository.find_by_name("TP", professor_id=2)
+    first_page = activity_repository.find_by_name("TP", limit=1)
+    second_page = activity_repository.find_by_name("TP", limit=1, offset=1)
+
+    # assert
+    assert [activity.name for activity in own] == ["TP 2 - SQL"]
+    assert len(first_page) == len(second_page) == 1
+    assert first_page[0].id != second_page[0].id
+
+
+def test_find_by_name_escapes_like_wildcards(activity_repository):
+    # act
+    activities = activity_repository.find_by_name("%")
+
+    # assert
+    assert activities == []
@@ -0,0 +1,67 @@
+import pytest
+
+from src.models.project import Project
+from src.repositories.activity_repository import ActivityRepository
+from src.repositories.activity_stats_repository import ActivityStatsRepository
+from src.repositories.project_repository import ProjectRepository
+
+
+class TestActivityStats:
+    """Pruebas de integración: las estadísticas incrementales coinciden con rebuild()."""
+
+    @pytest.fixture
+    def stats_repository(self, db) -> ActivityStatsRepository:
+        return ActivityStatsRepository(db)
+
+    @pytest.fixture
+    def project_repository(self, db) -> ProjectRepository:
+        return ProjectRepository(db)
+
+    def _counts(self, stats):
+        return (stats.project_count, stats.student_count, stats.graded_count,
+                stats.passed_count, stats.average_grade)
+
+    def _assert_matches_rebuild(self, stats_repository, activity_id):
+        incremental = self._counts(stats_repository.find_by_activity(activity_id))
+        stats_repository.rebuild(activity_id)
+        assert incremental == self._counts(stats_repository.find_by_activity(activity_id))
+
+    def test_created_project_and_members_match_rebuild(self, stats_repository, project_repository):
+        # arrange
+        project = project_repository.create_project(
+            Project(title="Consultas", repository_url="https://github.com/user1/consultas.git", activity_id=2), 2)
+
+        # act
+        project_repository.add_member(3, project.id)
+        project_repository.add_member(4, project.id)
+        project_repository.remove_student_from_project(4, project.id)
+
+        # assert
+        self._assert_matches_rebuild(stats_repository, 2)
+
+    def test_grades_and_min_grade_changes_match_rebuild(self, db, stats_repository, project_repository):
+        # arrange
+        activity_repository = ActivityRepository(db)
+        project_repository.update_grade(1, 7)
+        project_repository.update_grade(2, 4)
+
+        # act
+        activity = activity_repository.find_by_id(1)
+        activity.min_grade = 8
+        activity_repository.update(activity)
+        project_repository.update_grade(2, 9)
+
+        # assert
+        self._assert_matches_rebuild(stats_repository, 1)
+
+    def test_deleted_projects_match_rebuild(self, stats_repository, project_repository):
+        # arrange
+        project_repository.update_grade(2, 6)
+
+        # act
+        project_repository.delete(1)
+        project_repository.delete(2)
+
+        # assert
+        self._assert_matches_rebuild(stats_repository, 1)
+        assert self._counts(stats_repository.find_by_activity(1)) == (0, 0, 0, 0, None)
@@ -0,0 +1,132 @@
+import pytest
+from flask import Blueprint, Flask, g
+
+from config import parse_admission_limits
+from src.utils.admission import AdaptiveLimit, AdmissionControl
+
+
+def _app(admission):
+    app = Flask(__name__)
+    bp = Blueprint("project_bp", __name__, url_prefix="/api/projects")
+
+    @bp.route("/", methods=["GET", "POST"])
+    def projects():
+        return {"ok": True}
+
+    app.register_blueprint(bp)
+    admission.init_app(app)
+    return app
+
+
+def test_limit_shrinks_when_latency_grows_and_recovers():
+    # Arrange
+    limit = AdaptiveLimit("listings", 1, 4, 8)
+    for _ in range(20):
+        limit.acquire()
+        limit.release(0.01)
+    healthy = limit.limit
+
+    # Act
+    for _ in range(30):
+        taken = int(limit.limit)
+        for _ in range(taken):
+            limit.acquire()
+        for _ in range(taken):
+            limit.release(0.2)
+    overloaded = limit.limit
+
+    # Assert
+    assert healthy > 4
+    assert overloaded < healthy
+    assert overloaded >= 1
+    assert limit.in_flight == 0
+
+
+def test_slow_requests_without_contention_do_not_shrink_the_limit():
+    # Arrange
+    limit = AdaptiveLimit("listings", 1, 4, 8)
+    limit.acquire()
+    limit.release(0.01)
+
+    # Act
+    for _ in range(30):
+        limit.acquire()
+        limit.release(0.5)
+
+    # Assert
+    assert limit.limit >= 4
+
+
+def test_release_without_latency_only_frees_the_slot():
+    # Arrange
+    limit = AdaptiveLimit("listings", 1, 1, 4)
+    limit.acquire()
+
+    # Act
+    limit.release()
+
+    # Assert
+    assert limit.in_flight == 0
+    assert limit.latency is None
+    assert limit.limit == 1
+
+
+def test_cache_hits_are_not_measured():
+    # Arrange
+    admission = AdmissionControl({"listings": (1, 2, 4)})
+    app = Flask(__name__)
+    bp = Blueprint("activity_bp", __name__, url_prefix="/api/activities")
+
+    @bp.route("/")
+    def activities():
+        g._cache_hit = True
+        return {"ok": True}
+
+    app.register_blueprint(bp)
+    admission.init_app(app)
+
+    # Act
+    response = app.test_client().get("/api/activities/")
+
+    # Assert
+    assert response.status_code == 200
+    assert admission.limits["listings"].latency is None
+    assert admission.limits["listings"].in_flight == 0
+
+
+def test_admission_limits_are_parsed_from_the_environment():
+    assert parse_admission_limits("auth:1:2:3, listings:2:4:8") == {"auth": (1, 2, 3), "listings": (2, 4, 8)}
+    with pytest.raises(ValueError):
+        parse_admission_limits("auth:1:2")
+
+
+def test_rejects_without_waiting_when_the_queue_cannot_drain_in_time():
+    # Arrange
+    limit = AdaptiveLimit("writes", 1, 1, 1, max_wait=0.5)
+    limit.acquire()
+    limit.release(2.0)
+    limit.acquire()
+
+    # Act
+    retry_after = limit.acquire()
+
+    # Assert
+    assert 1 <= retry_after <= 30
+    assert limit.rejected == 1
+
+
+def test_saturated_class_returns_503_with_retry_after():
+    # Arrange
+    admission = AdmissionControl({"listings": (1, 1, 1), "writes": (1, 1, 1)}, max_wait=0.05)
+    client = _app(admission).test_client()
+    admission.limits["listings"].acquire()
+
+    # Act
+    rejected = client.get("/api/projects/")
+    write = client.post("/api/projects/")
+
+    # Assert
+    assert rejected.status_code == 503
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert write.status_code == 200
+    assert admission.limits["writes"].in_flight == 0
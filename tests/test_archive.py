@@ -0,0 +1,49 @@
+from datetime import date, datetime
+
+from src.services.archive_service import ArchiveService, term_start
+from tests.utils import FakeResponseCache
+
+
+class FakeArchiveRepository:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.cutoffs = []
+
+    def archive_batch(self, cutoff, batch_size):
+        self.cutoffs.append(cutoff)
+        return self.batches.pop(0) if self.batches else ([], 0)
+
+
+def test_term_start_goes_back_whole_terms():
+    # Arrange
+    day = date(2026, 10, 19)
+
+    # Act
+    current = term_start(day)
+    previous = term_start(day, 1)
+    two_back = term_start(day, 2)
+    summer = term_start(date(2026, 2, 10))
+
+    # Assert
+    assert current == datetime(2026, 8, 1)
+    assert previous == datetime(2026, 3, 1)
+    assert two_back == datetime(2025, 8, 1)
+    assert summer == datetime(2025, 8, 1)
+
+
+def test_archive_runs_batches_until_nothing_is_left():
+    # Arrange
+    cache = FakeResponseCache()
+    service = ArchiveService(None, terms=2, batch_size=2, response_cache=cache)
+    service.archive_repository = FakeArchiveRepository([
+        ([{"id": 1, "professor_id": 5}, {"id": 2, "professor_id": 5}], 7),
+        ([{"id": 3, "professor_id": 6}], 2),
+    ])
+
+    # Act
+    result = service.archive(date(2026, 10, 19))
+
+    # Assert
+    assert result == {"cutoff": "2026-03-01", "activities": 3, "projects": 9}
+    assert len(service.archive_repository.cutoffs) == 3
+    assert {"archive", "activity:1", "activity:3", "professor:5", "professor:6"} <= set(cache.invalidated)
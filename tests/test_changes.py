@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+from src.repositories.change_repository import ChangeRepository
+from src.repositories.project_repository import ProjectRepository
+
+
+class TestChanges:
+    """Pruebas de integración del registro de cambios."""
+
+    @pytest.fixture
+    def change_repository(self, db) -> ChangeRepository:
+        return ChangeRepository(db)
+
+    def _record_and_commit(self, db, activity_id):
+        with db.get_connection() as conn:
+            ChangeRepository.record(conn.cursor(), "activity", "updated", activity_id=activity_id)
+            conn.commit()
+
+    def test_change_ids_follow_commit_order(self, db, change_repository):
+        # arrange
+        with db.get_connection() as first:
+            ChangeRepository.record(first.cursor(), "activity", "updated", activity_id=1)
+            second = threading.Thread(target=self._record_and_commit, args=(db, 2))
+            second.start()
+            time.sleep(0.2)
+
+            # act
+            pending = change_repository.find_since(0, 10)
+            first.commit()
+        second.join()
+        changes = change_repository.find_since(0, 10)
+
+        # assert
+        assert pending == []
+        assert [change["activity_id"] for change in changes] == [1, 2]
+        assert changes[0]["id"] < changes[1]["id"]
+
+    def test_rolled_back_change_does_not_consume_an_id(self, db, change_repository):
+        # arrange
+        with db.get_connection() as conn:
+            ChangeRepository.record(conn.cursor(), "activity", "updated", activity_id=1)
+            conn.rollback()
+
+        # act
+        self._record_and_commit(db, 2)
+        changes = change_repository.find_since(0, 10)
+
+        # assert
+        assert [(change["id"], change["activity_id"]) for change in changes] == [(1, 2)]
+
+    def test_grading_records_the_change_with_its_activity(self, db, change_repository):
+        # arrange
+        project_repository = ProjectRepository(db)
+
+        # act
+        project_repository.update_grade(3, 8)
+        changes = change_repository.find_since(0, 10)
+
+        # assert
+        assert len(changes) == 1
+        assert changes[0]["action"] == "graded"
+        assert (changes[0]["activity_id"], changes[0]["professor_id"]) == (2, 2)
+        assert changes[0]["payload"] == {"grade": 8.0}
+
+    def test_deleting_a_project_records_its_activity_and_professor(self, db, change_repository):
+        # arrange
+        project_repository = ProjectRepository(db)
+
+        # act
+        project_repository.delete(4)
+        changes = change_repository.find_since(0, 10)
+
+        # assert
+        assert len(changes) == 1
+        assert (changes[0]["entity"], changes[0]["action"]) == ("project", "deleted")
+        assert (changes[0]["activity_id"], changes[0]["project_id"], changes[0]["professor_id"]) == (3, 4, 3)
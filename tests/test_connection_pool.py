@@ -0,0 +1,165 @@
+import threading
+import time
+
+import pytest
+from mysql.connector.connection import MySQLConnection
+from mysql.connector.errors import InterfaceError
+
+import src.db
+from src.db import Replica, ValidatingConnectionPool
+
+
+class FakeConnection(MySQLConnection):
+    """Conexión sin servidor, cuenta los pings y las reconexiones."""
+
+    def __init__(self, connected=True):
+        super().__init__()
+        self.connected = connected
+        self.pings = 0
+        self.reconnects = 0
+
+    def is_connected(self):
+        self.pings += 1
+        return self.connected
+
+    def config(self, **kwargs):
+        pass
+
+    def reconnect(self, attempts=1, delay=0):
+        self.reconnects += 1
+        self.connected = True
+
+
+def _pool(*connections, min_free=1):
+    pool = ValidatingConnectionPool(idle_ping_seconds=60, max_age_seconds=3600, min_free=min_free,
+                                    pool_name=f"test_{id(connections)}", pool_size=len(connections))
+    pool._cnx_config = {"host": "localhost"}
+    for cnx in connections:
+        cnx.pool_config_version = pool._config_version
+        pool.add_connection(cnx)
+    return pool
+
+
+def _wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_recently_used_connection_is_handed_out_without_ping():
+    # Arrange
+    cnx = FakeConnection()
+    pool = _pool(cnx)
+
+    # Act
+    pooled = pool.get_connection()
+
+    # Assert
+    assert pooled._cnx is cnx
+    assert cnx.pings == 0
+
+
+def test_idle_connection_is_pinged_and_handed_out():
+    # Arrange
+    idle, fresh = FakeConnection(), FakeConnection()
+    pool = _pool(idle, fresh)
+    idle.pool_returned_at -= 120
+
+    # Act
+    pooled = pool.get_connection()
+
+    # Assert
+    assert pooled._cnx is idle
+    assert idle.pings == 1
+    assert idle.reconnects == 0
+
+
+def test_idle_broken_connection_is_repaired_in_background():
+    # Arrange
+    stale, first, second = FakeConnection(connected=False), FakeConnection(), FakeConnection()
+    pool = _pool(stale, first, second)
+    stale.pool_returned_at -= 120
+
+    # Act
+    pooled = pool.get_connection()
+
+    # Assert
+    assert pooled._cnx is first
+    assert _wait_until(lambda: stale.reconnects == 1 and pool._cnx_queue.qsize() == 2)
+
+
+def test_expired_connections_are_not_handed_off_below_min_free():
+    # Arrange
+    connections = [FakeConnection() for _ in range(4)]
+    pool = _pool(*connections, min_free=2)
+    for cnx in connections:
+        cnx.pool_expires_at = time.monotonic() - 1
+
+    # Act
+    pooled = pool.get_connection()
+
+    # Assert
+    assert pooled._cnx is connections[1]
+    assert connections[1].reconnects == 1
+    assert pool._cnx_queue.qsize() >= 2
+
+
+def test_expired_connection_is_reconnected_when_it_is_the_only_one():
+    # Arrange
+    cnx = FakeConnection()
+    pool = _pool(cnx)
+    cnx.pool_expires_at = time.monotonic() - 1
+
+    # Act
+    pooled = pool.get_connection()
+
+    # Assert
+    assert pooled._cnx is cnx
+    assert cnx.reconnects == 1
+    assert cnx.pool_expires_at > time.monotonic()
+
+
+def test_failed_reconnection_keeps_the_connection_in_the_pool():
+    # Arrange
+    cnx = FakeConnection()
+    pool = _pool(cnx)
+    cnx.pool_broken = True
+
+    def reconnect(attempts=1, delay=0):
+        raise InterfaceError("down")
+    cnx.reconnect = reconnect
+
+    # Act
+    with pytest.raises(InterfaceError):
+        pool.get_connection()
+
+    # Assert
+    assert pool._cnx_queue.qsize() == 1
+    assert cnx.pool_broken
+
+
+def test_replica_pool_is_created_once(monkeypatch):
+    # Arrange
+    created = []
+
+    class SlowPool:
+        def __init__(self, *args, **kwargs):
+            time.sleep(0.05)
+            created.append(self)
+
+        def get_connection(self):
+            return object()
+
+    monkeypatch.setattr(src.db, "ValidatingConnectionPool", SlowPool)
+    replica = Replica("replica", 2)
+    threads = [threading.Thread(target=replica.get_connection) for _ in range(5)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert len(created) == 1
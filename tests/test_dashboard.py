@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+from src.models.activity import Activity
+from src.models.activity_stats import ActivityStats
+from src.services.activity_service import ActivityService
+
+
+class FakeActivityRepository:
+    def __init__(self, activities):
+        self.activities = activities
+
+    def find_by_professor(self, professor_id):
+        return self.activities
+
+
+class FakeProjectRepository:
+    def __init__(self, projects):
+        self.projects = projects
+        self.calls = []
+
+    def find_by_professor_ranked(self, professor_id, offset, per_page):
+        self.calls.append((professor_id, offset, per_page))
+        return self.projects
+
+
+def _activity(activity_id, due_date, project_count=0, graded_count=0):
+    return Activity(id=activity_id, name=f"TP {activity_id}", due_date=due_date, professor_id=1,
+                    stats=ActivityStats(activity_id=activity_id, project_count=project_count,
+                                        graded_count=graded_count))
+
+
+def _project(project_id, activity_id):
+    created_at = datetime(2026, 3, 1, 10, 0)
+    return {"id": project_id, "activity_id": activity_id, "member_ids": "1,2",
+            "created_at": created_at, "updated_at": created_at}
+
+
+def _service(activities, projects):
+    service = ActivityService(None)
+    service.activity_repository = FakeActivityRepository(activities)
+    service.project_repository = FakeProjectRepository(projects)
+    return service
+
+
+def test_dashboard_groups_projects_by_activity():
+    # Arrange
+    tomorrow = datetime.today() + timedelta(days=1)
+    yesterday = datetime.today() - timedelta(days=1)
+    service = _service([_activity(1, tomorrow, 2, 1), _activity(2, yesterday)],
+                       [_project(10, 1), _project(11, 1)])
+
+    # Act
+    dashboard = service.get_dashboard(1, page=2, per_page=5)
+
+    # Assert
+    assert [d["activity"].id for d in dashboard] == [1, 2]
+    assert [p["id"] for p in dashboard[0]["projects"]] == [10, 11]
+    assert dashboard[0]["projects"][0]["member_ids"] == [1, 2]
+    assert dashboard[1]["projects"] == []
+    assert (dashboard[0]["is_closed"], dashboard[1]["is_closed"]) == (False, True)
+    assert dashboard[0]["pending_grades"] == 1
+    assert service.project_repository.calls == [(1, 5, 5)]
+
+
+def test_dashboard_skips_projects_of_activities_not_listed():
+    # Arrange
+    service = _service([_activity(1, datetime.today())], [_project(10, 1), _project(12, 3)])
+
+    # Act
+    dashboard = service.get_dashboard(1)
+
+    # Assert
+    assert [p["id"] for p in dashboard[0]["projects"]] == [10]
@@ -0,0 +1,130 @@
+import pytest
+from mysql.connector.errors import IntegrityError, InternalError, OperationalError
+
+from src.db import RetryPolicy, retry_transaction
+from src.models.activity import Activity
+from src.models.project import Project
+from src.repositories.activity_repository import ActivityRepository
+from src.repositories.project_repository import ProjectRepository
+
+
+class FakeDb:
+    def __init__(self, policy):
+        self.retry_policy = policy
+
+
+class FakeRepository:
+    def __init__(self, db, errors):
+        self.db = db
+        self.errors = list(errors)
+        self.calls = 0
+
+    def _run(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+    @retry_transaction()
+    def create(self):
+        return self._run()
+
+    @retry_transaction(idempotent=True)
+    def update(self):
+        try:
+            return self._run()
+        except InternalError:
+            raise ValueError("Error al actualizar")
+
+
+def _policy(**kwargs):
+    return RetryPolicy(base_delay=0, max_delay=0, **kwargs)
+
+
+def test_deadlock_is_retried_until_it_succeeds():
+    # Arrange
+    policy = _policy()
+    repository = FakeRepository(FakeDb(policy), [InternalError(errno=1213), InternalError(errno=1205)])
+
+    # Act
+    result = repository.create()
+
+    # Assert
+    assert result == "ok"
+    assert repository.calls == 3
+    assert policy.metrics() == {"retries": 2, "retries_1213": 1, "retries_1205": 1, "recovered": 1}
+
+
+def test_transient_error_wrapped_by_the_repository_is_retried():
+    # Arrange
+    repository = FakeRepository(FakeDb(_policy()), [InternalError(errno=1213)])
+
+    # Act
+    result = repository.update()
+
+    # Assert
+    assert result == "ok"
+    assert repository.calls == 2
+
+
+def test_lost_connection_is_only_retried_when_idempotent():
+    # Arrange
+    db = FakeDb(_policy())
+    create = FakeRepository(db, [OperationalError(errno=2013)])
+    update = FakeRepository(db, [OperationalError(errno=2013)])
+
+    # Act
+    with pytest.raises(OperationalError):
+        create.create()
+    result = update.update()
+
+    # Assert
+    assert create.calls == 1
+    assert result == "ok"
+
+
+def test_other_errors_and_exhausted_budget_are_not_retried():
+    # Arrange
+    policy = _policy(budget=1)
+    duplicate = FakeRepository(FakeDb(policy), [IntegrityError(errno=1062)])
+    deadlocks = FakeRepository(FakeDb(policy), [InternalError(errno=1213)] * 3)
+
+    # Act
+    with pytest.raises(IntegrityError):
+        duplicate.create()
+    with pytest.raises(InternalError):
+        deadlocks.create()
+
+    # Assert
+    assert duplicate.calls == 1
+    assert deadlocks.calls == 2
+    assert policy.metrics()["budget_exceeded"] == 1
+
+
+class LostConnectionDb:
+    """Base cuyas conexiones se cortan siempre."""
+
+    def __init__(self):
+        self.retry_policy = _policy()
+        self.connections = 0
+
+    def get_connection(self):
+        self.connections += 1
+        raise OperationalError(errno=2013)
+
+
+@pytest.mark.parametrize("write", [
+    lambda db: ProjectRepository(db).update_grade(1, 7),
+    lambda db: ProjectRepository(db).update(Project(id=1, title="Futbol5", repository_url="https://x")),
+    lambda db: ActivityRepository(db).update(Activity(id=1, min_grade=6)),
+])
+def test_writes_that_record_a_change_are_not_retried_after_a_lost_connection(write):
+    # Arrange
+    db = LostConnectionDb()
+
+    # Act
+    with pytest.raises(OperationalError):
+        write(db)
+
+    # Assert
+    assert db.connections == 1
@@ -0,0 +1,124 @@
+import logging
+from datetime import datetime, timedelta
+
+from src.services.deadline_scheduler import DeadlineScheduler, closing_time
+from tests.utils import FakeResponseCache
+
+
+class FakeActivityRepository:
+    def __init__(self, pending):
+        self.pending = pending
+
+    def find_pending_deadlines(self, since):
+        return self.pending
+
+
+class FakeProjectRepository:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.calls = []
+
+    def close_open_projects(self, activity_id, batch_size):
+        self.calls.append((activity_id, batch_size))
+        return self.batches.pop(0) if self.batches else 0
+
+
+def _scheduler(**kwargs):
+    return DeadlineScheduler(None, logging.getLogger(__name__), **kwargs)
+
+
+def test_closing_time_is_the_start_of_the_next_day():
+    assert closing_time(datetime(2026, 10, 19, 15, 30)) == datetime(2026, 10, 20)
+
+
+def test_pop_due_returns_due_activities_in_deadline_order():
+    # Arrange
+    scheduler = _scheduler()
+    scheduler.schedule(1, datetime(2026, 10, 21))
+    scheduler.schedule(2, datetime(2026, 10, 19))
+    scheduler.schedule(3, datetime(2026, 10, 30))
+
+    # Act
+    due = scheduler._pop_due(datetime(2026, 10, 22, 1))
+
+    # Assert
+    assert due == [2, 1]
+    assert scheduler._heap == [(datetime(2026, 10, 31), 3)]
+
+
+def test_rescheduled_activity_ignores_its_stale_entry():
+    # Arrange
+    scheduler = _scheduler()
+    scheduler.schedule(1, datetime(2026, 10, 19))
+    scheduler.schedule(1, datetime(2026, 10, 25))
+
+    # Act
+    early = scheduler._pop_due(datetime(2026, 10, 21))
+    late = scheduler._pop_due(datetime(2026, 10, 27))
+
+    # Assert
+    assert early == []
+    assert late == [1]
+    assert scheduler._deadlines == {}
+
+
+def test_activity_is_popped_only_once():
+    # Arrange
+    scheduler = _scheduler()
+    scheduler.schedule(1, datetime(2026, 10, 19))
+    scheduler.schedule(1, datetime(2026, 10, 19))
+
+    # Act
+    due = scheduler._pop_due(datetime(2026, 10, 21))
+
+    # Assert
+    assert due == [1]
+    assert scheduler._heap == []
+
+
+def test_reload_replaces_the_scheduled_deadlines():
+    # Arrange
+    scheduler = _scheduler(reload_seconds=60)
+    scheduler.schedule(9, datetime(2026, 10, 19))
+    scheduler.activity_repository = FakeActivityRepository([
+        {"id": 1, "due_date": datetime(2026, 10, 22)},
+        {"id": 2, "due_date": datetime(2026, 10, 20)},
+    ])
+    now = datetime(2026, 10, 19, 12)
+
+    # Act
+    scheduler._reload(now)
+
+    # Assert
+    assert scheduler._deadlines == {1: datetime(2026, 10, 23), 2: datetime(2026, 10, 21)}
+    assert scheduler._heap[0] == (datetime(2026, 10, 21), 2)
+    assert scheduler._next_reload == now + timedelta(seconds=60)
+
+
+def test_seconds_until_next_waits_for_the_earliest_event():
+    # Arrange
+    scheduler = _scheduler()
+    now = datetime(2026, 10, 19, 23, 59)
+    scheduler._next_reload = now + timedelta(minutes=5)
+    scheduler.schedule(1, datetime(2026, 10, 19))
+
+    # Act
+    seconds = scheduler._seconds_until_next(now)
+
+    # Assert
+    assert seconds == 60
+
+
+def test_close_activity_closes_in_batches_and_invalidates_the_cache():
+    # Arrange
+    cache = FakeResponseCache()
+    scheduler = _scheduler(batch_size=2, response_cache=cache)
+    scheduler.project_repository = FakeProjectRepository([2, 2, 1])
+
+    # Act
+    closed = scheduler.close_activity(4)
+
+    # Assert
+    assert closed == 5
+    assert scheduler.project_repository.calls == [(4, 2)] * 3
+    assert cache.invalidated == ["activity:4"]
@@ -0,0 +1,153 @@
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+
+from src.controllers import event_controller
+from src.controllers.event_controller import MAX_MISSED_CHANGES, event_routes_bp
+from src.utils.event_hub import EventHub, Subscriber
+
+
+class FakePublisher:
+    """Publicador que solo registra a sus suscriptores."""
+
+    def __init__(self):
+        self.subscribers = []
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+
+def change(id, entity, action, professor_id=1, project_id=None, student_id=None):
+    return {"id": id, "entity": entity, "action": action, "professor_id": professor_id,
+            "project_id": project_id, "student_id": student_id, "activity_id": 1}
+
+
+@pytest.fixture
+def event_hub():
+    return EventHub(FakePublisher())
+
+
+def test_hub_subscribes_to_publisher_once(event_hub):
+    # Act
+    event_hub.subscribe(Subscriber("professor", 1))
+    event_hub.subscribe(Subscriber("professor", 2))
+
+    # Assert
+    assert event_hub.change_publisher.subscribers == [event_hub.dispatch]
+
+
+def test_professor_only_receives_own_activities(event_hub):
+    # Arrange
+    professor = Subscriber("professor", 1)
+    other_professor = Subscriber("professor", 2)
+    event_hub.subscribe(professor)
+    event_hub.subscribe(other_professor)
+
+    # Act
+    event_hub.dispatch([change(1, "project", "created", professor_id=1, project_id=5, student_id=3)])
+
+    # Assert
+    assert professor.get(timeout=0)[1] == "project-created"
+    assert other_professor.get(timeout=0) is None
+
+
+def test_student_receives_grades_of_joined_projects(event_hub):
+    # Arrange
+    student = Subscriber("student", 7, project_ids=[1])
+    event_hub.subscribe(student)
+
+    # Act
+    event_hub.dispatch([
+        change(1, "member", "added", project_id=2, student_id=7),
+        change(2, "project", "graded", project_id=2),
+        change(3, "member", "removed", project_id=1, student_id=7),
+        change(4, "project", "graded", project_id=1),
+    ])
+
+    # Assert
+    events = [student.get(timeout=0)[0] for _ in range(3)]
+    assert events == [1, 2, 3]
+    assert student.get(timeout=0) is None
+    assert student.project_ids == {2}
+
+
+def test_ignored_changes_are_not_sent(event_hub):
+    # Arrange
+    professor = Subscriber("professor", 1)
+    event_hub.subscribe(professor)
+
+    # Act
+    event_hub.dispatch([change(1, "project", "updated", project_id=5)])
+
+    # Assert
+    assert professor.get(timeout=0) is None
+
+
+def test_slow_subscriber_overflows(event_hub):
+    # Arrange
+    professor = Subscriber("professor", 1, max_pending=1)
+    event_hub.subscribe(professor)
+
+    # Act
+    event_hub.dispatch([change(1, "project", "graded", project_id=5),
+                        change(2, "project", "graded", project_id=5)])
+
+    # Assert
+    assert professor.overflowed
+
+
+class ReplayingChangeRepository:
+    """Registro de cambios que publica un cambio mientras se lee el historial."""
+
+    def __init__(self, event_hub, missed):
+        self.event_hub = event_hub
+        self.missed = missed
+
+    def find_since(self, since, limit, **scope):
+        self.event_hub.dispatch([self.missed[-1], change(9, "project", "graded", project_id=5)])
+        return self.missed
+
+
+@pytest.fixture
+def stream_app(event_hub, monkeypatch):
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "test"
+    JWTManager(app)
+    app.register_blueprint(event_routes_bp)
+    app.db = None
+    app.event_hub = event_hub
+    monkeypatch.setattr(event_controller, "HEARTBEAT_SECONDS", 0)
+    return app
+
+
+def _stream(app, monkeypatch, missed):
+    with app.app_context():
+        token = create_access_token("1", additional_claims={"role": "professor", "professor_id": 1})
+    repository = ReplayingChangeRepository(app.event_hub, missed)
+    monkeypatch.setattr(event_controller, "ChangeRepository", lambda db: repository)
+    response = app.test_client().get("/api/events/stream", buffered=False,
+                                     headers={"Authorization": f"Bearer {token}", "Last-Event-ID": "3"})
+    return iter(response.response)
+
+
+def test_stream_replays_then_skips_changes_already_sent(stream_app, monkeypatch):
+    # Arrange
+    missed = [change(4, "project", "created", project_id=5), change(5, "project", "graded", project_id=5)]
+
+    # Act
+    chunks = _stream(stream_app, monkeypatch, missed)
+    events = [next(chunks).decode() for _ in range(4)]
+
+    # Assert
+    assert [event.split("\n")[0] for event in events] == ["retry: 5000", "id: 4", "id: 5", "id: 9"]
+
+
+def test_stream_asks_for_resync_when_too_many_changes_were_missed(stream_app, monkeypatch):
+    # Arrange
+    missed = [change(id, "project", "graded", project_id=5) for id in range(4, 4 + MAX_MISSED_CHANGES)]
+
+    # Act
+    events = [chunk.decode() for chunk in _stream(stream_app, monkeypatch, missed)]
+
+    # Assert
+    assert events == ["retry: 5000\n\n", "event: resync\ndata: {}\n\n"]
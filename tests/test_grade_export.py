@@ -0,0 +1,123 @@
+import csv
+import io
+from datetime import datetime
+
+import pytest
+from openpyxl import load_workbook
+
+from src.repositories.project_repository import ProjectRepository
+from src.utils.grade_export import GRADE_COLUMNS, export_chunks
+
+
+def grade_row(project_id, last_name, grade=None, passed=None):
+    return {"project_id": project_id, "title": f"Proyecto {project_id}",
+            "repository_url": "https://github.com/x/y", "status": "GRADED",
+            "grade": grade, "passed": passed, "created_at": datetime(2025, 3, 1, 10, 0),
+            "enrollment_number": f"ENR{project_id}", "last_name": last_name,
+            "first_name": "Ana", "major": "Sistemas", "is_owner": 1}
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def execute(self, query, params):
+        if query.startswith("SELECT id FROM projects"):
+            _, last_id, limit = params
+            ids = [project_id for project_id in sorted(self.db.members) if project_id > last_id][:limit]
+            self.result = [{"id": project_id} for project_id in ids]
+        else:
+            self.result = [grade_row(project_id, last_name)
+                           for project_id in params for last_name in self.db.members[project_id]]
+
+    def fetchall(self):
+        return self.result
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.open += 1
+        return self
+
+    def __exit__(self, *args):
+        self.db.open -= 1
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self.db)
+
+
+class FakeDb:
+    """Base con proyectos y sus miembros que cuenta las conexiones tomadas."""
+
+    def __init__(self, members):
+        self.members = members
+        self.open = 0
+
+    def get_read_connection(self):
+        return FakeConnection(self)
+
+
+def test_csv_export_writes_header_and_rows():
+    # Arrange
+    rows = [grade_row(1, "Pérez", 8, 1), grade_row(2, "Gómez")]
+
+    # Act
+    content = "".join(export_chunks(iter(rows), "csv"))
+
+    # Assert
+    lines = list(csv.reader(io.StringIO(content.lstrip("\ufeff"))))
+    assert lines[0] == [header for _, header in GRADE_COLUMNS]
+    assert lines[1][:6] == ["1", "Proyecto 1", "https://github.com/x/y", "GRADED", "8", "Sí"]
+    assert lines[2][4:6] == ["", ""]
+    assert len(lines) == 3
+
+
+def test_csv_export_yields_in_chunks():
+    # Arrange
+    rows = (grade_row(i, "x" * 200) for i in range(2000))
+
+    # Act
+    chunks = list(export_chunks(rows, "csv"))
+
+    # Assert
+    assert len(chunks) > 1
+
+
+def test_xlsx_export_is_a_valid_workbook():
+    # Arrange
+    rows = [grade_row(1, "Pérez", 8, 1)]
+
+    # Act
+    content = b"".join(export_chunks(iter(rows), "xlsx"))
+
+    # Assert
+    sheet = load_workbook(io.BytesIO(content)).active
+    values = list(sheet.values)
+    assert values[0][0] == "Proyecto"
+    assert values[1][8] == "Pérez"
+
+
+def test_unknown_format_raises_value_error():
+    with pytest.raises(ValueError):
+        export_chunks(iter([]), "pdf")
+
+
+def test_grade_rows_are_read_in_batches_without_holding_a_connection():
+    # Arrange
+    db = FakeDb({1: ["Pérez", "Gómez"], 2: ["Ríos"], 3: ["Sosa"], 5: ["Vera"]})
+    rows = ProjectRepository(db).iter_grade_rows(7, batch_size=2)
+
+    # Act
+    open_connections = []
+    read = []
+    for row in rows:
+        open_connections.append(db.open)
+        read.append((row["project_id"], row["last_name"]))
+
+    # Assert
+    assert read == [(1, "Pérez"), (1, "Gómez"), (2, "Ríos"), (3, "Sosa"), (5, "Vera")]
+    assert set(open_connections) == {0}
@@ -0,0 +1,65 @@
+from src.services.index_advisor import analyze_query, index_ddl, table_aliases
+
+
+def _digest(sample, calls=10, sort_rows=0):
+    return {"digest_text": sample, "sample": sample, "calls": calls, "total_seconds": 0.5,
+            "rows_examined": 1000, "rows_sent": 10, "sort_rows": sort_rows}
+
+
+def test_table_aliases():
+    # Arrange
+    query = "SELECT * FROM projects p JOIN activities AS a ON a.id = p.activity_id LEFT JOIN members m ON 1 WHERE 1"
+
+    # Act
+    aliases = table_aliases(query)
+
+    # Assert
+    assert aliases == {"projects": "projects", "p": "projects", "activities": "activities",
+                       "a": "activities", "members": "members", "m": "members"}
+
+
+def test_full_scan_suggests_equality_then_range_columns():
+    # Arrange
+    query = "SELECT 1 FROM members m WHERE m.student_id = 6 AND m.is_owner = 1 AND m.joined_at > '2025-01-01'"
+    plan = {"query_block": {"table": {
+        "table_name": "m", "access_type": "ALL", "rows_examined_per_scan": 100, "filtered": "10.00",
+        "attached_condition": "((`gespro`.`m`.`student_id` = 6) and (`gespro`.`m`.`is_owner` = 1) "
+                              "and (`gespro`.`m`.`joined_at` > '2025-01-01'))"}}}
+
+    # Act
+    report, candidates = analyze_query(_digest(query), plan, {"members": [["id"], ["project_id", "student_id"]]})
+
+    # Assert
+    assert report["issues"] == ["full_scan:members"]
+    assert candidates == [{"table": "members", "columns": ["student_id", "is_owner", "joined_at"], "benefit": 900}]
+
+
+def test_existing_index_is_not_suggested_again():
+    # Arrange
+    query = "SELECT * FROM projects p WHERE p.activity_id = 1"
+    plan = {"query_block": {"table": {
+        "table_name": "p", "access_type": "ALL", "rows_examined_per_scan": 4, "filtered": "25.00",
+        "attached_condition": "(`gespro`.`p`.`activity_id` = 1)"}}}
+
+    # Act
+    _, candidates = analyze_query(_digest(query), plan, {"projects": [["activity_id", "created_at"]]})
+
+    # Assert
+    assert candidates == []
+
+
+def test_filesort_adds_order_by_columns():
+    # Arrange
+    query = "SELECT * FROM activities a WHERE a.professor_id = 3 ORDER BY a.created_at DESC LIMIT 10"
+    plan = {"query_block": {"ordering_operation": {"using_filesort": True, "table": {
+        "table_name": "a", "access_type": "ALL", "rows_examined_per_scan": 50, "filtered": "10.00",
+        "attached_condition": "(`gespro`.`a`.`professor_id` = 3)"}}}}
+
+    # Act
+    report, candidates = analyze_query(_digest(query, calls=2, sort_rows=30), plan, {"activities": [["id"]]})
+
+    # Assert
+    assert report["issues"] == ["filesort", "full_scan:activities"]
+    assert candidates == [{"table": "activities", "columns": ["professor_id", "created_at"], "benefit": 120}]
+    assert index_ddl("activities", ["professor_id", "created_at"]) == (
+        "ALTER TABLE `activities` ADD INDEX `idx_activities_professor_id_created_at` (`professor_id`, `created_at`);")
@@ -0,0 +1,125 @@
+import logging
+import time
+
+import pytest
+
+from src.models.job import Job
+from src.services.job_queue import JobError, JobQueue, retry_delay
+
+
+class FakeJobRepository:
+    """Repositorio en memoria que registra cómo terminó cada trabajo."""
+
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        self.completed = {}
+        self.failed = {}
+        self.leases = []
+
+    def claim(self, lease_seconds):
+        if not self.jobs:
+            return None
+        job = self.jobs.pop(0)
+        job.attempts += 1
+        return job
+
+    def extend_lease(self, job_id, attempts, lease_seconds):
+        self.leases.append((job_id, attempts))
+        return True
+
+    def complete(self, job_id, attempts, result=None):
+        self.completed[job_id] = result
+        return True
+
+    def fail(self, job_id, attempts, error, retry_at=None):
+        self.failed[job_id] = (error, retry_at)
+        return True
+
+
+def job_queue(*jobs):
+    queue = JobQueue(None, logging.getLogger(__name__))
+    queue.job_repository = FakeJobRepository(jobs)
+    return queue
+
+
+def test_run_once_completes_job_with_handler_result():
+    # Arrange
+    queue = job_queue(Job(id=1, type="sum", payload={"a": 1, "b": 2}))
+    queue.register("sum", lambda payload: {"total": payload["a"] + payload["b"]})
+
+    # Act
+    ran = queue.run_once()
+
+    # Assert
+    assert ran
+    assert queue.job_repository.completed == {1: {"total": 3}}
+
+
+def test_run_once_without_jobs_returns_false():
+    assert job_queue().run_once() is False
+
+
+def test_failed_job_is_retried_while_it_has_attempts():
+    # Arrange
+    queue = job_queue(Job(id=1, type="boom", max_attempts=3))
+    queue.register("boom", lambda payload: 1 / 0)
+
+    # Act
+    queue.run_once()
+
+    # Assert
+    error, retry_at = queue.job_repository.failed[1]
+    assert "division" in error
+    assert retry_at is not None
+
+
+def test_failed_job_without_attempts_left_fails():
+    # Arrange
+    queue = job_queue(Job(id=1, type="boom", attempts=2, max_attempts=3))
+    queue.register("boom", lambda payload: 1 / 0)
+
+    # Act
+    queue.run_once()
+
+    # Assert
+    assert queue.job_repository.failed[1][1] is None
+
+
+def test_job_error_is_not_retried():
+    # Arrange
+    def handler(payload):
+        raise JobError("CSV inválido")
+    queue = job_queue(Job(id=1, type="import", max_attempts=3))
+    queue.register("import", handler)
+
+    # Act
+    queue.run_once()
+
+    # Assert
+    assert queue.job_repository.failed[1] == ("CSV inválido", None)
+
+
+def test_lease_is_renewed_while_the_handler_runs():
+    # Arrange
+    queue = job_queue(Job(id=1, type="slow"))
+    queue.lease_seconds = 0.03
+    queue.register("slow", lambda payload: time.sleep(0.1) or {})
+
+    # Act
+    queue.run_once()
+
+    # Assert
+    assert len(queue.job_repository.leases) >= 2
+    assert queue.job_repository.leases[0] == (1, 1)
+    assert queue.job_repository.completed == {1: {}}
+
+
+def test_enqueue_unknown_type_raises_value_error():
+    with pytest.raises(ValueError):
+        job_queue().enqueue("unknown")
+
+
+@pytest.mark.parametrize("attempts, expected_max", [(1, 5), (2, 10), (3, 20), (10, 60)])
+def test_retry_delay_grows_exponentially_up_to_max(attempts, expected_max):
+    delay = retry_delay(attempts, base_seconds=5, max_seconds=60)
+    assert expected_max / 2 <= delay <= expected_max
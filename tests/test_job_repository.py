@@ -0,0 +1,78 @@
+import pytest
+
+from config import TestingConfig
+from src.db import Database
+from src.models.job import Job
+from src.repositories.job_repository import JobRepository
+from tests.utils import cleanup
+
+
+class TestJobRepository:
+    """Pruebas de integración de la tabla jobs."""
+
+    @pytest.fixture
+    def db(self):
+        db = Database(TestingConfig)
+        yield db
+        with db.get_connection() as conn:
+            cleanup(conn)
+
+    @pytest.fixture
+    def job_repository(self, db) -> JobRepository:
+        return JobRepository(db)
+
+    def _payload(self, db, job_id):
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT payload FROM jobs WHERE id = %s", (job_id,))
+            return cursor.fetchone()[0]
+
+    def test_payload_is_cleared_when_job_completes(self, db, job_repository):
+        # arrange
+        job = job_repository.enqueue(Job(type="students.import", payload={"csv": "email,password\n"}))
+        job = job_repository.claim(600)
+
+        # act
+        job_repository.complete(job.id, job.attempts, {"created": 0})
+
+        # assert
+        assert self._payload(db, job.id) is None
+
+    def test_payload_is_cleared_when_job_fails_for_good(self, db, job_repository):
+        # arrange
+        job = job_repository.enqueue(Job(type="students.import", payload={"csv": "email,password\n"}))
+        job = job_repository.claim(600)
+
+        # act
+        job_repository.fail(job.id, job.attempts, "CSV inválido")
+
+        # assert
+        assert self._payload(db, job.id) is None
+
+    def test_payload_is_kept_when_job_is_retried(self, db, job_repository):
+        # arrange
+        job = job_repository.enqueue(Job(type="students.import", payload={"csv": "email,password\n"}))
+        job = job_repository.claim(600)
+
+        # act
+        job_repository.fail(job.id, job.attempts, "Error transitorio", retry_at=job.run_at)
+
+        # assert
+        assert self._payload(db, job.id) is not None
+
+    def test_stale_attempt_cannot_overwrite_the_job(self, db, job_repository):
+        # arrange
+        job = job_repository.enqueue(Job(type="students.import", payload={"csv": "email,password\n"}))
+        first = job_repository.claim(600)
+        job_repository.fail(first.id, first.attempts, "Error transitorio", retry_at=first.run_at)
+        second = job_repository.claim(600)
+
+        # act
+        renewed = job_repository.extend_lease(first.id, first.attempts, 600)
+        completed = job_repository.complete(first.id, first.attempts, {"created": 0})
+
+        # assert
+        assert second.attempts == 2
+        assert not renewed
+        assert not completed
+        assert job_repository.find_by_id(job.id).status == "RUNNING"
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+from flask import Flask
+from flask_jwt_extended import create_access_token, decode_token
+from jwt.exceptions import InvalidSignatureError
+
+from src.utils.jwt_config import CachingJWTManager
+from src.utils.lru_cache import ExpiringLRUCache
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "test-secret-key-de-al-menos-32-bytes"
+    app.jwt_manager = CachingJWTManager(app, cache_size=2)
+    return app
+
+
+def test_lru_discards_least_recently_used_and_expired():
+    # Arrange
+    cache = ExpiringLRUCache(maxsize=2)
+    cache.set("a", 1, time.time() + 60)
+    cache.set("b", 2, time.time() + 60)
+    cache.set("expired", 3, time.time() - 1)
+
+    # Act
+    cache.get("a")
+    cache.set("c", 3, time.time() + 60)
+
+    # Assert
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.get("expired") is None
+
+
+def test_verified_token_is_decoded_once(app):
+    # Arrange
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "student", "student_id": 7})
+
+        # Act
+        first = decode_token(token)
+        second = decode_token(token)
+
+    # Assert
+    assert first == second
+    assert second["student_id"] == 7
+    assert first is not second
+    assert app.jwt_manager.verified_tokens.hits == 1
+
+
+def test_tampered_token_is_still_rejected(app):
+    # Arrange
+    with app.app_context():
+        token = create_access_token(identity="1")
+        other = create_access_token(identity="2", additional_claims={"role": "professor"})
+        decode_token(token)
+        # el payload de otro token con la firma del primero
+        header, _, signature = token.split(".")
+        tampered = ".".join([header, other.split(".")[1], signature])
+
+        # Act / Assert
+        with pytest.raises(InvalidSignatureError):
+            decode_token(tampered)
+
+
+def test_entry_expires_with_token(app):
+    # Arrange
+    with app.app_context():
+        token = create_access_token(identity="1")
+        claims = decode_token(token)
+
+    # Act
+    entries = list(app.jwt_manager.verified_tokens._entries.values())
+
+    # Assert
+    assert entries[0][1] == claims["exp"]
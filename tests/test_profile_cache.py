@@ -0,0 +1,54 @@
+from datetime import datetime
+
+from src.models.user import Professor, Student
+from src.services.profile_cache import ProfileCache
+
+
+def _student():
+    return Student(id=7, user_id=20, email="ana@x.com", first_name="Ana", last_name="Pérez",
+                   enrollment_number=1001, major="Sistemas", created_at=datetime(2025, 1, 1))
+
+
+def test_profile_is_found_by_user_id_and_role_id():
+    # Arrange
+    cache = ProfileCache(ttl=60)
+    cache.set(_student())
+    cache.set(Professor(id=3, user_id=21, email="prof@x.com"))
+
+    # Act
+    by_user = cache.get(20)
+    by_student = cache.get_by_role_id("student", 7)
+    by_professor = cache.get_by_role_id("professor", 3)
+
+    # Assert
+    assert by_user.email == by_student.email == "ana@x.com"
+    assert by_professor.user_id == 21
+    assert cache.get_by_role_id("professor", 7) is None
+
+
+def test_returned_profiles_are_copies():
+    # Arrange
+    cache = ProfileCache(ttl=60)
+    cache.set(_student())
+
+    # Act
+    cache.get(20).created_at = "2025-01-01 00:00:00"
+
+    # Assert
+    assert cache.get(20).created_at == datetime(2025, 1, 1)
+
+
+def test_invalidate_and_expiry():
+    # Arrange
+    cache = ProfileCache(ttl=60)
+    expired = ProfileCache(ttl=0)
+    cache.set(_student())
+    expired.set(_student())
+
+    # Act
+    cache.invalidate(20)
+
+    # Assert
+    assert cache.get(20) is None
+    assert cache.get_by_role_id("student", 7) is None
+    assert expired.get(20) is None
@@ -0,0 +1,72 @@
+import datetime
+
+import pytest
+
+from src.repositories.project_repository import build_project_filters
+
+
+def test_build_filters_empty():
+    # Act
+    where_clauses, params = build_project_filters({})
+
+    # Assert
+    assert where_clauses == []
+    assert params == []
+
+
+def test_build_filters_ignores_unknown_keys():
+    # Act
+    where_clauses, params = build_project_filters({"1 = 1; DROP TABLE projects": "x"})
+
+    # Assert
+    assert where_clauses == []
+    assert params == []
+
+
+def test_build_filters_project_and_member_filters():
+    # Arrange
+    filters = {
+        "activity_id": "1",
+        "date_from": "2025-01-01",
+        "major": "Licenciatura en Meteorología",
+        "enrollment_number": "886736",
+    }
+
+    # Act
+    where_clauses, params = build_project_filters(filters)
+
+    # Assert
+    assert where_clauses[0] == "p.activity_id = %s"
+    assert where_clauses[1] == "p.created_at >= %s"
+    # los filtros de alumnos se combinan en un único EXISTS
+    assert len(where_clauses) == 3
+    assert where_clauses[2].startswith("EXISTS")
+    assert "sf.enrollment_number = %s AND sf.major = %s" in where_clauses[2]
+    assert params == [1, datetime.date(2025, 1, 1), 886736, "Licenciatura en Meteorología"]
+
+
+def test_build_filters_student_name_is_escaped_prefix():
+    # Act
+    _, params = build_project_filters({"student_name": "Bl_a%"})
+
+    # Assert
+    assert params == ["Bl\\_a\\%%", "Bl\\_a\\%%"]
+
+
+@pytest.mark.parametrize("filters", [
+    {"activity_id": "uno"},
+    {"date_to": "01/02/2025"},
+    {"enrollment_number": "abc"},
+])
+def test_build_filters_invalid_value(filters):
+    # Act / Assert
+    with pytest.raises(ValueError):
+        build_project_filters(filters)
+
+
+def test_build_filters_member_filters_on_archive():
+    # Act
+    clauses, _ = build_project_filters({"major": "Sistemas"}, "members_archive")
+
+    # Assert
+    assert "FROM members_archive mf" in clauses[0]
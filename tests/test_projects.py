@@ -4,10 +4,8 @@ import datetime
 from flask import Flask
 from flask.testing import FlaskClient
 
-from config import TestingConfig
 from src.db import Database
-from tests.utils import cleanup
-from src.repositories.project_repository import ProjectRepository
+from src.repositories.project_repository import ProjectRepository, ProjectError
 from src.models.project import Project
 from src.repositories.activity_repository import ActivityRepository
 from src.models.activity import Activity
@@ -15,39 +13,10 @@ from src.models.activity import Activity
 class TestProjects:
     """Pruebas de integración para los proyectos."""
 
-    @pytest.fixture
-    def config(self):
-        """Obtener una instancia del conector con la configuración de pruebas."""
-        db = Database(TestingConfig)
-
-        return db
-
     @pytest.fixture(autouse=True)
-    def setup(self, config):
-        """Inicializa y limpia la base de datos antes y después de cada prueba."""
-        db = config
-
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-
-            with open("gespro_struct_data.sql", "r") as file:
-                sql_script = file.read()
-
-            sql_statements = sql_script.split(";")
-
-            for statement in sql_statements:
-                if statement.strip():
-                    cursor.execute(statement)
-
-            conn.commit()
-
-            cursor.close()
-
-        yield
-
-        db = config
-        with db.get_connection() as conn:
-            cleanup(conn)
+    def config(self, db):
+        """Base de pruebas cargada con los datos de ejemplo, ver conftest.py."""
+        return db
 
     @pytest.fixture
     def project_repository(self, config: Database) -> ProjectRepository:
@@ -343,4 +312,46 @@ class TestProjects:
                                content_type="application/json")
         # assert
         assert response.status_code == 404
-        assert response.json["mensaje"] == "Activity not found"
\ No newline at end of file
+        assert response.json["mensaje"] == "Activity not found"
+
+    def test_add_member_already_in_activity(self, project_repository):
+        # arrange
+        # el estudiante 6 es miembro del proyecto 1, y el proyecto 2 es de la misma actividad
+        student_id = 6
+        project_id = 2
+
+        # act / assert
+        with pytest.raises(ProjectError) as err:
+            project_repository.add_member(student_id, project_id)
+        assert str(err.value) == "El estudiante ya participa en un proyecto para esta actividad"
+        members = [member.student_id for member in project_repository.get_project_members(project_id)]
+        assert members == [30]
+
+    def test_remove_student_updates_member_count(self, project_repository):
+        # arrange
+        # el proyecto 1 tiene 4 miembros: 1 (dueño), 6, 8 y 10
+        project_id = 1
+
+        # act
+        for student_id in (6, 8):
+            project_repository.remove_student_from_project(student_id, project_id)
+        two_members = project_repository.find_by_id(project_id)
+        project_repository.remove_student_from_project(10, project_id)
+        one_member = project_repository.find_by_id(project_id)
+
+        # assert
+        assert (two_members.member_count, two_members.is_group) == (2, 1)
+        assert (one_member.member_count, one_member.is_group) == (1, 0)
+
+    def test_close_open_projects_only_closes_past_due_activities(self, project_repository):
+        # arrange
+        # la actividad 3 ya venció y la 1 vence en 2029, las dos tienen proyectos OPEN
+
+        # act
+        past_due = project_repository.close_open_projects(3, 10)
+        not_due = project_repository.close_open_projects(1, 10)
+
+        # assert
+        assert (past_due, not_due) == (1, 0)
+        assert project_repository.find_by_id(4).status == "READY"
+        assert project_repository.find_by_id(1).status == "OPEN"
@@ -0,0 +1,136 @@
+import pytest
+from flask import Flask, g
+from mysql.connector.errors import InterfaceError, PoolError
+
+import src.db
+from src.db import Database, pin_to_primary
+from src.services.project_service import ProjectOwnerError, ProjectService
+
+
+class FakePool:
+    """Pool sin servidor: entrega el nombre de la pool, o falla con error."""
+
+    def __init__(self, *args, pool_name, **kwargs):
+        self.name = pool_name
+        self.error = None
+
+    def get_connection(self):
+        if self.error is not None:
+            raise self.error
+        return self.name
+
+
+class Config:
+    DB_HOST = "primary"
+    DB_PORT = None
+    DB_NAME = "gespro"
+    DB_USER = "gespro"
+    DB_PASSWORD = "secret"
+    DB_REPLICAS = ["mysql://replica0", "mysql://replica1"]
+    DB_REPLICA_EJECT_SECONDS = 30
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(src.db, "ValidatingConnectionPool", FakePool)
+    return Database(Config)
+
+
+def test_reads_are_spread_round_robin(db):
+    # Act
+    names = [db.get_read_connection() for _ in range(4)]
+
+    # Assert
+    assert names == ["pileta_replica_0", "pileta_replica_1"] * 2
+
+
+def test_failing_replica_is_ejected(db):
+    # Arrange
+    db.get_read_connection()
+    db.get_read_connection()
+    db.replicas[1].pool.error = InterfaceError("down")
+
+    # Act
+    names = [db.get_read_connection() for _ in range(3)]
+
+    # Assert
+    assert names == ["pileta_replica_0"] * 3
+    assert not db.replicas[1].is_healthy()
+
+
+def test_exhausted_replica_is_not_ejected(db):
+    # Arrange
+    db.get_read_connection()
+    db.get_read_connection()
+    db.replicas[0].pool.error = PoolError("exhausted")
+
+    # Act
+    name = db.get_read_connection()
+
+    # Assert
+    assert name == "pileta_replica_1"
+    assert db.replicas[0].is_healthy()
+
+
+def test_reads_use_the_primary_when_every_replica_fails(db):
+    # Arrange
+    for replica in db.replicas:
+        replica.get_connection()
+        replica.pool.error = InterfaceError("down")
+
+    # Act
+    name = db.get_read_connection()
+
+    # Assert
+    assert name == "pileta"
+
+
+def test_reads_after_a_write_stay_on_the_primary(db):
+    with Flask(__name__).app_context():
+        # Arrange
+        db.get_connection()
+
+        # Act
+        name = db.get_read_connection()
+
+    # Assert
+    assert name == "pileta"
+
+
+def test_pin_to_primary_routes_the_remaining_reads_to_the_primary(db):
+    with Flask(__name__).app_context():
+        # Act
+        before = db.get_read_connection()
+        pin_to_primary()
+        after = db.get_read_connection()
+
+    # Assert
+    assert (before, after) == ("pileta_replica_0", "pileta")
+
+
+class OwnerCheckRepository:
+    """Registra si la validación del dueño se hizo con el request fijado al primario."""
+
+    def __init__(self):
+        self.pinned = None
+
+    def find_by_id(self, project_id):
+        return type("Project", (), {"id": project_id, "activity_id": 1})()
+
+    def is_project_owner(self, project_id, student_id):
+        self.pinned = g.get("_db_pinned_to_primary", False)
+        return False
+
+
+def test_write_pre_checks_read_from_the_primary():
+    # Arrange
+    service = ProjectService(None)
+    service.project_repository = OwnerCheckRepository()
+
+    # Act
+    with Flask(__name__).app_context():
+        with pytest.raises(ProjectOwnerError):
+            service.delete(1, 7)
+
+    # Assert
+    assert service.project_repository.pinned is True
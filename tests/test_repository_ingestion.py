@@ -0,0 +1,102 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from src.models.repository_stats import RepositoryStats
+from src.services.repository_ingestor import GitError, read_stats, sync_repository
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git no está instalado")
+
+
+def git(path, *args):
+    subprocess.run(["git", "-C", str(path), *args], check=True, capture_output=True,
+                   env={**os.environ, "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+                        "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com"})
+
+
+def commit(path, name):
+    (path / name).write_text(name)
+    git(path, "add", name)
+    git(path, "commit", "-q", "-m", name)
+
+
+@pytest.fixture
+def origin(tmp_path):
+    path = tmp_path / "origin"
+    path.mkdir()
+    git(path, "init", "-q")
+    commit(path, "a.txt")
+    commit(path, "b.txt")
+    return path
+
+
+def test_clone_reads_commit_count_and_size(origin, tmp_path):
+    # Arrange
+    clone = str(tmp_path / "cache" / "1")
+
+    # Act
+    sync_repository(origin.as_uri(), clone)
+    stats = read_stats(clone)
+
+    # Assert
+    assert stats["commit_count"] == 2
+    assert len(stats["head_sha"]) == 40
+    assert stats["last_commit_at"] is not None
+    assert stats["size_bytes"] > 0
+
+
+def test_fetch_counts_only_new_commits(origin, tmp_path):
+    # Arrange
+    clone = str(tmp_path / "cache" / "1")
+    sync_repository(origin.as_uri(), clone)
+    first = read_stats(clone)
+    # un conteo previo falso demuestra que solo se suman los commits nuevos
+    previous = RepositoryStats(head_sha=first["head_sha"], commit_count=10)
+    commit(origin, "c.txt")
+
+    # Act
+    sync_repository(origin.as_uri(), clone)
+    stats = read_stats(clone, previous)
+
+    # Assert
+    assert stats["commit_count"] == 11
+    assert stats["head_sha"] != first["head_sha"]
+
+
+def test_unchanged_head_reuses_previous_stats(origin, tmp_path):
+    # Arrange
+    clone = str(tmp_path / "cache" / "1")
+    sync_repository(origin.as_uri(), clone)
+    first = read_stats(clone)
+    previous = RepositoryStats(head_sha=first["head_sha"], commit_count=7,
+                               last_commit_at=first["last_commit_at"])
+
+    # Act
+    sync_repository(origin.as_uri(), clone)
+    stats = read_stats(clone, previous)
+
+    # Assert
+    assert stats["commit_count"] == 7
+
+
+def test_empty_repository_has_no_commits(tmp_path):
+    # Arrange
+    origin = tmp_path / "empty"
+    origin.mkdir()
+    git(origin, "init", "-q")
+    clone = str(tmp_path / "cache" / "1")
+
+    # Act
+    sync_repository(origin.as_uri(), clone)
+    stats = read_stats(clone)
+
+    # Assert
+    assert stats["commit_count"] == 0
+    assert stats["head_sha"] is None
+
+
+def test_missing_repository_raises_git_error(tmp_path):
+    with pytest.raises(GitError):
+        sync_repository((tmp_path / "missing").as_uri(), str(tmp_path / "cache" / "1"))
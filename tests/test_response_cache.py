@@ -0,0 +1,176 @@
+import os
+import time
+
+import pytest
+from flask import Flask, g, jsonify
+from flask_jwt_extended import JWTManager, create_access_token, jwt_required
+
+from src.utils.response_cache import FileBackend, MemoryBackend, ResponseCache, cache_response
+
+
+@pytest.fixture(params=["memory", "file"])
+def cache(request, tmp_path):
+    backend = MemoryBackend() if request.param == "memory" else FileBackend(str(tmp_path))
+    return ResponseCache(backend, ttl=60)
+
+
+@pytest.fixture
+def app(cache):
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "test"
+    JWTManager(app)
+    app.response_cache = cache
+    app.calls = 0
+    app.pinned = []
+    app.during_query = None
+
+    @app.route("/projects")
+    @jwt_required()
+    @cache_response(lambda claims, view_args: [f"student:{claims['student_id']}"],
+                    lambda projects: [f"activity:{p['activity_id']}" for p in projects])
+    def projects():
+        app.calls += 1
+        app.pinned.append(g.get("_db_pinned_to_primary", False))
+        if app.during_query is not None:
+            app.during_query()
+        return jsonify([{"id": app.calls, "activity_id": 3}])
+
+    return app
+
+
+def _headers(app, student_id):
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "student",
+                                                                     "student_id": student_id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_second_request_is_served_from_cache(app):
+    # Arrange
+    client = app.test_client()
+    headers = _headers(app, 7)
+
+    # Act
+    first = client.get("/projects", headers=headers)
+    second = client.get("/projects", headers=headers)
+
+    # Assert
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json == first.json
+    assert app.calls == 1
+
+
+def test_key_includes_scope_and_query_args(app):
+    # Arrange
+    client = app.test_client()
+
+    # Act
+    client.get("/projects", headers=_headers(app, 7))
+    other_student = client.get("/projects", headers=_headers(app, 8))
+    other_args = client.get("/projects?activity_id=3", headers=_headers(app, 7))
+
+    # Assert
+    assert other_student.headers["X-Cache"] == "MISS"
+    assert other_args.headers["X-Cache"] == "MISS"
+    assert app.calls == 3
+
+
+@pytest.mark.parametrize("tag", ["student:7", "activity:3"])
+def test_invalidated_tag_expires_entries(app, cache, tag):
+    # Arrange
+    client = app.test_client()
+    headers = _headers(app, 7)
+    client.get("/projects", headers=headers)
+
+    # Act
+    cache.invalidate(tag)
+    response = client.get("/projects", headers=headers)
+
+    # Assert
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json[0]["id"] == 2
+
+
+def test_unrelated_tag_keeps_entries(app, cache):
+    # Arrange
+    client = app.test_client()
+    headers = _headers(app, 7)
+    client.get("/projects", headers=headers)
+
+    # Act
+    cache.invalidate("activity:4", "student:8")
+    response = client.get("/projects", headers=headers)
+
+    # Assert
+    assert response.headers["X-Cache"] == "HIT"
+
+
+def test_fill_right_after_invalidation_reads_from_primary(app, cache):
+    # Arrange
+    client = app.test_client()
+    headers = _headers(app, 7)
+    cache.pin_seconds = 0
+    client.get("/projects", headers=headers)
+
+    # Act
+    cache.pin_seconds = 5
+    cache.invalidate("student:7")
+    client.get("/projects", headers=headers)
+
+    # Assert
+    assert app.pinned == [False, True]
+
+
+def test_item_tag_invalidated_during_the_query_is_not_cached(app, cache):
+    # Arrange
+    client = app.test_client()
+    headers = _headers(app, 7)
+    client.get("/projects", headers=headers)
+    cache.invalidate("activity:3")
+    app.during_query = lambda: cache.invalidate("activity:3")
+
+    # Act
+    stale = client.get("/projects", headers=headers)
+    app.during_query = None
+    response = client.get("/projects", headers=headers)
+
+    # Assert
+    assert (stale.headers["X-Cache"], response.headers["X-Cache"]) == ("MISS", "MISS")
+    assert app.calls == 3
+
+
+def test_file_backend_sweep_removes_expired_and_abandoned_files(tmp_path):
+    # Arrange
+    backend = FileBackend(str(tmp_path))
+    backend.set("live", b"1", ttl=60)
+    backend.set("expired", b"2", ttl=60)
+    with open(backend._path("expired"), "wb") as file:
+        file.write(f"{time.time() - 1}\n".encode() + b"2")
+    abandoned = tmp_path / ".tmpabandoned"
+    abandoned.write_bytes(b"")
+    os.utime(abandoned, (time.time() - 3600, time.time() - 3600))
+    writing = tmp_path / ".tmpwriting"
+    writing.write_bytes(b"")
+
+    # Act
+    removed = backend.sweep()
+
+    # Assert
+    assert removed == 2
+    assert backend.get_many(["live", "expired"]) == [b"1", None]
+    assert writing.exists() and not abandoned.exists()
+
+
+def test_file_backend_sweep_keeps_the_newest_entries(tmp_path):
+    # Arrange
+    backend = FileBackend(str(tmp_path), max_entries=2)
+    for age, key in enumerate(["newest", "newer", "oldest"]):
+        backend.set(key, key.encode())
+        os.utime(backend._path(key), (time.time() - age * 10, time.time() - age * 10))
+
+    # Act
+    backend.sweep()
+
+    # Assert
+    assert backend.get_many(["newest", "newer", "oldest"]) == [b"newest", b"newer", None]
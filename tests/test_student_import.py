@@ -0,0 +1,95 @@
+import io
+from datetime import datetime
+
+import bcrypt
+import pytest
+
+from src.services.student_import_service import StudentImportService, parse_students_csv
+
+HEADER = "email,password,first_name,last_name,enrollment_number,major,enrolled_at\n"
+
+
+def test_parse_valid_rows():
+    # Arrange
+    content = io.StringIO(HEADER
+                          + "ana@x.com,Password123,Ana,Pérez,1001,Sistemas,2024-03-01\n"
+                          + "luis@x.com,Password123,Luis,Gómez,1002,Civil,\n")
+
+    # Act
+    students, errors = parse_students_csv(content)
+
+    # Assert
+    assert errors == []
+    assert [line for line, _ in students] == [2, 3]
+    assert students[0][1].enrollment_number == 1001
+    assert students[1][1].enrolled_at is None
+
+
+def test_parse_converts_enrolled_at_and_rejects_invalid_dates():
+    # Arrange
+    content = io.StringIO(HEADER
+                          + "ana@x.com,Password123,Ana,Pérez,1001,Sistemas,2024-03-01\n"
+                          + "luis@x.com,Password123,Luis,Gómez,1002,Civil,01/03/2024\n"
+                          + "eva@x.com,Password123,Eva,Ríos,1003,Civil,2024-02-30\n")
+
+    # Act
+    students, errors = parse_students_csv(content)
+
+    # Assert
+    assert students[0][1].enrolled_at == datetime(2024, 3, 1)
+    assert [(e["line"], e["field"]) for e in errors] == [(3, "enrolled_at"), (4, "enrolled_at")]
+
+
+def test_parse_reports_duplicates_in_file_per_line():
+    # Arrange
+    content = io.StringIO(HEADER
+                          + "ana@x.com,Password123,Ana,Pérez,1001,Sistemas,\n"
+                          + "ANA@x.com,Password123,Ana,Pérez,1002,Sistemas,\n"
+                          + "otra@x.com,Password123,Otra,Pérez,1001,Sistemas,\n")
+
+    # Act
+    students, errors = parse_students_csv(content)
+
+    # Assert
+    assert len(students) == 1
+    assert [(e["line"], e["field"], e["duplicate_of_line"]) for e in errors] == [
+        (3, "email", 2), (4, "enrollment_number", 2)]
+
+
+def test_parse_reports_invalid_rows_without_aborting():
+    # Arrange
+    content = io.StringIO(HEADER
+                          + "ana@x.com,corta,Ana,Pérez,1001,Sistemas,\n"
+                          + "luis@x.com,Password123,Luis,Gómez,abc,Civil,\n"
+                          + "sin@x.com,Password123,,Gómez,1003,Civil,\n"
+                          + "eva@x.com,Password123,Eva,Ruiz,1004,Civil,\n")
+
+    # Act
+    students, errors = parse_students_csv(content)
+
+    # Assert
+    assert [line for line, _ in students] == [5]
+    assert [e["line"] for e in errors] == [2, 3, 4]
+
+
+def test_parse_missing_columns_raises_value_error():
+    with pytest.raises(ValueError):
+        parse_students_csv(io.StringIO("email,password\nana@x.com,Password123\n"))
+
+
+def test_prepare_keeps_only_password_hashes():
+    # Arrange
+    service = StudentImportService(None, workers=1)
+    content = io.StringIO(HEADER
+                          + "ana@x.com,Password123,Ana,Pérez,1001,Sistemas,2024-03-01\n"
+                          + "luis@x.com,corta,Luis,Gómez,1002,Civil,\n")
+
+    # Act
+    payload = service.prepare(content)
+
+    # Assert
+    assert "Password123" not in str(payload)
+    [row] = payload["students"]
+    assert (row["line"], row["enrolled_at"]) == (2, "2024-03-01")
+    assert bcrypt.checkpw(b"Password123", row["password"].encode("ascii"))
+    assert [error["line"] for error in payload["errors"]] == [3]
@@ -0,0 +1,53 @@
+from src.repositories.user_repository import UserRepository
+from src.services.auth_service import AuthService
+
+
+class FakeUserRepository:
+    def __init__(self, students, facets, total):
+        self.result = (students, facets, total)
+        self.calls = []
+
+    def find_teammates(self, major, available_for_activity, limit, offset):
+        self.calls.append((major, available_for_activity, limit, offset))
+        return self.result
+
+
+def test_find_teammates_uses_the_total_from_the_repository():
+    # Arrange
+    service = AuthService(None)
+    service.user_repository = FakeUserRepository(
+        [], [{"major": "Licenciatura en Meteorología", "count": 9}], 9)
+
+    # Act
+    result = service.find_teammates("licenciatura en meteorologia", None, page=2, per_page=5)
+
+    # Assert
+    assert result["total"] == 9
+    assert service.user_repository.calls == [("licenciatura en meteorologia", None, 5, 5)]
+
+
+class TestFindTeammates:
+    """Pruebas de integración de la búsqueda de compañeros."""
+
+    def test_total_uses_the_column_collation(self, db):
+        # arrange
+        user_repository = UserRepository(db)
+
+        # act
+        students, facets, total = user_repository.find_teammates("licenciatura en meteorologia", limit=100)
+
+        # assert
+        assert total == len(students) == 9
+        assert {"major": "Licenciatura en Meteorología", "count": 9} in facets
+
+    def test_total_excludes_students_already_in_the_activity(self, db):
+        # arrange
+        user_repository = UserRepository(db)
+        _, _, everyone = user_repository.find_teammates(limit=1)
+
+        # act
+        students, _, total = user_repository.find_teammates(available_for_activity=1, limit=1)
+
+        # assert
+        assert len(students) == 1
+        assert total == everyone - 5
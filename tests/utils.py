@@ -20,8 +20,29 @@ def cleanup(conn):
         # Reset table members
         cursor.execute("TRUNCATE TABLE members;")
         cursor.execute("ALTER TABLE members AUTO_INCREMENT = 1;")
+        # Reset table activity_stats
+        cursor.execute("TRUNCATE TABLE activity_stats;")
+        # Reset table changes
+        cursor.execute("TRUNCATE TABLE changes;")
+        cursor.execute("ALTER TABLE changes AUTO_INCREMENT = 1;")
+        cursor.execute("UPDATE change_sequence SET id = 0;")
+        # Reset table project_repository_stats
+        cursor.execute("TRUNCATE TABLE project_repository_stats;")
+        # Reset table jobs
+        cursor.execute("TRUNCATE TABLE jobs;")
+        cursor.execute("ALTER TABLE jobs AUTO_INCREMENT = 1;")
 
         conn.commit()
 
         cursor.execute("SET FOREIGN_KEY_CHECKS = 1;")
         conn.commit()
+
+
+class FakeResponseCache:
+    """ResponseCache que solo registra los tags invalidados."""
+
+    def __init__(self):
+        self.invalidated = []
+
+    def invalidate(self, *tags):
+        self.invalidated.extend(tags)